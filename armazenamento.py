@@ -0,0 +1,68 @@
+# armazenamento.py
+"""Peças comuns aos arquivos locais (cache de perfis, histórico, regiões lembradas, checkpoints,
+saídas em NDJSON/CSV).
+
+Fica fora de `profile_cache` para que módulos carregados na abertura da janela (`regioes`) possam
+usá-lo sem importar o scraper e o requests.
+"""
+import json
+import os
+import tempfile
+
+
+def normalizar_nome(nome_invocador: str):
+    """'Nome #TAG ' -> 'nome#tag': sem espaços nas pontas e em minúsculas ('nome#' sem tagline)."""
+    parts = nome_invocador.strip().split('#', 1)
+    game_name = parts[0].strip().lower()
+    tagline = parts[1].strip().lower() if len(parts) > 1 else ""
+    return f"{game_name}#{tagline}"
+
+def normalizar_chave(nome_invocador: str, regiao: str):
+    """Chave do cache: (game_name, tagline, regiao) sem espaços nas pontas e em minúsculas."""
+    return f"{normalizar_nome(nome_invocador)}@{regiao.strip().lower()}"
+
+def gravar_json_atomico(caminho: str, conteudo, sincronizar: bool = False):
+    """Grava `conteudo` em JSON num temporário ao lado de `caminho` e troca um pelo outro de uma vez.
+
+    Quem lê o arquivo vê a versão anterior ou a nova inteira, nunca uma gravação pela metade. Com
+    `sincronizar`, os dados vão para o disco (fsync) antes da troca. Erros de E/S sobem como OSError.
+    """
+    _gravar_atomico(caminho, lambda f: f.write(json.dumps(conteudo, ensure_ascii=False).encode('utf-8')), sincronizar)
+
+def gravar_bytes_atomico(caminho: str, conteudo: bytes, sincronizar: bool = False):
+    """Como `gravar_json_atomico`, para conteúdo binário."""
+    _gravar_atomico(caminho, lambda f: f.write(conteudo), sincronizar)
+
+def _gravar_atomico(caminho: str, escrever, sincronizar: bool):
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    os.makedirs(diretorio, exist_ok=True)
+    # Um temporário por gravação: duas threads gravando o mesmo arquivo não escrevem uma por cima da outra
+    descritor, temporario = tempfile.mkstemp(prefix=os.path.basename(caminho) + ".", suffix=".tmp", dir=diretorio)
+    try:
+        with os.fdopen(descritor, 'wb') as f:
+            escrever(f)
+            if sincronizar:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        raise
+
+def completar_ultima_linha(caminho: str):
+    """Prepara um arquivo de linhas para receber mais: se uma interrupção cortou a última linha no
+    meio, termina-a com uma quebra, para a próxima não ser colada nela. Retorna se o arquivo já
+    tinha conteúdo."""
+    try:
+        with open(caminho, 'rb+') as f:
+            if not f.seek(0, os.SEEK_END):
+                return False
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+            return True
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,82 @@
+# batch.py
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from modelos import Perfil
+from regioes import REGIAO_AUTO, descobrir_regiao
+from scraper import obter_dados_summoner
+from utils import carregar_id_por_nome_campeao
+
+logger = logging.getLogger(__name__)
+
+REGIAO_PADRAO = "br"
+MAX_BUSCAS_SIMULTANEAS = 8
+
+def ler_arquivo_entradas(caminho: str, regiao_padrao: str = REGIAO_PADRAO):
+    """Lê um arquivo com uma linha 'Nome#TAG,regiao' por invocador e retorna a lista de pares (nome, regiao)."""
+    entradas = []
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            linha = linha.strip()
+            if not linha:
+                continue
+            if ',' in linha:
+                nome, regiao = linha.rsplit(',', 1)
+            else:
+                nome, regiao = linha, regiao_padrao
+            entradas.append((nome.strip(), regiao.strip().lower() or regiao_padrao))
+    return entradas
+
+def obter_dados_em_lote(entradas, id_por_nome_campeao: dict = None, max_workers: int = MAX_BUSCAS_SIMULTANEAS, ao_concluir=None,
+                        historico=None, guardar_resultados: bool = True, como_perfil: bool = False):
+    """Busca vários invocadores em paralelo e retorna os resultados na mesma ordem das entradas.
+
+    O mapa de campeões é carregado uma única vez e compartilhado por todas as buscas.
+    `ao_concluir(indice, nome, regiao, dados)` é chamado (na thread do worker) assim que cada busca termina.
+    Com um `historico.Historico`, cada busca bem-sucedida também é gravada nele.
+    Com `guardar_resultados=False` os dados só passam por `ao_concluir` (a lista retornada fica com
+    None), para lotes grandes exportados em fluxo (`exportacao.py`) não acumularem tudo na memória.
+    Com `como_perfil=True` os resultados de sucesso são guardados como `modelos.Perfil` (bem menores
+    que os dicionários; `Perfil.para_dict` devolve o formato de sempre) e os de erro como o dicionário
+    de erro. `ao_concluir` continua recebendo o dicionário.
+    Se a espera for interrompida (Ctrl-C, ou uma exceção levantada por `ao_concluir`), as buscas que
+    ainda não começaram são canceladas; só as que já estão em andamento terminam.
+    """
+    entradas = list(entradas)
+    if not entradas:
+        return []
+    if id_por_nome_campeao is None:
+        id_por_nome_campeao = carregar_id_por_nome_campeao()
+
+    def buscar(indice):
+        nome, regiao = entradas[indice]
+        regiao_busca = regiao
+        try:
+            if regiao == REGIAO_AUTO:
+                regiao_busca = descobrir_regiao(nome)
+            if regiao_busca is None:
+                dados = {"erro": "Invocador não encontrado em nenhuma região."}
+            else:
+                dados = obter_dados_summoner(nome, regiao_busca, id_por_nome_campeao)
+        except Exception as e:
+            dados = {"erro": f"Erro inesperado: {e}"}
+        if historico is not None and regiao_busca:
+            try:
+                historico.registrar(nome, regiao_busca, dados)
+            except Exception as e:
+                # Falha ao gravar o histórico (banco travado, disco cheio) não pode derrubar o lote
+                logger.warning("Não foi possível gravar o histórico de %s: %s", nome, e)
+        if ao_concluir:
+            ao_concluir(indice, nome, regiao, dados)
+        if not guardar_resultados:
+            return None
+        return Perfil.de_dict(dados) if como_perfil and "erro" not in dados else dados
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(entradas))))
+    try:
+        resultados = list(executor.map(buscar, range(len(entradas))))
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    return resultados
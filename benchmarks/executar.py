@@ -0,0 +1,192 @@
+# benchmarks/executar.py
+"""Benchmark offline do scraper, do processamento de imagens e dos gráficos.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.executar [--repeticoes N] [--lote N] [--comparar resultados/anterior.json]
+
+Tudo roda contra o servidor local de `servidor_local.py`, sem acesso à internet. O resultado é salvo
+em benchmarks/resultados/<data>.json; com --comparar, etapas mais lentas que a tolerância contam como
+regressão e o processo termina com código 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.servidor_local import ServidorLocal
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+
+def _estatisticas(amostras):
+    ordenadas = sorted(amostras)
+    return {
+        "n": len(ordenadas),
+        "media_ms": round(statistics.fmean(ordenadas) * 1000, 3),
+        "mediana_ms": round(statistics.median(ordenadas) * 1000, 3),
+        "p95_ms": round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.95))] * 1000, 3),
+        "min_ms": round(ordenadas[0] * 1000, 3),
+    }
+
+def medir(funcao, repeticoes: int):
+    """Executa `funcao` `repeticoes` vezes e devolve as estatísticas de latência e o pico de memória de uma execução."""
+    amostras = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        amostras.append(time.perf_counter() - inicio)
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resultado = _estatisticas(amostras)
+    resultado["pico_memoria_kb"] = round(pico / 1024, 1)
+    return resultado
+
+def _etapas_scraper(servidor, repeticoes):
+    import http_client
+    import parsers
+    import scraper
+    from utils import carregar_id_por_nome_campeao
+
+    ids = carregar_id_por_nome_campeao()
+    url = servidor.url + "/summoner/br/fixture-br1"
+    html = http_client.get(url).text
+    etapas = {"fetch": medir(lambda: http_client.get(url).content, repeticoes)}
+
+    for backend in parsers.BACKENDS:
+        if parsers.resolver_backend(backend) == backend:
+            etapas[f"parse_{backend}"] = medir(lambda: parsers.extrair_secoes(html, backend), repeticoes)
+
+    descricao = parsers.extrair_secoes(html)["descricao"]
+    etapas["descricao_regex"] = medir(lambda: scraper.analisar_descricao(descricao, {}), repeticoes * 10)
+    matches = scraper.analisar_descricao(descricao, {})
+    etapas["mapeamento_campeoes"] = medir(lambda: scraper.mapear_campeoes(matches, ids), repeticoes * 10)
+    etapas["perfil_completo"] = medir(lambda: scraper.obter_dados_summoner("Fixture#BR1", "br", ids), repeticoes)
+    dados = scraper.extrair_dados_html(html, ids)
+    return etapas, dados
+
+def _etapas_imagens(servidor, repeticoes):
+    import utils
+
+    with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "icon.png"), 'rb') as f:
+        icone = f.read()
+    url = servidor.url + "/icones/benchmark.png"
+    utils.processar_foto_arredondada(url, 90)
+    return {
+        "imagem_processamento": medir(lambda: utils._arredondar_imagem(icone, 90), repeticoes),
+        "imagem_cache_memoria": medir(lambda: utils.processar_foto_arredondada(url, 90), repeticoes * 10),
+    }
+
+def _etapas_graficos(dados, repeticoes):
+    import graficos
+
+    graficos.renderizar_radar(dados["roles_data"])
+    return {
+        "grafico_radar": medir(lambda: graficos._renderizar_radar(dados["roles_data"]), repeticoes),
+        "grafico_elo": medir(lambda: graficos._renderizar_elo(dados["graph_data"], dados["rank_map"]), repeticoes),
+        "grafico_cache": medir(lambda: graficos.renderizar_radar(dados["roles_data"]), repeticoes * 10),
+    }
+
+def _lote(servidor, tamanho, concorrencia):
+    from batch import obter_dados_em_lote
+
+    entradas = [(f"Fixture{i}#BR1", "br") for i in range(tamanho)]
+    inicio = time.perf_counter()
+    resultados = obter_dados_em_lote(entradas, max_workers=concorrencia)
+    duracao = time.perf_counter() - inicio
+    return {
+        "perfis": tamanho,
+        "concorrencia": concorrencia,
+        "erros": sum(1 for dados in resultados if "erro" in dados),
+        "duracao_s": round(duracao, 3),
+        "perfis_por_s": round(tamanho / duracao, 2),
+    }
+
+def executar(repeticoes: int = 20, tamanho_lote: int = 50, concorrencia: int = 8, latencia: float = 0.0):
+    import scraper
+    import parsers
+
+    with ServidorLocal(latencia=latencia) as servidor:
+        scraper.URL_BASE = servidor.url
+        scraper.URL_ICONES_CAMPEOES = servidor.url + "/icones"
+        etapas, dados = _etapas_scraper(servidor, repeticoes)
+        etapas.update(_etapas_imagens(servidor, repeticoes))
+        etapas.update(_etapas_graficos(dados, repeticoes))
+        lote = _lote(servidor, tamanho_lote, concorrencia)
+
+    try:
+        import resource
+        pico_processo_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        pico_processo_kb = None
+
+    return {
+        "quando": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "backend_padrao": parsers.resolver_backend(),
+        "latencia_simulada_s": latencia,
+        "etapas": etapas,
+        "lote": lote,
+        "pico_memoria_processo_kb": pico_processo_kb,
+    }
+
+def comparar(atual: dict, anterior: dict, tolerancia: float):
+    """Lista as etapas cuja mediana piorou mais que `tolerancia` (0.2 = 20%) em relação à execução anterior."""
+    regressoes = []
+    for nome, etapa in atual["etapas"].items():
+        base = anterior.get("etapas", {}).get(nome)
+        if not base or "mediana_ms" not in etapa or "mediana_ms" not in base or not base["mediana_ms"]:
+            continue
+        razao = etapa["mediana_ms"] / base["mediana_ms"]
+        print(f"  {nome:<24} {base['mediana_ms']:>10.3f} ms -> {etapa['mediana_ms']:>10.3f} ms  ({razao - 1:+.0%})")
+        if razao > 1 + tolerancia:
+            regressoes.append(nome)
+    base_lote = anterior.get("lote", {}).get("perfis_por_s")
+    if base_lote and atual["lote"]["perfis_por_s"] < base_lote / (1 + tolerancia):
+        regressoes.append("lote")
+    return regressoes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline do LoL Analytics.")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--lote", type=int, default=50, help="Perfis no teste de vazão em lote.")
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latência simulada por resposta, em segundos.")
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: benchmarks/resultados/<data>.json).")
+    parser.add_argument("--comparar", help="Resultado anterior para detectar regressões.")
+    parser.add_argument("--tolerancia", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    resultado = executar(args.repeticoes, args.lote, args.concorrencia, args.latencia)
+
+    for nome, etapa in resultado["etapas"].items():
+        if "mediana_ms" in etapa:
+            print(f"{nome:<24} mediana {etapa['mediana_ms']:>10.3f} ms   p95 {etapa['p95_ms']:>10.3f} ms   pico {etapa['pico_memoria_kb']:>9.1f} KB")
+        else:
+            print(f"{nome:<24} {etapa}")
+    lote = resultado["lote"]
+    print(f"lote: {lote['perfis']} perfis em {lote['duracao_s']}s ({lote['perfis_por_s']} perfis/s, {lote['erros']} erros)")
+
+    saida = args.saida or os.path.join(DIRETORIO_RESULTADOS, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"Resultado salvo em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            anterior = json.load(f)
+        print(f"Comparação com {args.comparar}:")
+        regressoes = comparar(resultado, anterior, args.tolerancia)
+        if regressoes:
+            print(f"Regressões acima de {args.tolerancia:.0%}: {', '.join(regressoes)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
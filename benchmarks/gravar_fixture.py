@@ -0,0 +1,41 @@
+# benchmarks/gravar_fixture.py
+"""Grava a página real de um perfil como fixture para o benchmark.
+
+Uso: python -m benchmarks.gravar_fixture "Nome#TAG" br [--padrao]
+
+A página vai para fixtures/perfis/<slug>.html (servida quando o benchmark pede esse slug);
+com --padrao ela substitui fixtures/perfil.html, usada para qualquer outro nome.
+"""
+import argparse
+import os
+import sys
+
+import http_client
+from benchmarks.servidor_local import DIRETORIO_FIXTURES
+from scraper import URL_BASE, montar_url
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grava um perfil do League of Graphs como fixture.")
+    parser.add_argument("nome", help="Nome no formato Nome#TAG")
+    parser.add_argument("regiao")
+    parser.add_argument("--padrao", action="store_true", help="Salva como a fixture padrão (perfil.html).")
+    args = parser.parse_args(argv)
+
+    url = montar_url(args.nome, args.regiao)
+    resposta = http_client.get(url)
+    resposta.raise_for_status()
+    # Ícones do perfil passam a ser servidos pelo servidor local
+    html = resposta.text.replace("//opgg-static.akamaized.net", "{{BASE_URL}}/icones")
+
+    if args.padrao:
+        destino = os.path.join(DIRETORIO_FIXTURES, "perfil.html")
+    else:
+        destino = os.path.join(DIRETORIO_FIXTURES, "perfis", url[len(URL_BASE):].rsplit("/", 1)[1] + ".html")
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    with open(destino, 'w', encoding='utf-8') as f:
+        f.write(html)
+    print(f"{url} -> {destino} ({len(html) / 1024:.0f} KB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# benchmarks/servidor_local.py
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+DIRETORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+ICONE_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "icon.png")
+JOGADORES_POR_PAGINA = 100
+
+class ServidorLocal:
+    """Servidor HTTP local que imita o League of Graphs e os hosts de ícones usando as fixtures gravadas.
+
+    Rotas:
+      /summoner/<regiao>/<slug>  -> fixtures/perfis/<slug>.html, ou fixtures/perfil.html;
+                                    slugs começando com "inexistente" respondem 404
+      /icones/<qualquer>.png     -> o PNG de ícone (com ETag, responde 304 a If-None-Match)
+      /rankings/summoners/<regiao>/page-<n>
+                                 -> fixtures/ladder/page-<n>.html, ou uma página de ranking gerada
+                                    com JOGADORES_POR_PAGINA links; além de `paginas_ladder`, 404
+
+    `{{BASE_URL}}` dentro das fixtures é trocado pela URL do servidor, para que os ícones
+    apontem para ele. `latencia` (segundos) é somada a cada resposta para simular a rede.
+    """
+
+    def __init__(self, diretorio_fixtures: str = DIRETORIO_FIXTURES, latencia: float = 0.0, caminho_icone: str = ICONE_PADRAO,
+                 paginas_ladder: int = 3):
+        self.diretorio_fixtures = diretorio_fixtures
+        self.latencia = latencia
+        self.paginas_ladder = paginas_ladder
+        with open(caminho_icone, 'rb') as f:
+            self.icone = f.read()
+        self.etag_icone = '"' + hashlib.sha1(self.icone).hexdigest() + '"'
+        self.requisicoes = 0
+        self.conexoes = set()
+        self.rotas = {}
+        self._servidor = None
+        self._thread = None
+        self._paginas = {}
+
+    @property
+    def url(self):
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def adicionar_rota(self, prefixo: str, responder):
+        """Registra `responder(servidor, caminho) -> (status, content_type, corpo_bytes)` para caminhos com o prefixo."""
+        self.rotas[prefixo] = responder
+
+    def pagina(self, nome_arquivo: str):
+        """Conteúdo de uma fixture, já com `{{BASE_URL}}` substituído. Retorna None se não existir."""
+        if nome_arquivo not in self._paginas:
+            caminho = os.path.join(self.diretorio_fixtures, nome_arquivo)
+            if not os.path.exists(caminho):
+                return None
+            with open(caminho, 'r', encoding='utf-8') as f:
+                self._paginas[nome_arquivo] = f.read().replace("{{BASE_URL}}", self.url).encode('utf-8')
+        return self._paginas[nome_arquivo]
+
+    def _responder_perfil(self, caminho):
+        partes = caminho.strip("/").split("/")
+        if len(partes) != 3:
+            return 404, "text/plain", b"not found"
+        slug = unquote(partes[2])
+        if slug.startswith("inexistente"):
+            return 404, "text/html", b"<html><head><title>Not found</title></head></html>"
+        corpo = self.pagina(os.path.join("perfis", slug + ".html")) or self.pagina("perfil.html")
+        return 200, "text/html; charset=utf-8", corpo
+
+    def _responder_ladder(self, caminho):
+        partes = caminho.strip("/").split("/")
+        if len(partes) != 4 or not partes[3].startswith("page-") or not partes[3][5:].isdigit():
+            return 404, "text/plain", b"not found"
+        regiao, numero = partes[2], int(partes[3][5:])
+        if not 1 <= numero <= self.paginas_ladder:
+            return 404, "text/html", b"<html><head><title>Not found</title></head></html>"
+        corpo = self.pagina(os.path.join("ladder", f"page-{numero}.html"))
+        if corpo is None:
+            inicio = (numero - 1) * JOGADORES_POR_PAGINA
+            linhas = "".join(
+                f'<tr><td>{posicao + 1}</td><td><a href="/summoner/{regiao}/jogador{posicao}-{regiao}1">'
+                f'Jogador{posicao}#{regiao.upper()}1</a></td></tr>'
+                for posicao in range(inicio, inicio + JOGADORES_POR_PAGINA)
+            )
+            corpo = f"<html><head><title>Ranking</title></head><body><table>{linhas}</table></body></html>".encode('utf-8')
+        return 200, "text/html; charset=utf-8", corpo
+
+    def iniciar(self):
+        servidor_local = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                servidor_local.requisicoes += 1
+                servidor_local.conexoes.add(self.client_address)
+                if servidor_local.latencia:
+                    time.sleep(servidor_local.latencia)
+                caminho = urlparse(self.path).path
+                headers = {}
+                if caminho.startswith("/icones/"):
+                    if self.headers.get("If-None-Match") == servidor_local.etag_icone:
+                        status, tipo, corpo = 304, "image/png", b""
+                    else:
+                        status, tipo, corpo = 200, "image/png", servidor_local.icone
+                    headers["ETag"] = servidor_local.etag_icone
+                elif caminho.startswith("/summoner/"):
+                    status, tipo, corpo = servidor_local._responder_perfil(caminho)
+                elif caminho.startswith("/rankings/summoners/"):
+                    status, tipo, corpo = servidor_local._responder_ladder(caminho)
+                else:
+                    for prefixo, responder in servidor_local.rotas.items():
+                        if caminho.startswith(prefixo):
+                            status, tipo, corpo = responder(servidor_local, caminho)
+                            break
+                    else:
+                        status, tipo, corpo = 404, "text/plain", b"not found"
+                self.send_response(status)
+                self.send_header("Content-Type", tipo)
+                self.send_header("Content-Length", str(len(corpo)))
+                for nome, valor in headers.items():
+                    self.send_header(nome, valor)
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._servidor.daemon_threads = True
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
@@ -0,0 +1,211 @@
+# benchmarks/soak.py
+"""Teste de resistência: milhares de buscas seguidas contra o servidor local, medindo se a memória cresce.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.soak [--buscas 2000] [--intervalo 100] [--sem-interface] [--sem-cache]
+
+Com interface, a própria `LoLScraperApp` faz as buscas (precisa de um display; em servidores use
+xvfb-run). Sem interface, cada busca repete o que a janela faz por trás: perfil, gráficos e ícones.
+A cada `--intervalo` buscas é gravada uma amostra com RSS, memória do tracemalloc, widgets e imagens
+Tk vivos e figuras do Matplotlib ainda na memória; ao final, as linhas que mais cresceram segundo o
+tracemalloc são listadas. O processo termina com código 1 se o RSS crescer mais que `--limite-mb`
+entre a primeira amostra (depois do aquecimento) e a última.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# Caches e histórico do teste ficam num diretório temporário, longe dos dados do usuário
+if "LOL_CACHE_DIR" not in os.environ:
+    os.environ["LOL_CACHE_DIR"] = tempfile.mkdtemp(prefix="lol-soak-")
+
+from benchmarks.servidor_local import ServidorLocal
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+
+def rss_mb():
+    """Memória residente atual do processo em MB (no Linux; nos demais, o pico)."""
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for linha in f:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+def contar_figuras():
+    if "matplotlib.figure" not in sys.modules:
+        return 0
+    from matplotlib.figure import Figure
+    return sum(1 for objeto in gc.get_objects() if isinstance(objeto, Figure))
+
+def contar_widgets(widget):
+    return 1 + sum(contar_widgets(filho) for filho in widget.winfo_children())
+
+def amostrar(buscas, inicio, app=None):
+    atual, pico = tracemalloc.get_traced_memory()
+    amostra = {
+        "buscas": buscas,
+        "segundos": round(time.perf_counter() - inicio, 2),
+        "rss_mb": round(rss_mb(), 1),
+        "tracemalloc_mb": round(atual / 1024 / 1024, 2),
+        "tracemalloc_pico_mb": round(pico / 1024 / 1024, 2),
+        "figuras": contar_figuras(),
+        "threads": threading.active_count(),
+    }
+    if app is not None:
+        amostra["widgets"] = contar_widgets(app.root)
+        amostra["imagens_tk"] = len(app.root.tk.call("image", "names"))
+        amostra["fotos_resultado"] = len(app._fotos_resultado)
+    return amostra
+
+
+class BuscasSemInterface:
+    """Repete o trabalho de uma busca da janela (perfil, gráficos, ícones) sem o Tkinter."""
+
+    def __init__(self, sem_cache: bool):
+        import graficos
+        import utils
+        from profile_cache import cache_perfis
+
+        self.graficos = graficos
+        self.utils = utils
+        self.cache_perfis = cache_perfis
+        self.sem_cache = sem_cache
+        self.ids = utils.carregar_id_por_nome_campeao()
+
+    def buscar(self, nome, regiao):
+        if self.sem_cache:
+            self.graficos.cache_graficos.limpar()
+            self.utils.cache_imagens.limpar_memoria()
+        dados = self.cache_perfis.obter(nome, regiao, self.ids, forcar=True)
+        if "erro" in dados:
+            return dados
+        for renderizar, argumentos in (("renderizar_radar", (dados["roles_data"],)),
+                                       ("renderizar_elo", (dados["graph_data"], dados["rank_map"]))):
+            try:
+                getattr(self.graficos, renderizar)(*argumentos)
+            except self.graficos.DadosInsuficientes:
+                pass
+        urls = [dados.get("icone_url")] + [campeao["icon_url"] for campeao in dados["campeoes"][:3]]
+        for url in filter(None, urls):
+            self.utils.processar_foto_arredondada(url, 50)
+        return dados
+
+
+def _esperar_janela(app, limite_s: float = 30.0):
+    """Processa eventos do Tk até a busca e todas as imagens/gráficos dela serem aplicados na tela."""
+    fim = time.perf_counter() + limite_s
+    while app.ocupado and time.perf_counter() < fim:
+        app.root.update()
+        time.sleep(0.002)
+    app.root.update()
+
+def executar(total: int, intervalo: int, variedade: int, com_interface: bool, sem_cache: bool, latencia: float,
+             ao_amostrar=None):
+    import scraper
+    import graficos
+    import utils
+
+    amostras = []
+    with ServidorLocal(latencia=latencia) as servidor:
+        scraper.URL_BASE = servidor.url
+        scraper.URL_ICONES_CAMPEOES = servidor.url + "/icones"
+
+        app = None
+        if com_interface:
+            import tkinter as tk
+            import gui
+
+            gui.URL_MEDALHA_ELO = servidor.url + "/icones/medalha-{}.png"
+            raiz = tk.Tk()
+            app = gui.LoLScraperApp(raiz)
+            raiz.update()
+        else:
+            buscador = BuscasSemInterface(sem_cache)
+
+        tracemalloc.start(1)
+        inicio = time.perf_counter()
+        base = None
+        for i in range(total + 1):
+            if i % intervalo == 0:
+                gc.collect()
+                amostra = amostrar(i, inicio, app)
+                amostras.append(amostra)
+                if ao_amostrar:
+                    ao_amostrar(amostra)
+                # A primeira rodada aquece caches, índices e imports; a comparação começa depois dela
+                if i == intervalo:
+                    base = tracemalloc.take_snapshot()
+            if i == total:
+                break
+            nome = f"Soak{i % variedade}#BR1"
+            if app is not None:
+                if sem_cache:
+                    graficos.cache_graficos.limpar()
+                    utils.cache_imagens.limpar_memoria()
+                app._buscar(nome, "br", forcar=True)
+                _esperar_janela(app)
+            else:
+                buscador.buscar(nome, "br")
+
+        crescimento = []
+        if base is not None:
+            for estatistica in tracemalloc.take_snapshot().compare_to(base, "lineno")[:10]:
+                if estatistica.size_diff > 0:
+                    crescimento.append({"local": str(estatistica.traceback[0]), "kb": round(estatistica.size_diff / 1024, 1),
+                                        "blocos": estatistica.count_diff})
+        tracemalloc.stop()
+        if app is not None:
+            app.fechar()
+    return amostras, crescimento
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de resistência de memória do LoL Analytics.")
+    parser.add_argument("--buscas", type=int, default=2000)
+    parser.add_argument("--intervalo", type=int, default=100, help="Buscas entre duas amostras.")
+    parser.add_argument("--variedade", type=int, default=50, help="Invocadores distintos buscados em rodízio.")
+    parser.add_argument("--sem-interface", action="store_true", help="Não abre a janela (para máquinas sem display).")
+    parser.add_argument("--sem-cache", action="store_true", help="Limpa os caches de gráficos e imagens a cada busca.")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latência simulada por resposta, em segundos.")
+    parser.add_argument("--limite-mb", type=float, default=20.0, help="Crescimento de RSS tolerado após o aquecimento.")
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: benchmarks/resultados/soak-<data>.json).")
+    args = parser.parse_args(argv)
+
+    com_interface = not args.sem_interface
+    if com_interface and sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        print("Sem DISPLAY: rodando sem interface (use xvfb-run para testar a janela).", file=sys.stderr)
+        com_interface = False
+
+    def mostrar(amostra):
+        print(" ".join(f"{chave}={valor}" for chave, valor in amostra.items()), flush=True)
+
+    amostras, crescimento = executar(args.buscas, args.intervalo, args.variedade, com_interface, args.sem_cache,
+                                     args.latencia, ao_amostrar=mostrar)
+    referencia = amostras[1] if len(amostras) > 2 else amostras[0]
+    delta_rss = amostras[-1]["rss_mb"] - referencia["rss_mb"]
+    print(f"RSS após aquecimento: {referencia['rss_mb']} MB -> {amostras[-1]['rss_mb']} MB ({delta_rss:+.1f} MB)")
+    if crescimento:
+        print("Maiores crescimentos (tracemalloc):")
+        for item in crescimento:
+            print(f"  {item['kb']:>10.1f} KB  {item['blocos']:>+7d} blocos  {item['local']}")
+
+    saida = args.saida or os.path.join(DIRETORIO_RESULTADOS, "soak-" + time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump({"interface": com_interface, "sem_cache": args.sem_cache, "amostras": amostras,
+                   "crescimento_tracemalloc": crescimento, "delta_rss_mb": round(delta_rss, 1)}, f, ensure_ascii=False, indent=2)
+    print(f"Resultado salvo em {saida}")
+    return 1 if delta_rss > args.limite_mb else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
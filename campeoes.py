@@ -0,0 +1,132 @@
+# campeoes.py
+"""Índice de campeões montado a partir do icons.json.
+
+O índice resolve nomes com chaves canônicas (sem acento, pontuação ou espaços: "Kai'Sa" -> "kaisa",
+"Nunu & Willump" -> "nunuwillump"), aceita apelidos ("MonkeyKing" -> Wukong) e faz a busca
+reversa id -> nome. Fica salvo em pickle no diretório de cache e só é refeito quando o icons.json
+muda; dentro do processo é carregado uma única vez e compartilhado pela GUI, lote e servidor.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import unicodedata
+from collections.abc import Mapping
+
+from image_cache import DIRETORIO_CACHE
+
+logger = logging.getLogger(__name__)
+
+CAMINHO_ICONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'icons.json')
+CAMINHO_INDICE = os.path.join(DIRETORIO_CACHE, "campeoes.pickle")
+VERSAO_INDICE = 1
+
+# Nomes exibidos pelo site (ou antigos/internos) que não viram a chave do icons.json
+ALIASES = {
+    "nunuwillump": "Nunu",
+    "monkeyking": "Wukong",
+    "renataglasc": "Renata",
+}
+
+def normalizar_nome_campeao(nome: str):
+    """Chave canônica de um nome de campeão: minúsculas, sem acentos e só letras/dígitos."""
+    sem_acentos = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode("ascii")
+    return "".join(c for c in sem_acentos.lower() if c.isalnum())
+
+class IndiceCampeoes(Mapping):
+    """Mapa nome -> id que aceita qualquer grafia do nome (veja `normalizar_nome_campeao`)."""
+
+    def __init__(self, id_por_chave: dict, nome_por_id: dict):
+        self._id_por_chave = id_por_chave
+        self._nome_por_id = nome_por_id
+
+    @classmethod
+    def de_icons(cls, id_para_nome: dict):
+        nome_por_id = {int(id_str): nome for id_str, nome in id_para_nome.items()}
+        id_por_chave = {normalizar_nome_campeao(nome): champ_id for champ_id, nome in nome_por_id.items()}
+        for alias, nome in ALIASES.items():
+            champ_id = id_por_chave.get(normalizar_nome_campeao(nome))
+            if champ_id is not None:
+                id_por_chave.setdefault(alias, champ_id)
+        return cls(id_por_chave, nome_por_id)
+
+    def __getitem__(self, nome):
+        return self._id_por_chave[normalizar_nome_campeao(nome)]
+
+    def __contains__(self, nome):
+        return isinstance(nome, str) and normalizar_nome_campeao(nome) in self._id_por_chave
+
+    def __iter__(self):
+        return iter(self._id_por_chave)
+
+    def __len__(self):
+        return len(self._id_por_chave)
+
+    def nome_por_id(self, champ_id: int):
+        """Nome do campeão como está no icons.json, ou None se o id não existir."""
+        return self._nome_por_id.get(int(champ_id))
+
+    def __reduce__(self):
+        return (IndiceCampeoes, (self._id_por_chave, self._nome_por_id))
+
+
+def _assinatura(caminho: str):
+    info = os.stat(caminho)
+    return info.st_mtime_ns, info.st_size
+
+def _hash_arquivo(caminho: str):
+    with open(caminho, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _ler_cache(caminho_cache: str):
+    try:
+        with open(caminho_cache, 'rb') as f:
+            conteudo = pickle.load(f)
+        return conteudo if conteudo.get("versao") == VERSAO_INDICE else None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+        return None
+
+def _gravar_cache(caminho_cache: str, conteudo: dict):
+    try:
+        os.makedirs(os.path.dirname(caminho_cache), exist_ok=True)
+        temporario = caminho_cache + ".tmp"
+        with open(temporario, 'wb') as f:
+            pickle.dump(conteudo, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho_cache)
+    except OSError as e:
+        logger.warning("Não foi possível salvar o índice de campeões: %s", e)
+
+def construir_indice(caminho_icons: str = CAMINHO_ICONS, caminho_cache: str = CAMINHO_INDICE):
+    """Carrega o índice do cache em disco, refazendo-o a partir do icons.json se o arquivo mudou."""
+    import json
+
+    assinatura = _assinatura(caminho_icons)
+    cache = _ler_cache(caminho_cache)
+    if cache and cache["assinatura"] == assinatura:
+        return cache["indice"]
+
+    hash_icons = _hash_arquivo(caminho_icons)
+    if cache and cache["hash"] == hash_icons:
+        # Só a data mudou (checkout, cópia): o índice continua válido
+        cache["assinatura"] = assinatura
+        _gravar_cache(caminho_cache, cache)
+        return cache["indice"]
+
+    with open(caminho_icons, 'r', encoding='utf-8') as f:
+        indice = IndiceCampeoes.de_icons(json.load(f))
+    _gravar_cache(caminho_cache, {"versao": VERSAO_INDICE, "assinatura": assinatura, "hash": hash_icons, "indice": indice})
+    logger.debug("Índice de campeões reconstruído (%d chaves).", len(indice))
+    return indice
+
+_indice = None
+_lock_indice = threading.Lock()
+
+def obter_indice():
+    """Índice compartilhado do processo, carregado na primeira chamada."""
+    global _indice
+    if _indice is None:
+        with _lock_indice:
+            if _indice is None:
+                _indice = construir_indice()
+    return _indice
@@ -0,0 +1,110 @@
+# cli.py
+import argparse
+import json
+import sys
+import textwrap
+import time
+
+import instrumentacao
+from batch import MAX_BUSCAS_SIMULTANEAS, REGIAO_PADRAO, ler_arquivo_entradas, obter_dados_em_lote
+from exportacao import FORMATOS, Exportador
+from historico import CAMINHO_HISTORICO, Historico
+from modelos import Perfil
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Busca em lote de invocadores no League of Graphs, sem interface gráfica.")
+    parser.add_argument("arquivo", help="Arquivo com uma linha 'Nome#TAG,regiao' por invocador.")
+    parser.add_argument("-c", "--concorrencia", type=int, default=MAX_BUSCAS_SIMULTANEAS,
+                        help=f"Número de buscas simultâneas (padrão: {MAX_BUSCAS_SIMULTANEAS}).")
+    parser.add_argument("-r", "--regiao-padrao", default=REGIAO_PADRAO,
+                        help=f"Região usada nas linhas sem região (padrão: {REGIAO_PADRAO}).")
+    parser.add_argument("-o", "--saida",
+                        help="Arquivo JSON de saída ('-' para a saída padrão, o padrão quando não há --exportar).")
+    parser.add_argument("--trace", metavar="ARQUIVO",
+                        help="Liga a instrumentação: grava os spans em NDJSON e inclui 'timings' em cada resultado.")
+    parser.add_argument("-p", "--processos", type=int, default=0, metavar="N",
+                        help="Extrai as páginas em N processos (modo pipeline; 0 = tudo em threads, o padrão).")
+    parser.add_argument("--historico", nargs="?", const=CAMINHO_HISTORICO, metavar="ARQUIVO",
+                        help=f"Grava cada busca no histórico SQLite (padrão: {CAMINHO_HISTORICO}).")
+    parser.add_argument("--exportar", metavar="DIRETORIO",
+                        help="Grava cada perfil assim que termina em arquivos por tabela (perfis, campeoes, rotas, "
+                             "pontos_rank), sem guardar os resultados na memória.")
+    parser.add_argument("--formato", action="append", choices=FORMATOS,
+                        help="Formato da exportação; pode ser repetido (padrão: ndjson).")
+    parser.add_argument("--gzip", action="store_true", help="Comprime os arquivos exportados com gzip (arquivos .partN.gz novos a cada execução).")
+    return parser
+
+def escrever_json(arquivo, entradas, resultados):
+    """Grava a lista de resultados (mesmo texto de `json.dump(..., indent=2)`) um item por vez.
+
+    Os `Perfil` viram dicionário só na hora de serem escritos, então os dicionários de todo o lote
+    nunca estão na memória ao mesmo tempo.
+    """
+    arquivo.write("[")
+    vazio = True
+    for (nome, regiao), resultado in zip(entradas, resultados):
+        dados = resultado.para_dict() if isinstance(resultado, Perfil) else resultado
+        item = json.dumps({"invocador": nome, "regiao": regiao, "dados": dados}, ensure_ascii=False, indent=2)
+        arquivo.write(("\n" if vazio else ",\n") + textwrap.indent(item, "  ", lambda linha: True))
+        vazio = False
+    arquivo.write("]" if vazio else "\n]")
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    instrumentacao.configurar_logging()
+    if args.trace:
+        instrumentacao.ativar(args.trace)
+    entradas = ler_arquivo_entradas(args.arquivo, args.regiao_padrao)
+    if not entradas:
+        print("Nenhum invocador encontrado no arquivo.", file=sys.stderr)
+        return 1
+
+    exportador = Exportador(args.exportar, args.formato or ("ndjson",), args.gzip) if args.exportar else None
+    # Exportando sem -o, os resultados não são guardados: a memória não cresce com o tamanho do lote
+    saida_json = args.saida or (None if exportador else "-")
+    # Os resultados guardados ficam como `Perfil`, exceto com --trace, que precisa dos "timings" do dicionário
+    como_perfil = not args.trace
+
+    def progresso(indice, nome, regiao, dados):
+        status = "erro" if "erro" in dados else "ok"
+        if exportador is not None:
+            exportador.gravar(nome, regiao, dados)
+        print(f"[{status}] {nome} ({regiao.upper()})", file=sys.stderr)
+
+    historico = Historico(args.historico) if args.historico else None
+    inicio = time.perf_counter()
+    try:
+        if args.processos > 0:
+            from pipeline import obter_dados_em_pipeline
+
+            resultados = obter_dados_em_pipeline(entradas, max_downloads=args.concorrencia, processos=args.processos,
+                                                 ao_concluir=progresso, historico=historico,
+                                                 guardar_resultados=saida_json is not None, como_perfil=como_perfil)
+        else:
+            resultados = obter_dados_em_lote(entradas, max_workers=args.concorrencia, ao_concluir=progresso, historico=historico,
+                                             guardar_resultados=saida_json is not None, como_perfil=como_perfil)
+    finally:
+        if exportador is not None:
+            exportador.fechar()
+        if historico is not None:
+            historico.fechar()
+    duracao = time.perf_counter() - inicio
+
+    if saida_json == "-":
+        escrever_json(sys.stdout, entradas, resultados)
+        sys.stdout.write("\n")
+    elif saida_json is not None:
+        with open(saida_json, 'w', encoding='utf-8') as f:
+            escrever_json(f, entradas, resultados)
+
+    erros = exportador.erros if saida_json is None else sum(1 for dados in resultados if isinstance(dados, dict) and "erro" in dados)
+    print(f"{len(resultados)} invocadores em {duracao:.1f}s ({erros} com erro).", file=sys.stderr)
+    if exportador is not None:
+        print(f"Exportado em {args.exportar}: {json.dumps(exportador.linhas, ensure_ascii=False)}", file=sys.stderr)
+    if args.trace:
+        print(f"Contadores: {json.dumps(instrumentacao.contadores(), ensure_ascii=False)}", file=sys.stderr)
+        instrumentacao.desativar()
+    return 0 if erros < len(resultados) else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
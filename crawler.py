@@ -0,0 +1,318 @@
+# crawler.py
+"""Coleta do ranking de uma região: percorre as páginas do ladder do League of Graphs, busca cada
+invocador listado e grava os perfis em NDJSON, uma linha por invocador assim que ele termina.
+
+O progresso (próxima página, invocadores já concluídos) vai para um checkpoint JSON gravado de
+forma atômica; rodar de novo com o mesmo checkpoint e a mesma saída continua de onde parou, sem
+buscar de novo quem já está no arquivo. Buscas que falham (429, erro de conexão) não vão para a
+saída: ficam no checkpoint e são tentadas de novo no início da próxima execução, até
+MAX_TENTATIVAS vezes. Invocadores com um snapshot recente no histórico (`historico.py`) são
+pulados. Com `--exportar`, cada perfil também é achatado em tabelas NDJSON/CSV (`exportacao.py`)
+no mesmo momento em que vai para a saída.
+
+Uso: python crawler.py br -o ranking_br.ndjson --paginas 5
+"""
+import argparse
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from urllib.parse import unquote
+
+import requests
+
+import instrumentacao
+import scraper
+from armazenamento import completar_ultima_linha, gravar_json_atomico
+from batch import MAX_BUSCAS_SIMULTANEAS, obter_dados_em_lote
+from exportacao import FORMATOS, Exportador
+from historico import CAMINHO_HISTORICO, Historico
+from utils import carregar_id_por_nome_campeao
+
+logger = logging.getLogger(__name__)
+
+# Perfis buscados há menos que isso (segundos) não são buscados de novo
+MAX_IDADE_PADRAO = 24 * 60 * 60
+# A cada quantos perfis concluídos o checkpoint é regravado (além do fim de cada página)
+INTERVALO_CHECKPOINT = 25
+# Quantas vezes, somando as execuções, um invocador que falhou é buscado antes de ser deixado de lado
+MAX_TENTATIVAS = 3
+
+LINK_PERFIL_RE = re.compile(r'href="(?:https?:)?(?://[^"/]+)?/summoner/([a-z0-9]+)/([^"/?#]+)"')
+
+def montar_url_ladder(regiao: str, pagina: int):
+    return f"{scraper.URL_BASE}/rankings/summoners/{regiao.lower()}/page-{pagina}"
+
+def nome_do_slug(slug: str):
+    """'faker-kr1' -> 'faker#kr1'; o inverso de `scraper.montar_url` (que monta a URL em minúsculas)."""
+    slug = unquote(slug)
+    if '-' not in slug:
+        return slug
+    game_name, tagline = slug.rsplit('-', 1)
+    return f"{game_name}#{tagline}"
+
+def extrair_links_ladder(html: str, regiao: str):
+    """Nomes 'Nome#TAG' dos perfis da `regiao` linkados na página, sem repetição e na ordem do ranking."""
+    vistos = {}
+    for regiao_link, slug in LINK_PERFIL_RE.findall(html):
+        if regiao_link == regiao.lower():
+            vistos.setdefault(nome_do_slug(slug), None)
+    return list(vistos)
+
+
+class Checkpoint:
+    """Estado do crawler salvo em JSON; cada gravação substitui o arquivo de forma atômica."""
+
+    def __init__(self, caminho: str, regiao: str):
+        self.caminho = caminho
+        self.regiao = regiao
+        self.proxima_pagina = 1
+        self.fim_ladder = False
+        self.concluidos = set()
+        # nome em minúsculas -> [nome, tentativas] dos invocadores cuja busca falhou
+        self.falhas = {}
+        self._carregar()
+
+    def _carregar(self):
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                estado = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if estado.get("regiao") != self.regiao:
+            logger.warning("Checkpoint %s é de outra região (%s); começando do zero.", self.caminho, estado.get("regiao"))
+            return
+        self.proxima_pagina = estado.get("proxima_pagina", 1)
+        self.fim_ladder = estado.get("fim_ladder", False)
+        self.concluidos = set(estado.get("concluidos", ()))
+        self.falhas = {chave: list(falha) for chave, falha in estado.get("falhas", {}).items()}
+
+    def registrar_falha(self, nome: str):
+        """Conta mais uma tentativa sem sucesso de `nome` e retorna o total."""
+        falha = self.falhas.setdefault(nome.lower(), [nome, 0])
+        falha[1] += 1
+        return falha[1]
+
+    def esgotado(self, nome: str):
+        falha = self.falhas.get(nome.lower())
+        return falha is not None and falha[1] >= MAX_TENTATIVAS
+
+    def a_repetir(self):
+        """Nomes das buscas que falharam e ainda têm tentativas sobrando."""
+        return [nome for nome, tentativas in self.falhas.values() if tentativas < MAX_TENTATIVAS]
+
+    def salvar(self):
+        gravar_json_atomico(self.caminho, {
+            "regiao": self.regiao,
+            "proxima_pagina": self.proxima_pagina,
+            "fim_ladder": self.fim_ladder,
+            "concluidos": sorted(self.concluidos),
+            "falhas": self.falhas,
+            "salvo_em": time.time(),
+        }, sincronizar=True)
+
+
+def _nomes_ja_gravados(caminho_saida: str):
+    """Invocadores já presentes no NDJSON de saída (cobre o que o último checkpoint não chegou a registrar)."""
+    nomes = set()
+    try:
+        with open(caminho_saida, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                    if "erro" not in registro["dados"]:
+                        nomes.add(registro["invocador"].lower())
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue  # Linha cortada por uma interrupção no meio da escrita
+    except OSError:
+        pass
+    return nomes
+
+
+def _abrir_saida(caminho_saida: str):
+    completar_ultima_linha(caminho_saida)
+    return open(caminho_saida, 'a', encoding='utf-8')
+
+
+class Crawler:
+    def __init__(self, regiao: str, caminho_saida: str, caminho_checkpoint: str = None, historico: Historico = None,
+                 max_paginas: int = None, max_perfis: int = None, max_idade: float = MAX_IDADE_PADRAO,
+                 max_workers: int = MAX_BUSCAS_SIMULTANEAS, exportador: Exportador = None):
+        self.regiao = regiao.lower()
+        self.caminho_saida = caminho_saida
+        self.checkpoint = Checkpoint(caminho_checkpoint or caminho_saida + ".checkpoint.json", self.regiao)
+        self.historico = historico
+        self.max_paginas = max_paginas
+        self.max_perfis = max_perfis
+        self.max_idade = max_idade
+        self.max_workers = max_workers
+        self.exportador = exportador
+        self.estatisticas = {"paginas": 0, "buscados": 0, "erros": 0, "recentes": 0, "ja_concluidos": 0}
+        self._lock = threading.Lock()
+        self._desde_checkpoint = 0
+        # Depois de uma interrupção, buscas que ainda estavam em andamento não gravam mais nada
+        self._encerrado = False
+
+    def _recente(self, nome: str):
+        if self.historico is None:
+            return False
+        idade = self.historico.idade(nome, self.regiao)
+        return idade is not None and idade < self.max_idade
+
+    def _limite_atingido(self):
+        return self.max_perfis is not None and len(self.checkpoint.concluidos) >= self.max_perfis
+
+    def _vagas(self, pendentes):
+        """Corta `pendentes` no que ainda cabe em `max_perfis`; retorna (lista, se coube inteira)."""
+        if self.max_perfis is None:
+            return pendentes, True
+        vagas = max(0, self.max_perfis - len(self.checkpoint.concluidos))
+        return pendentes[:vagas], len(pendentes) <= vagas
+
+    def executar(self, ao_concluir=None):
+        """Percorre o ladder até o fim (ou até os limites) e retorna as estatísticas da execução.
+
+        `ao_concluir(nome, dados)` é chamado para cada perfil buscado, depois de ele ser gravado
+        (também para as falhas, que só vão para o checkpoint).
+        """
+        self.checkpoint.concluidos |= _nomes_ja_gravados(self.caminho_saida)
+        for chave in self.checkpoint.concluidos & self.checkpoint.falhas.keys():
+            del self.checkpoint.falhas[chave]
+        ids = carregar_id_por_nome_campeao()
+        paginas_lidas = 0
+
+        with _abrir_saida(self.caminho_saida) as saida:
+            def gravar(indice, nome, regiao, dados):
+                buscado_em = time.time()
+                with self._lock:
+                    if self._encerrado:
+                        return  # Terminou depois da interrupção: fica para a próxima execução
+                    self.estatisticas["buscados"] += 1
+                    if "erro" in dados:
+                        self.estatisticas["erros"] += 1
+                        tentativas = self.checkpoint.registrar_falha(nome)
+                        logger.warning("Falha ao buscar %s (tentativa %d de %d): %s", nome, tentativas, MAX_TENTATIVAS, dados["erro"])
+                    else:
+                        if self.exportador is not None:
+                            self.exportador.gravar(nome, regiao, dados, buscado_em)
+                        # A linha vai para o disco antes de o invocador contar como concluído no checkpoint
+                        saida.write(json.dumps({"invocador": nome, "regiao": regiao, "buscado_em": buscado_em, "dados": dados},
+                                               ensure_ascii=False) + "\n")
+                        saida.flush()
+                        self.checkpoint.concluidos.add(nome.lower())
+                        self.checkpoint.falhas.pop(nome.lower(), None)
+                    self._desde_checkpoint += 1
+                    if self._desde_checkpoint >= INTERVALO_CHECKPOINT:
+                        self._desde_checkpoint = 0
+                        self.checkpoint.salvar()
+                if ao_concluir:
+                    ao_concluir(nome, dados)
+
+            try:
+                repetir, _ = self._vagas([(nome, self.regiao) for nome in self.checkpoint.a_repetir()])
+                if repetir:
+                    logger.info("Tentando de novo %d invocadores que falharam antes.", len(repetir))
+                    self._buscar(repetir, ids, gravar)
+
+                while not self.checkpoint.fim_ladder and not self._limite_atingido():
+                    if self.max_paginas is not None and paginas_lidas >= self.max_paginas:
+                        break
+                    pagina = self.checkpoint.proxima_pagina
+                    nomes = self._ler_pagina(pagina)
+                    paginas_lidas += 1
+                    if not nomes:
+                        self.checkpoint.fim_ladder = True
+                        self.checkpoint.salvar()
+                        break
+
+                    pendentes = []
+                    for nome in nomes:
+                        if nome.lower() in self.checkpoint.concluidos:
+                            self.estatisticas["ja_concluidos"] += 1
+                        elif nome.lower() in self.checkpoint.falhas:
+                            continue  # Já tentado nesta execução ou esgotado; as novas tentativas saem do checkpoint
+                        elif self._recente(nome):
+                            self.estatisticas["recentes"] += 1
+                        else:
+                            pendentes.append((nome, self.regiao))
+                    pendentes, pagina_inteira = self._vagas(pendentes)
+
+                    self._buscar(pendentes, ids, gravar)
+                    with self._lock:
+                        # Cortada por --perfis, a página é lida de novo na próxima execução (quem já foi
+                        # concluído é pulado), para o resto dela não ficar para trás
+                        if pagina_inteira:
+                            self.checkpoint.proxima_pagina = pagina + 1
+                        self._desde_checkpoint = 0
+                        self.checkpoint.salvar()
+            finally:
+                with self._lock:
+                    self._encerrado = True
+        return dict(self.estatisticas)
+
+    def _buscar(self, pendentes, ids, gravar):
+        obter_dados_em_lote(pendentes, ids, max_workers=self.max_workers, ao_concluir=gravar, historico=self.historico,
+                            guardar_resultados=False)
+        if self.exportador is not None:
+            self.exportador.flush()
+
+    def _ler_pagina(self, pagina: int):
+        url = montar_url_ladder(self.regiao, pagina)
+        try:
+            html = scraper.baixar_html(url)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                logger.info("Fim do ranking de %s na página %d.", self.regiao.upper(), pagina)
+                return []
+            raise
+        self.estatisticas["paginas"] += 1
+        nomes = extrair_links_ladder(html, self.regiao)
+        logger.info("Página %d do ranking de %s: %d invocadores.", pagina, self.regiao.upper(), len(nomes))
+        return nomes
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Coleta os perfis do ranking de uma região do League of Graphs em NDJSON.")
+    parser.add_argument("regiao", help="Região do ranking (br, na, euw...).")
+    parser.add_argument("-o", "--saida", required=True, help="Arquivo NDJSON de saída (novas linhas são acrescentadas).")
+    parser.add_argument("--checkpoint", help="Arquivo de checkpoint (padrão: <saida>.checkpoint.json).")
+    parser.add_argument("--paginas", type=int, help="Número máximo de páginas do ranking lidas nesta execução.")
+    parser.add_argument("--perfis", type=int, help="Para depois de concluir este número de invocadores (top-N).")
+    parser.add_argument("--max-idade", type=float, default=MAX_IDADE_PADRAO / 3600, metavar="HORAS",
+                        help="Pula invocadores com snapshot no histórico mais novo que isso (padrão: 24).")
+    parser.add_argument("--historico", default=CAMINHO_HISTORICO, metavar="ARQUIVO",
+                        help=f"Histórico SQLite usado para pular perfis recentes e gravar os novos (padrão: {CAMINHO_HISTORICO}).")
+    parser.add_argument("-c", "--concorrencia", type=int, default=MAX_BUSCAS_SIMULTANEAS,
+                        help=f"Número de buscas simultâneas (padrão: {MAX_BUSCAS_SIMULTANEAS}).")
+    parser.add_argument("--exportar", metavar="DIRETORIO",
+                        help="Também grava os perfis achatados em tabelas (perfis, campeoes, rotas, pontos_rank).")
+    parser.add_argument("--formato", action="append", choices=FORMATOS,
+                        help="Formato da exportação; pode ser repetido (padrão: ndjson).")
+    parser.add_argument("--gzip", action="store_true", help="Comprime os arquivos exportados com gzip (arquivos .partN.gz novos a cada execução).")
+    return parser
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    instrumentacao.configurar_logging()
+    historico = Historico(args.historico)
+    exportador = Exportador(args.exportar, args.formato or ("ndjson",), args.gzip) if args.exportar else None
+    crawler = Crawler(args.regiao, args.saida, args.checkpoint, historico, max_paginas=args.paginas,
+                      max_perfis=args.perfis, max_idade=args.max_idade * 3600, max_workers=args.concorrencia,
+                      exportador=exportador)
+    try:
+        estatisticas = crawler.executar()
+    except KeyboardInterrupt:
+        crawler.checkpoint.salvar()
+        print("Interrompido; rode de novo com a mesma saída para continuar.", file=sys.stderr)
+        return 130
+    finally:
+        if exportador is not None:
+            exportador.fechar()
+        historico.fechar()
+    print(json.dumps(estatisticas, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
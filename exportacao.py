@@ -0,0 +1,180 @@
+# exportacao.py
+"""Exportação em fluxo dos resultados de buscas em lote, com memória constante.
+
+Cada perfil é gravado assim que a busca termina e depois pode ser descartado: nada é acumulado
+até o fim da execução. O dicionário `dados` é achatado em quatro fluxos de linhas, um arquivo
+para cada: `perfis` (uma linha por busca, inclusive as com erro), `campeoes`, `rotas` e
+`pontos_rank` (pontos do gráfico de elo). Todas as linhas começam por invocador e região, para
+juntar os arquivos depois.
+
+Os arquivos podem ser NDJSON, CSV ou os dois, opcionalmente com gzip. Gravar de novo no mesmo
+diretório acrescenta linhas (o cabeçalho do CSV só é escrito em arquivo novo); uma última linha
+cortada por uma interrupção é terminada antes. Com gzip, cada execução grava arquivos novos
+(`<tabela>.<formato>.partN.gz`), porque acrescentar a um gzip que não foi fechado estraga o
+arquivo inteiro. Os buffers são descarregados a cada `intervalo_flush` segundos, então uma
+interrupção perde no máximo esse intervalo. Um .gz de uma execução interrompida não tem o final:
+o módulo `gzip` do Python recusa lê-lo (EOFError), mas `zcat` e `zlib.decompressobj` ainda
+recuperam tudo até o último descarregamento.
+"""
+import csv
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from armazenamento import completar_ultima_linha
+from instrumentacao import incrementar
+from modelos import Perfil
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = ("ndjson", "csv")
+COLUNAS = {
+    "perfis": ("invocador", "regiao", "buscado_em", "erro", "elo", "vitorias", "winrate", "ranking",
+               "kills", "deaths", "assists", "icone_url"),
+    "campeoes": ("invocador", "regiao", "posicao", "campeao", "winrate", "partidas", "ranking"),
+    "rotas": ("invocador", "regiao", "rota", "partidas", "winrate"),
+    "pontos_rank": ("invocador", "regiao", "ts_ms", "valor"),
+}
+TABELAS = tuple(COLUNAS)
+# Segundos entre dois descarregamentos dos arquivos no disco
+INTERVALO_FLUSH = 5.0
+
+def linhas_perfil(nome_invocador: str, regiao: str, dados: dict, buscado_em: float = None):
+    """Achata um resultado (dicionário `dados` ou `modelos.Perfil`) em {tabela: [linha, ...]}, com as
+    linhas como tuplas na ordem de COLUNAS."""
+    buscado_em = time.time() if buscado_em is None else buscado_em
+    if isinstance(dados, dict) and "erro" in dados:
+        return {"perfis": [(nome_invocador, regiao, buscado_em, dados["erro"]) + (None,) * 8],
+                "campeoes": [], "rotas": [], "pontos_rank": []}
+    perfil = dados if isinstance(dados, Perfil) else Perfil.de_dict(dados)
+    kills, deaths, assists = perfil.kda or (None, None, None)
+    return {
+        "perfis": [(nome_invocador, regiao, buscado_em, None, perfil.elo, perfil.vitorias, perfil.winrate,
+                    perfil.ranking, kills, deaths, assists, perfil.icone_url)],
+        "campeoes": [(nome_invocador, regiao, posicao, c.nome, c.winrate, c.partidas, c.ranking)
+                     for posicao, c in enumerate(perfil.campeoes, 1)],
+        "rotas": [(nome_invocador, regiao, r.rota, r.partidas, r.winrate) for r in perfil.rotas],
+        "pontos_rank": [(nome_invocador, regiao, p.ts_ms, p.valor) for p in perfil.pontos_rank or ()],
+    }
+
+PARTE_GZIP_RE = re.compile(r"\.part(\d+)\.gz$")
+
+def proxima_parte_gzip(diretorio: str):
+    """Número da parte (`.partN.gz`) que a próxima execução comprimida deve gravar em `diretorio`."""
+    partes = [int(m.group(1)) for m in map(PARTE_GZIP_RE.search, os.listdir(diretorio)) if m]
+    return max(partes, default=0) + 1
+
+def _abrir(caminho: str, comprimir: bool):
+    """Abre `caminho` para acrescentar texto; retorna (arquivo, se já tinha conteúdo)."""
+    if comprimir:
+        # Sempre um arquivo novo (veja proxima_parte_gzip)
+        return gzip.open(caminho, 'xt', encoding='utf-8', newline=''), False
+    existia = completar_ultima_linha(caminho)
+    return open(caminho, 'a', encoding='utf-8', newline=''), existia
+
+
+class _EscritorNdjson:
+    def __init__(self, arquivo, colunas, existia):
+        self.arquivo = arquivo
+        self.colunas = colunas
+
+    def escrever(self, linhas):
+        for linha in linhas:
+            self.arquivo.write(json.dumps(dict(zip(self.colunas, linha)), ensure_ascii=False) + "\n")
+
+
+class _EscritorCsv:
+    def __init__(self, arquivo, colunas, existia):
+        self.arquivo = arquivo
+        self._csv = csv.writer(arquivo)
+        if not existia:
+            self._csv.writerow(colunas)
+
+    def escrever(self, linhas):
+        self._csv.writerows(linhas)
+
+
+ESCRITORES = {"ndjson": _EscritorNdjson, "csv": _EscritorCsv}
+
+
+class Exportador:
+    """Grava cada resultado nos arquivos `<tabela>.<formato>[.partN.gz]` de `diretorio` assim que ele chega.
+
+    Pode ser chamado de várias threads (o `ao_concluir` de `batch.obter_dados_em_lote`, por exemplo).
+    """
+
+    def __init__(self, diretorio: str, formatos=("ndjson",), comprimir: bool = False,
+                 intervalo_flush: float = INTERVALO_FLUSH, tabelas=TABELAS):
+        formatos = tuple(dict.fromkeys(formatos))
+        if not formatos or any(formato not in FORMATOS for formato in formatos):
+            raise ValueError(f"Formatos de exportação inválidos: {formatos} (use {', '.join(FORMATOS)})")
+        if any(tabela not in COLUNAS for tabela in tabelas):
+            raise ValueError(f"Tabelas de exportação inválidas: {tuple(tabelas)} (use {', '.join(TABELAS)})")
+        self.diretorio = diretorio
+        self.intervalo_flush = intervalo_flush
+        self.linhas = dict.fromkeys(tabelas, 0)
+        self.perfis = 0
+        self.erros = 0
+        self._lock = threading.Lock()
+        self._ultimo_flush = time.monotonic()
+        self._arquivos = []
+        self._escritores = {tabela: [] for tabela in tabelas}
+
+        os.makedirs(diretorio, exist_ok=True)
+        sufixo = f".part{proxima_parte_gzip(diretorio)}.gz" if comprimir else ""
+        try:
+            for tabela in tabelas:
+                for formato in formatos:
+                    arquivo, existia = _abrir(os.path.join(diretorio, f"{tabela}.{formato}{sufixo}"), comprimir)
+                    self._arquivos.append(arquivo)
+                    self._escritores[tabela].append(ESCRITORES[formato](arquivo, COLUNAS[tabela], existia))
+        except OSError:
+            self.fechar()
+            raise
+
+    def gravar(self, nome_invocador: str, regiao: str, dados: dict, buscado_em: float = None):
+        """Acrescenta um resultado (de sucesso ou de erro) a todos os arquivos."""
+        try:
+            linhas = linhas_perfil(nome_invocador, regiao, dados, buscado_em)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Resultado de %s não pôde ser exportado: %s", nome_invocador, e)
+            linhas = linhas_perfil(nome_invocador, regiao, {"erro": f"Resultado inválido: {e}"}, buscado_em)
+        with self._lock:
+            for tabela, escritores in self._escritores.items():
+                for escritor in escritores:
+                    escritor.escrever(linhas[tabela])
+                self.linhas[tabela] += len(linhas[tabela])
+            self.perfis += 1
+            if linhas["perfis"][0][3] is not None:
+                self.erros += 1
+            if time.monotonic() - self._ultimo_flush >= self.intervalo_flush:
+                self._descarregar()
+        incrementar("exportacao_perfis")
+
+    def _descarregar(self):
+        for arquivo in self._arquivos:
+            arquivo.flush()
+        self._ultimo_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._descarregar()
+
+    def fechar(self):
+        with self._lock:
+            for arquivo in self._arquivos:
+                try:
+                    arquivo.close()
+                except OSError as e:
+                    logger.warning("Erro ao fechar %s: %s", getattr(arquivo, "name", arquivo), e)
+            self._arquivos = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
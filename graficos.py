@@ -0,0 +1,137 @@
+# graficos.py
+"""Renderização dos gráficos de rotas (radar) e de evolução do ranking em PNG.
+
+Usa só a API orientada a objetos do Matplotlib (`Figure` + canvas Agg), sem o estado global do
+`pyplot`, então pode rodar em threads de trabalho e os dois gráficos podem ser gerados ao mesmo
+tempo. Os PNGs ficam num cache LRU indexado pelo hash dos dados: dados iguais não são redesenhados.
+"""
+import hashlib
+import json
+import logging
+from io import BytesIO
+
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from image_cache import CacheMemoriaLRU
+from instrumentacao import incrementar, span
+from tema import ACCENT_COLOR, BG_COLOR, SECONDARY_BG, SECONDARY_TEXT, TEXT_COLOR
+from timeline import preparar_serie, reduzir_serie
+
+logger = logging.getLogger(__name__)
+
+cache_graficos = CacheMemoriaLRU(capacidade=64)
+
+LARGURA_ELO_POL, ALTURA_ELO_POL, DPI_ELO = 3.6, 2.2, 100
+# Um ponto a cada 2 px da largura do gráfico; acima disso os pontos se sobrepõem
+MAX_PONTOS_ELO = int(LARGURA_ELO_POL * DPI_ELO) // 2
+# Marcadores de 4 px só são desenhados quando cabem sem se encostar
+MAX_PONTOS_COM_MARCADOR = int(LARGURA_ELO_POL * DPI_ELO) // 4
+
+class DadosInsuficientes(Exception):
+    """Os dados não bastam para desenhar o gráfico; a mensagem é exibida no lugar dele."""
+
+def _chave(tipo, *dados):
+    conteudo = json.dumps(dados, sort_keys=True, separators=(',', ':'), default=str)
+    return tipo, hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+def _com_cache(tipo, renderizar, *dados):
+    chave = _chave(tipo, *dados)
+    png = cache_graficos.obter(chave)
+    if png is not None:
+        incrementar(f"grafico_{tipo}_cache_acerto")
+        return png
+    with span(f"grafico_{tipo}"):
+        png = renderizar(*dados)
+    cache_graficos.salvar(chave, png)
+    return png
+
+def _salvar_png(fig):
+    FigureCanvasAgg(fig)
+    buf = BytesIO()
+    fig.savefig(buf, format='png', facecolor=BG_COLOR, bbox_inches='tight')
+    fig.clear()
+    return buf.getvalue()
+
+def renderizar_radar(roles_data):
+    """PNG do gráfico de frequência por rota. Levanta `DadosInsuficientes` se houver menos de 3 rotas jogadas."""
+    return _com_cache("radar", _renderizar_radar, roles_data)
+
+def renderizar_elo(graph_data_raw, rank_map):
+    """PNG do gráfico de evolução do ranking. Levanta `DadosInsuficientes` se não houver pontos suficientes."""
+    return _com_cache("elo", _renderizar_elo, graph_data_raw, rank_map)
+
+def _renderizar_radar(roles_data):
+    roles_data_filtrado = [role for role in roles_data if role.get('played', 0) > 0]
+    if not roles_data_filtrado:
+        raise DadosInsuficientes("Sem dados de rotas para exibir.")
+
+    labels = [role['role'] for role in roles_data_filtrado]
+    values = [role['played'] for role in roles_data_filtrado]
+
+    num_vars = len(labels)
+    if num_vars < 3:
+        raise DadosInsuficientes("Dados de rotas insuficientes para o gráfico.")
+
+    angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
+    values_circular = values + values[:1]
+    angles_circular = angles + angles[:1]
+
+    fig = Figure(figsize=(3.1, 2.2))
+    ax = fig.add_subplot(polar=True)
+    fig.patch.set_facecolor(BG_COLOR)
+    ax.set_facecolor(BG_COLOR)
+    ax.plot(angles_circular, values_circular, color=ACCENT_COLOR, linewidth=2)
+    ax.fill(angles_circular, values_circular, color=ACCENT_COLOR, alpha=0.25)
+    ax.set_yticklabels([])
+    ax.set_xticks(angles)
+    ax.set_xticklabels(labels, color=TEXT_COLOR, size=9)
+    ax.spines['polar'].set_color(SECONDARY_TEXT)
+    ax.tick_params(colors=SECONDARY_TEXT)
+    fig.tight_layout(pad=0.8)
+    return _salvar_png(fig)
+
+def _renderizar_elo(graph_data_raw, rank_map):
+    datas, ranks_indices = preparar_serie(graph_data_raw)
+    if len(datas) < 2:
+        raise DadosInsuficientes("Sem dados suficientes para o gráfico de ranking.")
+    total_pontos = len(datas)
+    datas, ranks_indices = reduzir_serie(datas, ranks_indices, MAX_PONTOS_ELO)
+    if len(datas) < total_pontos:
+        logger.debug("Série de ranking reduzida de %d para %d pontos.", total_pontos, len(datas))
+
+    fig = Figure(figsize=(LARGURA_ELO_POL, ALTURA_ELO_POL), dpi=DPI_ELO)
+    ax = fig.add_subplot()
+    fig.patch.set_facecolor(BG_COLOR)
+    ax.set_facecolor(BG_COLOR)
+
+    marcador = 'o' if len(datas) <= MAX_PONTOS_COM_MARCADOR else None
+    ax.plot(datas, ranks_indices, color=ACCENT_COLOR, linewidth=2, marker=marcador, markersize=4, markerfacecolor=ACCENT_COLOR, markeredgecolor=BG_COLOR)
+    ax.set_title("Evolução do Ranking", fontsize=10, color=TEXT_COLOR, weight='bold')
+    ax.set_ylabel("Elo", fontsize=9, color=SECONDARY_TEXT)
+
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%y'))
+    for label in ax.xaxis.get_majorticklabels():
+        label.set_rotation(30)
+        label.set_horizontalalignment('right')
+
+    if rank_map and isinstance(rank_map, list) and len(rank_map) > 0 and isinstance(rank_map[0], dict):
+        tick_positions = [i for i, r in enumerate(rank_map) if r.get('rankStr') == 'IV' or r.get('rankId') == 0]
+        tick_labels = [r.get('tierRankString', str(i)) for i, r in enumerate(rank_map) if i in tick_positions]
+        if len(tick_labels) > 5:
+            step = max(1, len(tick_labels) // 4)
+            tick_positions = tick_positions[::step]
+            tick_labels = tick_labels[::step]
+        ax.set_yticks(tick_positions)
+        ax.set_yticklabels(tick_labels, fontsize=8)
+    else:
+        ax.set_yticks([])
+
+    ax.grid(True, linestyle='--', alpha=0.1, color=TEXT_COLOR)
+    ax.tick_params(colors=SECONDARY_TEXT, which='both')
+    for spine in ax.spines.values():
+        spine.set_color(SECONDARY_BG)
+    fig.tight_layout(pad=0.8)
+    return _salvar_png(fig)
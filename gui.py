@@ -3,32 +3,42 @@ import tkinter as tk
 from tkinter import ttk, font
 from PIL import Image, ImageTk
 import threading
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+import logging
 import math
 
 # Importa as funções dos outros módulos
-from utils import carregar_id_por_nome_campeao, criar_foto_arredondada
-from scraper import obter_dados_summoner
-
-# Importações do Matplotlib
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import numpy as np
-
-# --- Constantes de Estilo Modernas ---
-BG_COLOR = "#0a0e13"
-SECONDARY_BG = "#1e2328"
-CARD_BG = "#1a1e22"
-ACCENT_COLOR = "#c89b3c"
-SECONDARY_ACCENT = "#463714"
-TEXT_COLOR = "#f0e6d2"
-SECONDARY_TEXT = "#a09b8c"
-SUCCESS_COLOR = "#103c3c"
-ERROR_COLOR = "#3c1518"
-FONT_FAMILY = "Segoe UI"
+from utils import carregar_id_por_nome_campeao, processar_foto_arredondada
+from instrumentacao import span
+from tarefas import AgendadorBuscas, BuscaCancelada
+from regioes import REGIAO_AUTO, REGIOES
+# profile_cache (requests, bs4/lxml) e graficos (matplotlib, numpy) são importados sob demanda:
+# nada disso é necessário para desenhar o formulário de busca.
+from tema import (
+    BG_COLOR, SECONDARY_BG, CARD_BG, ACCENT_COLOR, SECONDARY_ACCENT,
+    TEXT_COLOR, SECONDARY_TEXT, SUCCESS_COLOR, ERROR_COLOR, FONT_FAMILY,
+    gradiente_vertical, mascara_circular,
+)
+
+logger = logging.getLogger(__name__)
+
+URL_MEDALHA_ELO = "https://opgg-static.akamaized.net/images/medals_new/{}.png"
+# Downloads de ícones simultâneos (perfil + medalha + 3 campeões cabem numa única rodada)
+MAX_DOWNLOADS_IMAGENS = 5
+# Radar e evolução do ranking são renderizados ao mesmo tempo
+MAX_GRAFICOS_SIMULTANEOS = 2
+# Workers de busca: a busca atual e uma anterior que ainda esteja terminando de cancelar
+MAX_BUSCAS_SIMULTANEAS = 2
+
+def _formatar_idade(segundos):
+    if segundos < 60:
+        return "agora mesmo"
+    if segundos < 3600:
+        return f"há {int(segundos // 60)} min"
+    if segundos < 86400:
+        return f"há {int(segundos // 3600)} h"
+    return f"há {int(segundos // 86400)} dias"
 
 class ModernScrollableFrame(ttk.Frame):
     def __init__(self, container, *args, **kwargs):
@@ -89,10 +99,27 @@ class LoLScraperApp:
         self.root.resizable(False, False)
 
         self.id_por_nome_campeao = carregar_id_por_nome_campeao()
+        self.pool_imagens = ThreadPoolExecutor(max_workers=MAX_DOWNLOADS_IMAGENS, thread_name_prefix="imagens")
+        self.pool_graficos = ThreadPoolExecutor(max_workers=MAX_GRAFICOS_SIMULTANEOS, thread_name_prefix="graficos")
+        self.agendador = AgendadorBuscas(max_workers=MAX_BUSCAS_SIMULTANEAS)
+        self._buscando = False
+        self.root.protocol("WM_DELETE_WINDOW", self.fechar)
+        self._placeholders = {}
+        self._fotos_resultado = []
+        self._tarefas_pendentes = 0
 
         self._configurar_estilo()
         self._criar_background()
         self._criar_widgets()
+        self.root.after(500, self._pre_carregar_modulos)
+
+    def _pre_carregar_modulos(self):
+        """Importa as bibliotecas pesadas em segundo plano depois que a janela já apareceu."""
+        def importar():
+            import profile_cache  # noqa: F401
+            import graficos  # noqa: F401
+
+        threading.Thread(target=importar, daemon=True, name="pre-carregamento").start()
 
     def _configurar_estilo(self):
         style = ttk.Style(self.root)
@@ -118,16 +145,10 @@ class LoLScraperApp:
         self.root.update_idletasks()
         width = self.root.winfo_width()
         height = self.root.winfo_height()
-        
-        r1, g1, b1 = self.root.winfo_rgb(BG_COLOR)
-        r2, g2, b2 = self.root.winfo_rgb(SECONDARY_BG)
-        
-        for i in range(height):
-            r = (r1 * (height - i) + r2 * i) // (height * 256)
-            g = (g1 * (height - i) + g2 * i) // (height * 256)
-            b = (b1 * (height - i) + b2 * i) // (height * 256)
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            self.bg_canvas.create_line(0, i, width, i, fill=color)
+
+        # Um único item de imagem com o degradê pré-renderizado, em vez de uma linha por pixel
+        self._bg_photo = ImageTk.PhotoImage(gradiente_vertical(width, height, BG_COLOR, SECONDARY_BG))
+        self.bg_canvas.create_image(0, 0, image=self._bg_photo, anchor="nw")
 
     def _criar_widgets(self):
         self.main_frame = ModernScrollableFrame(self.root)
@@ -150,7 +171,7 @@ class LoLScraperApp:
 
         ttk.Label(input_frame, text="Região", font=(FONT_FAMILY, 11, "bold"), background=CARD_BG).pack(padx=20, pady=(10, 5))
         self.regiao_combo = ttk.Combobox(input_frame, width=15, style="Modern.TCombobox", font=(FONT_FAMILY, 12), justify='center',
-                                         values=["br", "na", "euw", "eune", "kr", "jp", "lan", "las", "oce", "tr", "ru"])
+                                         values=[REGIAO_AUTO, *REGIOES])
         self.regiao_combo.set("br")
         self.regiao_combo.pack(pady=(0, 20))
         
@@ -162,21 +183,44 @@ class LoLScraperApp:
         self.loading_frame = ttk.Frame(self.resultado_container)
         self.loading_label = ttk.Label(self.loading_frame, text="⏳ Analisando dados...", font=(FONT_FAMILY, 12))
         self.resultado_frame = None
+        self.busca_atual = None
 
-    def iniciar_busca(self):
+    def iniciar_busca(self, forcar=False):
         nome = self.nome_entry.get().strip()
         regiao = self.regiao_combo.get()
         if not nome:
+            self.agendador.cancelar()
+            self._buscando = False
             self.mostrar_erro("⚠️ Por favor, preencha o nome do invocador.")
             return
 
-        self.buscar_btn.config(state="disabled", text="Analisando...")
+        self._buscar(nome, regiao, forcar)
+
+    def _buscar(self, nome, regiao, forcar=False):
+        # O botão continua habilitado: uma nova busca cancela e substitui a que estiver em andamento
+        self.buscar_btn.config(text="Analisando...")
         self.mostrar_loading()
-        
-        thread = threading.Thread(target=self.worker_busca, args=(nome, regiao))
-        thread.daemon = True
-        thread.start()
-        
+
+        self.busca_atual = (nome, regiao)
+        self._buscando = True
+        self.agendador.submeter(
+            lambda token: self.worker_busca(nome, regiao, forcar, token),
+            lambda geracao, futuro: self._agendar_na_ui(self._concluir_busca, geracao, futuro),
+        )
+
+    def _agendar_na_ui(self, funcao, *args):
+        """Agenda `funcao` na thread do Tk a partir de um worker."""
+        try:
+            self.root.after(0, funcao, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # A janela já foi fechada (TclError depois do destroy, RuntimeError com o interpretador encerrando)
+
+    def fechar(self):
+        self.agendador.encerrar()
+        self.pool_imagens.shutdown(wait=False, cancel_futures=True)
+        self.pool_graficos.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+
     def mostrar_loading(self):
         self.limpar_resultados()
         self.loading_frame.pack(pady=50)
@@ -186,15 +230,96 @@ class LoLScraperApp:
         self.loading_frame.pack_forget()
         if self.resultado_frame:
             self.resultado_frame.destroy()
+            self.resultado_frame = None
+        self._liberar_fotos()
+
+    @property
+    def ocupado(self):
+        """Há uma busca, um download de imagem ou um gráfico ainda por aplicar na tela."""
+        return self._buscando or self._tarefas_pendentes > 0
+
+    def _registrar_foto(self, photo):
+        """Guarda a imagem Tk do resultado exibido para que `limpar_resultados` a apague."""
+        self._fotos_resultado.append(photo)
+
+    def _liberar_foto(self, photo):
+        # Apaga a imagem no Tk na hora, sem depender de o coletor de lixo alcançar o PhotoImage
+        try:
+            self.root.tk.call("image", "delete", str(photo))
+        except tk.TclError:
+            pass
+
+    def _liberar_fotos(self):
+        fotos, self._fotos_resultado = self._fotos_resultado, []
+        for photo in fotos:
+            self._liberar_foto(photo)
             
     def criar_frame_resultados(self):
         self.resultado_frame = ttk.Frame(self.resultado_container, style="TFrame")
         self.resultado_frame.pack(fill="both", expand=True)
         self.resultado_frame.columnconfigure(0, weight=1)
 
-    def worker_busca(self, nome, regiao):
-        dados = obter_dados_summoner(nome, regiao, self.id_por_nome_campeao)
-        self.root.after(0, self.atualizar_ui, dados)
+    def worker_busca(self, nome, regiao, forcar=False, cancelamento=None):
+        from profile_cache import cache_perfis
+
+        geracao = cancelamento.geracao if cancelamento else None
+        automatica = regiao == REGIAO_AUTO
+        if automatica:
+            from regioes import descobrir_regiao
+
+            regiao = descobrir_regiao(nome, cancelamento)
+            if regiao is None:
+                return {"erro": "Invocador não encontrado em nenhuma região."}
+            self._agendar_na_ui(self._regiao_descoberta, geracao, nome, regiao)
+
+        def ao_atualizar(dados_novos):
+            self._registrar_historico(nome, regiao, dados_novos)
+            self._agendar_na_ui(self._aplicar_atualizacao, geracao, dados_novos)
+
+        dados = cache_perfis.obter(nome, regiao, self.id_por_nome_campeao, forcar=forcar,
+                                   ao_atualizar=ao_atualizar, cancelamento=cancelamento)
+        # Resultados servidos pelo cache já foram registrados quando foram buscados
+        if "cache" not in dados:
+            self._registrar_historico(nome, regiao, dados)
+        if automatica and "erro" in dados:
+            # A região lembrada pode ter ficado velha (troca de servidor): a próxima busca sonda de novo
+            from regioes import memoria_regioes
+
+            memoria_regioes.esquecer(nome)
+        return dados
+
+    def _regiao_descoberta(self, geracao, nome, regiao):
+        # "⟳ Atualizar" passa a buscar direto na região encontrada
+        if self.agendador.eh_atual(geracao):
+            self.busca_atual = (nome, regiao)
+
+    def _registrar_historico(self, nome, regiao, dados):
+        from historico import obter_historico
+
+        try:
+            obter_historico().registrar(nome, regiao, dados)
+        except Exception as e:
+            # Falha ao gravar o histórico não pode derrubar a busca
+            logger.warning("Não foi possível gravar o histórico de %s: %s", nome, e)
+
+    def _concluir_busca(self, geracao, futuro):
+        # Uma busca mais nova já foi disparada: este resultado é descartado sem desenhar nada
+        if not self.agendador.eh_atual(geracao) or futuro.cancelled():
+            return
+        erro = futuro.exception()
+        if isinstance(erro, BuscaCancelada):
+            return
+        self._buscando = False
+        if erro:
+            logger.error("Erro inesperado na busca: %s", erro, exc_info=erro)
+            self.atualizar_ui({"erro": f"Erro inesperado: {erro}"})
+        else:
+            self.atualizar_ui(futuro.result())
+
+    def _aplicar_atualizacao(self, geracao, dados):
+        # Só redesenha se o usuário ainda estiver vendo o mesmo invocador
+        if self.agendador.eh_atual(geracao) and not self._buscando:
+            self.atualizar_ui(dados)
 
     def atualizar_ui(self, dados):
         self.limpar_resultados()
@@ -203,9 +328,10 @@ class LoLScraperApp:
         if not dados or "erro" in dados:
             self.mostrar_erro(f"❌ {dados.get('erro', 'Invocador não encontrado.')}")
         else:
-            self._preencher_dados(dados)
+            with span("render_resultado"):
+                self._preencher_dados(dados)
         
-        self.buscar_btn.config(state="normal", text="Analisar Jogador")
+        self.buscar_btn.config(text="Analisar Jogador")
 
     def _preencher_dados(self, dados):
         profile_container = ttk.Frame(self.resultado_frame, style="TFrame")
@@ -215,25 +341,21 @@ class LoLScraperApp:
         profile_card.pack(fill="x", pady=(0, 20), ipady=20)
 
         if dados.get("icone_url"):
-            photo = criar_foto_arredondada(dados["icone_url"], 90)
-            if photo:
-                icone_label = ttk.Label(profile_card, image=photo, background=CARD_BG)
-                icone_label.image = photo
-                icone_label.pack(pady=(10, 15))
+            icone_label = self._criar_label_imagem(profile_card, dados["icone_url"], 90)
+            icone_label.pack(pady=(10, 15))
 
-        nome_do_invocador = self.nome_entry.get().split('#')[0]
+        nome_do_invocador = self.busca_atual[0].split('#')[0]
         ttk.Label(profile_card, text=nome_do_invocador, font=(FONT_FAMILY, 18, "bold"), background=CARD_BG).pack()
 
+        if dados.get("cache"):
+            self._criar_aviso_cache(profile_card, dados["cache"])
+
         if dados.get("elo"):
             elo_frame = ttk.Frame(profile_card, style="Card.TFrame")
             elo_frame.pack(pady=10)
             elo_name = dados['elo'].lower().split(' ')[0]
-            elo_img_url = f"https://opgg-static.akamaized.net/images/medals_new/{elo_name}.png"
-            elo_photo = criar_foto_arredondada(elo_img_url, 30)
-            if elo_photo:
-                elo_icon = ttk.Label(elo_frame, image=elo_photo, background=CARD_BG)
-                elo_icon.image = elo_photo
-                elo_icon.pack(side="left", padx=(0, 8))
+            elo_icon = self._criar_label_imagem(elo_frame, URL_MEDALHA_ELO.format(elo_name), 30)
+            elo_icon.pack(side="left", padx=(0, 8))
             ttk.Label(elo_frame, text=dados['elo'], font=(FONT_FAMILY, 14, "bold"), background=CARD_BG, foreground=ACCENT_COLOR).pack(side="left")
         
         stats_data = [
@@ -260,125 +382,100 @@ class LoLScraperApp:
             for champ in dados["campeoes"][:3]:
                 self.criar_card_campeao_moderno(profile_container, champ)
 
+    def _criar_aviso_cache(self, parent, cache):
+        aviso_frame = ttk.Frame(parent, style="Card.TFrame")
+        aviso_frame.pack(pady=(4, 0))
+        texto = f"📦 Dados em cache ({_formatar_idade(cache['idade'])})"
+        if cache.get("atualizando"):
+            texto += " • atualizando..."
+        ttk.Label(aviso_frame, text=texto, font=(FONT_FAMILY, 9), foreground=SECONDARY_TEXT, background=CARD_BG).pack(side="left")
+        atualizar = ttk.Label(aviso_frame, text="⟳ Atualizar", font=(FONT_FAMILY, 9, "underline"), foreground=ACCENT_COLOR, background=CARD_BG, cursor="hand2")
+        atualizar.pack(side="left", padx=(8, 0))
+        atualizar.bind("<Button-1>", lambda e: self._buscar(*self.busca_atual, forcar=True))
+
     def plotar_grafico_radar(self, parent, roles_data):
-        try:
-            roles_data_filtrado = [role for role in roles_data if role.get('played', 0) > 0]
-            if not roles_data_filtrado:
-                ttk.Label(parent, text="Sem dados de rotas para exibir.", foreground=SECONDARY_TEXT, font=(FONT_FAMILY, 10)).pack(pady=20)
-                return
-                
-            labels = [role['role'] for role in roles_data_filtrado]
-            values = [role['played'] for role in roles_data_filtrado]
-
-            num_vars = len(labels)
-            if num_vars < 3:
-                ttk.Label(parent, text="Dados de rotas insuficientes para o gráfico.", foreground=SECONDARY_TEXT, font=(FONT_FAMILY, 10)).pack(pady=20)
-                return
-
-            angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
-            values_circular = values + values[:1]
-            angles_circular = angles + angles[:1]
-
-            fig, ax = plt.subplots(figsize=(3.1, 2.2), subplot_kw=dict(polar=True))
-            fig.patch.set_facecolor(BG_COLOR)
-            ax.set_facecolor(BG_COLOR)
-            ax.plot(angles_circular, values_circular, color=ACCENT_COLOR, linewidth=2)
-            ax.fill(angles_circular, values_circular, color=ACCENT_COLOR, alpha=0.25)
-            ax.set_yticklabels([])
-            ax.set_xticks(angles)
-            ax.set_xticklabels(labels, color=TEXT_COLOR, size=9)
-            ax.spines['polar'].set_color(SECONDARY_TEXT)
-            ax.tick_params(colors=SECONDARY_TEXT)
-            plt.tight_layout(pad=0.8)
-
-            buf = BytesIO()
-            plt.savefig(buf, format='png', facecolor=BG_COLOR, bbox_inches='tight')
-            plt.close(fig)
-            buf.seek(0)
-            photo = ImageTk.PhotoImage(Image.open(buf))
-            graph_label = ttk.Label(parent, image=photo, background=BG_COLOR)
-            graph_label.image = photo
-            graph_label.pack(pady=(10, 20))
-        except Exception as e:
-            print(f"Erro ao gerar gráfico de radar: {e}")
+        self._plotar_grafico(parent, "renderizar_radar", roles_data)
 
     def plotar_grafico_elo(self, parent, graph_data_raw, rank_map):
-        try:
-            graph_data = [x for x in graph_data_raw if x[1] is not None]
-            if len(graph_data) < 2:
-                ttk.Label(parent, text="Sem dados suficientes para o gráfico de ranking.", foreground=SECONDARY_TEXT, font=(FONT_FAMILY, 10)).pack(pady=20)
-                return
-
-            timestamps = []
-            for x in graph_data:
-                ts = x[0]
-                try:
-                    timestamps.append(datetime.fromtimestamp(ts / 1000))
-                except (ValueError, TypeError):
-                    continue
-            
-            if not timestamps:
-                 ttk.Label(parent, text="Não foi possível processar as datas do ranking.", foreground=SECONDARY_TEXT, font=(FONT_FAMILY, 10)).pack(pady=20)
-                 return
+        self._plotar_grafico(parent, "renderizar_elo", graph_data_raw, rank_map)
 
-            ranks_indices = [float(x[1]) for x in graph_data if x[1] is not None]
+    def _plotar_grafico(self, parent, renderizar, *dados):
+        """Reserva o lugar do gráfico e o renderiza no pool de gráficos, trocando o aviso pela imagem ao terminar."""
+        graph_label = ttk.Label(parent, text="⏳ Gerando gráfico...", foreground=SECONDARY_TEXT, font=(FONT_FAMILY, 10), background=BG_COLOR)
+        graph_label.pack(pady=(10, 20))
+        self._tarefas_pendentes += 1
 
-            plt.rcdefaults()
-            fig, ax = plt.subplots(figsize=(3.6, 2.2), dpi=100)
-            fig.patch.set_facecolor(BG_COLOR)
-            ax.set_facecolor(BG_COLOR)
+        def tarefa():
+            import graficos
+            return Image.open(BytesIO(getattr(graficos, renderizar)(*dados)))
 
-            ax.plot(timestamps, ranks_indices, color=ACCENT_COLOR, linewidth=2, marker='o', markersize=4, markerfacecolor=ACCENT_COLOR, markeredgecolor=BG_COLOR)
-            ax.set_title("Evolução do Ranking", fontsize=10, color=TEXT_COLOR, weight='bold')
-            ax.set_ylabel("Elo", fontsize=9, color=SECONDARY_TEXT)
-            
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%y'))
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=30, ha='right')
-
-            if rank_map and isinstance(rank_map, list) and len(rank_map) > 0 and isinstance(rank_map[0], dict):
-                tick_positions = [i for i, r in enumerate(rank_map) if r.get('rankStr') == 'IV' or r.get('rankId') == 0]
-                tick_labels = [r.get('tierRankString', str(i)) for i, r in enumerate(rank_map) if i in tick_positions]
-                if len(tick_labels) > 5:
-                    step = max(1, len(tick_labels) // 4)
-                    tick_positions = tick_positions[::step]
-                    tick_labels = tick_labels[::step]
-                ax.set_yticks(tick_positions)
-                ax.set_yticklabels(tick_labels, fontsize=8)
-            else:
-                ax.set_yticks([])
-
-            ax.grid(True, linestyle='--', alpha=0.1, color=TEXT_COLOR)
-            ax.tick_params(colors=SECONDARY_TEXT, which='both')
-            for spine in ax.spines.values():
-                spine.set_color(SECONDARY_BG)
-            plt.tight_layout(pad=0.8)
-
-            buf = BytesIO()
-            plt.savefig(buf, format='png', facecolor=BG_COLOR, bbox_inches='tight')
-            plt.close(fig)
-            buf.seek(0)
-            photo = ImageTk.PhotoImage(Image.open(buf))
-            graph_label = ttk.Label(parent, image=photo, background=BG_COLOR)
-            graph_label.image = photo
-            graph_label.pack(pady=(10, 20))
-        except Exception as e:
-            print(f"Erro ao gerar gráfico de elo: {e}")
+        self.pool_graficos.submit(tarefa).add_done_callback(
+            lambda f: self._agendar_na_ui(self._aplicar_grafico, graph_label, f))
+
+    def _aplicar_grafico(self, graph_label, futuro):
+        self._tarefas_pendentes -= 1
+        # Futuros cancelados no fechamento da janela: exception() levantaria CancelledError
+        if futuro.cancelled() or not graph_label.winfo_exists():
+            return
+        from graficos import DadosInsuficientes
+
+        erro = futuro.exception()
+        if isinstance(erro, DadosInsuficientes):
+            graph_label.configure(text=str(erro))
+            graph_label.pack_configure(pady=20)
+            return
+        if erro:
+            logger.error("Erro ao gerar gráfico: %s", erro, exc_info=erro)
+            graph_label.destroy()
+            return
+        photo = ImageTk.PhotoImage(futuro.result())
+        graph_label.configure(image=photo, text="")
+        graph_label.image = photo
+        self._registrar_foto(photo)
 
     def criar_card_campeao_moderno(self, parent, champ):
         champ_frame = ttk.Frame(parent, style="Card.TFrame")
         champ_frame.pack(fill="x", pady=5, ipady=10)
         champ_frame.columnconfigure(1, weight=1)
         
-        champ_photo = criar_foto_arredondada(champ['icon_url'], 50)
-        if champ_photo:
-            icon_label = ttk.Label(champ_frame, image=champ_photo, background=CARD_BG)
-            icon_label.image = champ_photo
+        if champ['icon_url']:
+            icon_label = self._criar_label_imagem(champ_frame, champ['icon_url'], 50)
             icon_label.grid(row=0, column=0, rowspan=2, padx=15, sticky="w")
         
         ttk.Label(champ_frame, text=champ['nome'], font=(FONT_FAMILY, 12, "bold"), background=CARD_BG).grid(row=0, column=1, sticky="w")
         stats_text = f"🎮 {champ['partidas']} partidas  •  🏆 {champ['winrate']}% WR"
         ttk.Label(champ_frame, text=stats_text, font=(FONT_FAMILY, 9), foreground=SECONDARY_TEXT, background=CARD_BG).grid(row=1, column=1, sticky="w")
 
+    def _placeholder(self, size):
+        """Círculo neutro exibido enquanto o ícone real é baixado."""
+        if size not in self._placeholders:
+            img = Image.new("RGBA", (size, size), SECONDARY_BG)
+            img.putalpha(mascara_circular(size))
+            self._placeholders[size] = ImageTk.PhotoImage(img)
+        return self._placeholders[size]
+
+    def _criar_label_imagem(self, parent, url, size):
+        """Cria um label com placeholder e agenda o download da imagem real no pool de workers."""
+        label = ttk.Label(parent, image=self._placeholder(size), background=CARD_BG)
+        futuro = self.pool_imagens.submit(processar_foto_arredondada, url, size)
+        self._tarefas_pendentes += 1
+
+        futuro.add_done_callback(
+            lambda f: self._agendar_na_ui(self._aplicar_imagem, label, None if f.cancelled() or f.exception() else f.result()))
+        return label
+
+    def _aplicar_imagem(self, label, img):
+        self._tarefas_pendentes -= 1
+        if not label.winfo_exists():
+            return
+        if img is None:
+            label.destroy()
+            return
+        photo = ImageTk.PhotoImage(img)
+        label.configure(image=photo)
+        label.image = photo
+        self._registrar_foto(photo)
+
     def mostrar_erro(self, mensagem):
         self.limpar_resultados()
         self.criar_frame_resultados()
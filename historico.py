@@ -0,0 +1,233 @@
+# historico.py
+"""Histórico local de buscas em SQLite, gravando só o que mudou entre uma busca e a seguinte.
+
+Cada busca vira uma linha em `snapshots` com o delta dos campos em relação à busca anterior do
+mesmo invocador (campos alterados + campos removidos). Os pontos de `graph_data` vão para
+`pontos_rank`, uma linha por ponto, marcados com o snapshot em que apareceram pela primeira vez;
+pontos repetidos não são gravados de novo. O estado completo mais recente fica em `estado_atual`
+para que calcular o próximo delta não exija reconstruir o histórico.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from operator import itemgetter
+
+from armazenamento import normalizar_nome
+from image_cache import DIRETORIO_CACHE
+
+CAMINHO_HISTORICO = os.path.join(DIRETORIO_CACHE, "historico.sqlite3")
+# Entradas do resultado que descrevem a busca, não o jogador, e ficam fora do histórico
+CAMPOS_IGNORADOS = ("timings", "cache", "graph_data")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    invocador TEXT NOT NULL,
+    regiao TEXT NOT NULL,
+    ts REAL NOT NULL,
+    delta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_invocador_ts ON snapshots (invocador, regiao, ts);
+CREATE INDEX IF NOT EXISTS idx_snapshots_ts ON snapshots (ts);
+
+CREATE TABLE IF NOT EXISTS pontos_rank (
+    invocador TEXT NOT NULL,
+    regiao TEXT NOT NULL,
+    ts_ponto INTEGER NOT NULL,
+    valor REAL,
+    snapshot_id INTEGER NOT NULL,
+    PRIMARY KEY (invocador, regiao, ts_ponto)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS estado_atual (
+    invocador TEXT NOT NULL,
+    regiao TEXT NOT NULL,
+    ts REAL NOT NULL,
+    snapshot_id INTEGER NOT NULL,
+    dados TEXT NOT NULL,
+    PRIMARY KEY (invocador, regiao)
+) WITHOUT ROWID;
+"""
+
+def _chave(nome_invocador: str, regiao: str):
+    # Mesma normalização das chaves do cache de perfis, com a região numa coluna separada
+    return normalizar_nome(nome_invocador), regiao.strip().lower()
+
+def _calcular_delta(anterior: dict, atual: dict):
+    delta = {campo: valor for campo, valor in atual.items() if anterior.get(campo, object()) != valor}
+    removidos = [campo for campo in anterior if campo not in atual]
+    if removidos:
+        delta["_removidos"] = removidos
+    return delta
+
+def _aplicar_delta(estado: dict, delta: dict):
+    for campo in delta.get("_removidos", ()):
+        estado.pop(campo, None)
+    estado.update((campo, valor) for campo, valor in delta.items() if campo != "_removidos")
+    return estado
+
+
+class Historico:
+    def __init__(self, caminho: str = CAMINHO_HISTORICO):
+        self.caminho = caminho
+        if caminho != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(ESQUEMA)
+        self._lock = threading.Lock()
+
+    def registrar(self, nome_invocador: str, regiao: str, dados: dict, ts: float = None):
+        """Grava uma busca bem-sucedida. Retorna o id do snapshot, ou None se `dados` for um erro."""
+        if not dados or "erro" in dados:
+            return None
+        invocador, regiao = _chave(nome_invocador, regiao)
+        ts = time.time() if ts is None else ts
+        atual = {campo: valor for campo, valor in dados.items() if campo not in CAMPOS_IGNORADOS}
+
+        with self._lock, self._conexao:
+            linha = self._conexao.execute(
+                "SELECT dados FROM estado_atual WHERE invocador = ? AND regiao = ?", (invocador, regiao)
+            ).fetchone()
+            anterior = json.loads(linha[0]) if linha else {}
+            delta = _calcular_delta(anterior, atual)
+
+            cursor = self._conexao.execute(
+                "INSERT INTO snapshots (invocador, regiao, ts, delta) VALUES (?, ?, ?, ?)",
+                (invocador, regiao, ts, json.dumps(delta, ensure_ascii=False, separators=(',', ':'))),
+            )
+            snapshot_id = cursor.lastrowid
+            pontos = [
+                (invocador, regiao, int(ponto[0]), ponto[1], snapshot_id)
+                for ponto in dados.get("graph_data") or ()
+                if isinstance(ponto, (list, tuple)) and len(ponto) >= 2 and isinstance(ponto[0], (int, float))
+            ]
+            # Só os pontos novos entram; os já conhecidos são ignorados pela chave primária
+            self._conexao.executemany("INSERT OR IGNORE INTO pontos_rank VALUES (?, ?, ?, ?, ?)", pontos)
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO estado_atual VALUES (?, ?, ?, ?, ?)",
+                (invocador, regiao, ts, snapshot_id, json.dumps(atual, ensure_ascii=False, separators=(',', ':'))),
+            )
+        return snapshot_id
+
+    def _pontos(self, invocador, regiao, ate_snapshot=None, inicio_ms=None, fim_ms=None):
+        sql = "SELECT ts_ponto, valor FROM pontos_rank WHERE invocador = ? AND regiao = ?"
+        parametros = [invocador, regiao]
+        if ate_snapshot is not None:
+            sql += " AND snapshot_id <= ?"
+            parametros.append(ate_snapshot)
+        if inicio_ms is not None:
+            sql += " AND ts_ponto >= ?"
+            parametros.append(inicio_ms)
+        if fim_ms is not None:
+            sql += " AND ts_ponto <= ?"
+            parametros.append(fim_ms)
+        with self._lock:
+            return [[ts_ponto, valor] for ts_ponto, valor in self._conexao.execute(sql + " ORDER BY ts_ponto", parametros)]
+
+    def ultimo(self, nome_invocador: str, regiao: str):
+        """(ts, dados) da busca mais recente do invocador, ou None se ele nunca foi buscado."""
+        invocador, regiao = _chave(nome_invocador, regiao)
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT ts, dados FROM estado_atual WHERE invocador = ? AND regiao = ?", (invocador, regiao)
+            ).fetchone()
+        if not linha:
+            return None
+        dados = json.loads(linha[1])
+        pontos = self._pontos(invocador, regiao)
+        dados["graph_data"] = pontos or None
+        return linha[0], dados
+
+    def idade(self, nome_invocador: str, regiao: str):
+        """Segundos desde a última busca registrada do invocador, ou None."""
+        invocador, regiao = _chave(nome_invocador, regiao)
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT ts FROM estado_atual WHERE invocador = ? AND regiao = ?", (invocador, regiao)
+            ).fetchone()
+        return time.time() - linha[0] if linha else None
+
+    def consultar(self, nome_invocador: str, regiao: str, inicio: float = None, fim: float = None, com_graficos: bool = True,
+                  todos_os_graficos: bool = False):
+        """Lista de (ts, dados) das buscas entre `inicio` e `fim` (timestamps em segundos), reconstruídas a partir dos deltas.
+
+        Com `com_graficos`, a busca mais recente da lista traz em `graph_data` os pontos conhecidos até
+        ela. Com `todos_os_graficos`, cada busca traz os seus; buscas que não trouxeram pontos novos
+        compartilham a lista da anterior.
+        """
+        invocador, regiao = _chave(nome_invocador, regiao)
+        sql = "SELECT id, ts, delta FROM snapshots WHERE invocador = ? AND regiao = ?"
+        parametros = [invocador, regiao]
+        if fim is not None:
+            sql += " AND ts <= ?"
+            parametros.append(fim)
+        with self._lock:
+            linhas = self._conexao.execute(sql + " ORDER BY ts, id", parametros).fetchall()
+
+            pontos = self._conexao.execute(
+                "SELECT ts_ponto, valor, snapshot_id FROM pontos_rank WHERE invocador = ? AND regiao = ? ORDER BY ts_ponto",
+                (invocador, regiao),
+            ).fetchall() if com_graficos else []
+
+        resultado = []
+        estado = {}
+        for snapshot_id, ts, delta in linhas:
+            # Os deltas anteriores ao intervalo ainda precisam ser aplicados para reconstruir o estado
+            _aplicar_delta(estado, json.loads(delta))
+            if inicio is not None and ts < inicio:
+                continue
+            resultado.append((ts, dict(estado)))
+        if not com_graficos or not resultado:
+            return resultado
+
+        # Pontos agrupados pela busca em que apareceram, cada grupo em ordem de ts_ponto
+        por_snapshot = {}
+        for ts_ponto, valor, origem in pontos:
+            por_snapshot.setdefault(origem, []).append([ts_ponto, valor])
+        # As linhas antes de `inicio` são um prefixo (ordem de ts)
+        primeira = len(linhas) - len(resultado)
+        if todos_os_graficos:
+            grafico = []
+            for posicao, (snapshot_id, _, _) in enumerate(linhas):
+                novos = por_snapshot.get(snapshot_id)
+                if novos:
+                    grafico = sorted(grafico + novos, key=itemgetter(0))
+                if posicao >= primeira:
+                    resultado[posicao - primeira][1]["graph_data"] = grafico or None
+        else:
+            grafico = [ponto for snapshot_id, _, _ in linhas for ponto in por_snapshot.get(snapshot_id, ())]
+            grafico.sort(key=itemgetter(0))
+            resultado[-1][1]["graph_data"] = grafico or None
+        return resultado
+
+    def consultar_varios(self, invocadores, inicio: float = None, fim: float = None, com_graficos: bool = False):
+        """{(nome, regiao): [(ts, dados), ...]} para vários invocadores de uma vez."""
+        return {
+            (nome, regiao): self.consultar(nome, regiao, inicio, fim, com_graficos)
+            for nome, regiao in invocadores
+        }
+
+    def serie_rank(self, nome_invocador: str, regiao: str, inicio_ms: int = None, fim_ms: int = None):
+        """Todos os pontos de ranking conhecidos do invocador, no formato de `graph_data`."""
+        invocador, regiao = _chave(nome_invocador, regiao)
+        return self._pontos(invocador, regiao, inicio_ms=inicio_ms, fim_ms=fim_ms)
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+_historico = None
+_lock_historico = threading.Lock()
+
+def obter_historico():
+    """Histórico compartilhado do processo, aberto na primeira chamada."""
+    global _historico
+    if _historico is None:
+        with _lock_historico:
+            if _historico is None:
+                _historico = Historico()
+    return _historico
@@ -0,0 +1,283 @@
+# http_client.py
+import email.utils
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from instrumentacao import incrementar
+
+logger = logging.getLogger(__name__)
+
+# (conexão, leitura) em segundos, usado por todas as requisições que não definem o próprio timeout
+TIMEOUT_PADRAO = (5, 10)
+# Número de hosts distintos com pool próprio (leagueofgraphs, opgg-static, communitydragon...)
+MAX_POOLS_HOSTS = 10
+# Conexões keep-alive mantidas por host; acima disso as conexões extras são descartadas após o uso
+MAX_CONEXOES_POR_HOST = 16
+
+HEADERS_PADRAO = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Language": "pt-BR,pt;q=0.9",
+}
+
+# (requisições por segundo, rajada) por sufixo de host. Hosts fora da lista (servidores locais de
+# teste, por exemplo) não têm limite de taxa, mas continuam com novas tentativas e disjuntor.
+# A rajada do League of Graphs comporta as 11 sondagens da região "auto" de uma vez.
+LIMITES_HOSTS = {
+    "leagueofgraphs.com": (2.0, 12),
+    "opgg-static.akamaized.net": (20.0, 20),
+    "communitydragon.org": (20.0, 20),
+}
+# Respostas que valem uma nova tentativa; as demais (404, 403...) voltam direto para quem pediu
+STATUS_REPETIVEIS = frozenset({429, 500, 502, 503, 504})
+MAX_TENTATIVAS = 4
+ESPERA_BASE = 0.5          # segundos; dobra a cada tentativa, com jitter
+ESPERA_MAXIMA = 30.0       # teto para o backoff e para o Retry-After
+# Falhas seguidas que abrem o disjuntor do host e por quanto tempo ele fica aberto
+FALHAS_PARA_ABRIR = 5
+TEMPO_ABERTO = 30.0
+
+_sessao = None
+_lock_sessao = threading.Lock()
+
+def _criar_sessao():
+    # requests só é importado na primeira requisição, para não pesar na abertura da janela
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import make_headers
+
+    sessao = requests.Session()
+    sessao.headers.update(HEADERS_PADRAO)
+    # gzip/deflate sempre; br apenas se o suporte a brotli estiver instalado
+    sessao.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+    adaptador = HTTPAdapter(pool_connections=MAX_POOLS_HOSTS, pool_maxsize=MAX_CONEXOES_POR_HOST)
+    sessao.mount("https://", adaptador)
+    sessao.mount("http://", adaptador)
+    return sessao
+
+def obter_sessao():
+    """Retorna a sessão HTTP compartilhada do processo, criando-a na primeira chamada."""
+    global _sessao
+    if _sessao is None:
+        with _lock_sessao:
+            if _sessao is None:
+                _sessao = _criar_sessao()
+    return _sessao
+
+
+class BaldeTokens:
+    """Token bucket: libera até `taxa` requisições por segundo, com rajadas de até `capacidade`.
+
+    `pausar()` esvazia o balde por um tempo (usado quando o host responde 429 com Retry-After),
+    freando todas as threads que falam com o host, não só a que recebeu o 429.
+    """
+
+    def __init__(self, taxa: float, capacidade: int):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self._tokens = float(capacidade)
+        self._atualizado = time.monotonic()
+        self._pausado_ate = 0.0
+        self._lock = threading.Lock()
+
+    def _reservar(self):
+        """Consome um token e retorna quantos segundos o chamador deve esperar antes de usá-lo."""
+        with self._lock:
+            agora = time.monotonic()
+            self._tokens = min(self.capacidade, self._tokens + (agora - self._atualizado) * self.taxa)
+            self._atualizado = agora
+            self._tokens -= 1
+            espera = -self._tokens / self.taxa if self._tokens < 0 else 0.0
+            return max(espera, self._pausado_ate - agora)
+
+    def pausar(self, segundos: float):
+        with self._lock:
+            self._pausado_ate = max(self._pausado_ate, time.monotonic() + segundos)
+
+    def adquirir(self, esperar=time.sleep):
+        """Bloqueia até haver um token livre. Retorna o tempo esperado em segundos."""
+        espera = self._reservar()
+        if espera > 0:
+            esperar(espera)
+        return espera
+
+
+class Disjuntor:
+    """Circuit breaker por host: depois de `limite` falhas seguidas, recusa requisições por `tempo_aberto`.
+
+    Passado esse tempo, uma única requisição de teste é liberada (meio-aberto); se ela der certo o
+    disjuntor fecha, se falhar ele volta a abrir.
+    """
+
+    def __init__(self, limite: int = FALHAS_PARA_ABRIR, tempo_aberto: float = TEMPO_ABERTO):
+        self.limite = limite
+        self.tempo_aberto = tempo_aberto
+        self.falhas = 0
+        self._aberto_ate = 0.0
+        self._testando = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self):
+        if self.falhas < self.limite:
+            return "fechado"
+        return "meio_aberto" if time.monotonic() >= self._aberto_ate else "aberto"
+
+    def permitir(self):
+        with self._lock:
+            if self.falhas < self.limite:
+                return True
+            if time.monotonic() < self._aberto_ate or self._testando:
+                return False
+            self._testando = True
+            return True
+
+    def sucesso(self):
+        with self._lock:
+            self.falhas = 0
+            self._testando = False
+
+    def falha(self):
+        with self._lock:
+            self.falhas += 1
+            self._testando = False
+            if self.falhas >= self.limite:
+                self._aberto_ate = time.monotonic() + self.tempo_aberto
+                return True
+            return False
+
+    def liberar(self):
+        """A requisição liberada terminou sem resposta nem falha do host (foi interrompida): outra pode testar."""
+        with self._lock:
+            self._testando = False
+
+
+class EstadoHost:
+    def __init__(self, host: str):
+        self.host = host
+        limite = next((valor for sufixo, valor in LIMITES_HOSTS.items() if host == sufixo or host.endswith("." + sufixo)), None)
+        self.balde = BaldeTokens(*limite) if limite else None
+        self.disjuntor = Disjuntor()
+        self.contadores = {"requisicoes": 0, "limitadas": 0, "repetidas": 0, "recusadas": 0}
+        self._lock = threading.Lock()
+
+    def contar(self, nome: str):
+        # Várias threads falam com o mesmo host ao mesmo tempo
+        with self._lock:
+            self.contadores[nome] += 1
+
+    def copiar_contadores(self):
+        with self._lock:
+            return dict(self.contadores)
+
+
+_hosts = {}
+_lock_hosts = threading.Lock()
+
+def _estado_host(host: str):
+    estado = _hosts.get(host)
+    if estado is None:
+        with _lock_hosts:
+            estado = _hosts.setdefault(host, EstadoHost(host))
+    return estado
+
+def _retry_after(resposta):
+    """Segundos pedidos pelo cabeçalho Retry-After (número ou data HTTP), ou None."""
+    valor = resposta.headers.get("Retry-After")
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _backoff(tentativa: int):
+    """Full jitter: espera aleatória entre 0 e ESPERA_BASE * 2^tentativa (limitada a ESPERA_MAXIMA)."""
+    return random.uniform(0, min(ESPERA_MAXIMA, ESPERA_BASE * 2 ** tentativa))
+
+def get(url: str, headers: dict = None, timeout=TIMEOUT_PADRAO, cancelamento=None, tentativas: int = MAX_TENTATIVAS, **kwargs):
+    """Faz um GET pela sessão compartilhada, reaproveitando conexões já abertas com o host.
+
+    Respeita o limite de taxa do host, repete 429/5xx e falhas de conexão com backoff exponencial
+    (honrando Retry-After) e recusa na hora, com `ConnectionError`, hosts cujo disjuntor está aberto.
+    Depois da última tentativa a resposta de erro é devolvida como veio, para quem chamou decidir.
+    Com `cancelamento` (`tarefas.TokenCancelamento`), as esperas terminam assim que o token é cancelado.
+    """
+    import requests
+
+    if tentativas < 1:
+        raise ValueError(f"tentativas deve ser pelo menos 1 (recebido: {tentativas})")
+    sessao = obter_sessao()
+    estado = _estado_host(urlsplit(url).hostname or "")
+    esperar = cancelamento.esperar if cancelamento else time.sleep
+
+    for tentativa in range(tentativas):
+        if not estado.disjuntor.permitir():
+            estado.contar("recusadas")
+            incrementar("http_circuito_aberto")
+            raise requests.exceptions.ConnectionError(f"Muitas falhas seguidas em {estado.host}; novas requisições suspensas por alguns segundos.")
+        if estado.balde and estado.balde.adquirir(esperar) > 0:
+            estado.contar("limitadas")
+            incrementar("http_limitadas")
+        estado.contar("requisicoes")
+
+        ultima = tentativa == tentativas - 1
+        try:
+            resposta = sessao.get(url, headers=headers, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            _registrar_falha(estado)
+            if ultima or (cancelamento and cancelamento.cancelado):
+                raise
+            espera = _backoff(tentativa)
+            logger.debug("Falha de conexão com %s (%s); nova tentativa em %.1fs.", estado.host, e, espera)
+        except requests.exceptions.RequestException:
+            # Sem nova tentativa (redirecionamentos demais, corpo corrompido...), mas o disjuntor fica sabendo
+            _registrar_falha(estado)
+            raise
+        except BaseException:
+            # Interrompida antes de haver resposta: não conta contra o host, mas devolve a vaga de teste
+            estado.disjuntor.liberar()
+            raise
+        else:
+            if resposta.status_code not in STATUS_REPETIVEIS:
+                estado.disjuntor.sucesso()
+                return resposta
+            _registrar_falha(estado)
+            pedido = _retry_after(resposta)
+            if resposta.status_code == 429:
+                incrementar("http_429")
+                if estado.balde:
+                    estado.balde.pausar(min(pedido if pedido is not None else _backoff(tentativa), ESPERA_MAXIMA))
+            if ultima:
+                return resposta
+            resposta.close()
+            espera = min(ESPERA_MAXIMA, max(pedido or 0.0, _backoff(tentativa)))
+            logger.debug("%s respondeu %d; nova tentativa em %.1fs.", estado.host, resposta.status_code, espera)
+
+        estado.contar("repetidas")
+        incrementar("http_repetidas")
+        esperar(espera)
+
+def _registrar_falha(estado):
+    if estado.disjuntor.falha():
+        logger.warning("Disjuntor aberto para %s após %d falhas seguidas.", estado.host, estado.disjuntor.falhas)
+
+def estatisticas_hosts():
+    """Por host: requisições, quantas esperaram o limite de taxa, repetidas, recusadas e o estado do disjuntor."""
+    with _lock_hosts:
+        estados = list(_hosts.values())
+    return {estado.host: {**estado.copiar_contadores(), "disjuntor": estado.disjuntor.estado} for estado in estados}
+
+def fechar_sessao():
+    """Fecha todas as conexões do pool. A próxima requisição cria uma sessão nova."""
+    global _sessao
+    with _lock_sessao:
+        if _sessao is not None:
+            _sessao.close()
+            _sessao = None
@@ -0,0 +1,235 @@
+# image_cache.py
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import http_client
+from armazenamento import gravar_bytes_atomico, gravar_json_atomico
+from instrumentacao import incrementar, span
+
+logger = logging.getLogger(__name__)
+
+# Diretório dos caches locais (imagens, perfis, tema...). Pode ser trocado pela variável de ambiente LOL_CACHE_DIR.
+DIRETORIO_CACHE = os.environ.get("LOL_CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+class CacheMemoriaLRU:
+    """Cache em memória com descarte do item menos usado recentemente. Seguro para uso entre threads."""
+
+    def __init__(self, capacidade: int = 256):
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+
+    def obter(self, chave):
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+            self.faltas += 1
+            return None
+
+    def salvar(self, chave, valor):
+        with self._lock:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+    def __len__(self):
+        return len(self._itens)
+
+
+class CacheDisco:
+    """Guarda o conteúdo bruto de URLs em disco, com os validadores HTTP (ETag/Last-Modified) ao lado.
+
+    Cada URL vira um par `<sha1>.bin` / `<sha1>.json`, ambos gravados de forma atômica. Quando o
+    total passa de `limite_bytes`, os arquivos acessados há mais tempo são removidos. O total é
+    mantido em memória; o diretório só é varrido na primeira gravação e quando é preciso remover.
+    """
+
+    def __init__(self, diretorio: str, limite_bytes: int = 50 * 1024 * 1024):
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        self._lock = threading.Lock()
+        self._total = None
+        self.acertos = 0
+        self.faltas = 0
+
+    def _caminhos(self, url: str):
+        chave = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.diretorio, chave)
+        return base + ".bin", base + ".json"
+
+    def ler(self, url: str):
+        """Retorna (conteudo, metadados) ou None se a URL não estiver no cache."""
+        caminho_bin, caminho_meta = self._caminhos(url)
+        try:
+            with open(caminho_meta, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(caminho_bin, 'rb') as f:
+                conteudo = f.read()
+            os.utime(caminho_bin)
+        except (OSError, json.JSONDecodeError):
+            self.faltas += 1
+            return None
+        self.acertos += 1
+        return conteudo, meta
+
+    def salvar(self, url: str, conteudo: bytes, etag: str = None, last_modified: str = None):
+        caminho_bin, caminho_meta = self._caminhos(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified, "validado_em": time.time()}
+        try:
+            with self._lock:
+                total = self._tamanho_atual()
+                try:
+                    anterior = os.path.getsize(caminho_bin)
+                except OSError:
+                    anterior = 0
+                # Conteúdo antes dos metadados: um ETag gravado sempre corresponde a um .bin inteiro
+                gravar_bytes_atomico(caminho_bin, conteudo)
+                gravar_json_atomico(caminho_meta, meta)
+                self._total = total - anterior + len(conteudo)
+                if self._total > self.limite_bytes:
+                    self._aplicar_limite()
+        except OSError as e:
+            logger.warning("Não foi possível gravar '%s' no cache em disco: %s", url, e)
+
+    def revalidado(self, url: str, meta: dict):
+        """Marca uma entrada como confirmada pelo servidor (resposta 304)."""
+        _, caminho_meta = self._caminhos(url)
+        meta = dict(meta, validado_em=time.time())
+        try:
+            gravar_json_atomico(caminho_meta, meta)
+        except OSError:
+            pass
+
+    def tamanho_total(self):
+        with self._lock:
+            return self._tamanho_atual()
+
+    def _varrer(self):
+        """[(último acesso, tamanho, caminho do .bin)] e o total em bytes."""
+        arquivos = []
+        try:
+            for entrada in os.scandir(self.diretorio):
+                if entrada.name.endswith(".bin"):
+                    info = entrada.stat()
+                    arquivos.append((max(info.st_atime, info.st_mtime), info.st_size, entrada.path))
+        except OSError:
+            pass
+        return arquivos, sum(tamanho for _, tamanho, _ in arquivos)
+
+    def _tamanho_atual(self):
+        if self._total is None:
+            self._total = self._varrer()[1]
+        return self._total
+
+    def _aplicar_limite(self):
+        # Varre de novo para ordenar por acesso (e corrigir o total, se outro processo mexeu no diretório)
+        arquivos, total = self._varrer()
+        self._total = total
+        if total <= self.limite_bytes:
+            return
+        for _, tamanho, caminho in sorted(arquivos):
+            for caminho_arquivo in (caminho, caminho[:-4] + ".json"):
+                try:
+                    os.remove(caminho_arquivo)
+                except OSError:
+                    pass
+            total -= tamanho
+            self._total = total
+            if total <= self.limite_bytes:
+                break
+
+
+class CacheImagens:
+    """Cache em dois níveis para imagens processadas.
+
+    Nível 1: imagem já processada em memória, por (url, tamanho) — nenhuma rede nem trabalho de PIL.
+    Nível 2: bytes originais em disco — sem rede enquanto a cópia tiver menos de `max_idade` segundos;
+    depois disso o servidor é consultado com If-None-Match/If-Modified-Since e um 304 reaproveita a cópia.
+    """
+
+    def __init__(self, processar, memoria: CacheMemoriaLRU, disco: CacheDisco = None, max_idade: float = 24 * 3600):
+        self.processar = processar
+        self.memoria = memoria
+        self.disco = disco
+        self.max_idade = max_idade
+        self.downloads = 0
+        self.revalidacoes = 0
+
+    def obter(self, url: str, size: int):
+        """Retorna a imagem processada para (url, size). A imagem é compartilhada e não deve ser alterada."""
+        chave = (url, size)
+        imagem = self.memoria.obter(chave)
+        if imagem is not None:
+            incrementar("imagem_cache_memoria_acerto")
+            return imagem
+        incrementar("imagem_cache_memoria_falta")
+        imagem = self.processar(self.obter_bytes(url), size)
+        self.memoria.salvar(chave, imagem)
+        return imagem
+
+    def obter_bytes(self, url: str):
+        em_disco = self.disco.ler(url) if self.disco else None
+        if em_disco:
+            conteudo, meta = em_disco
+            if time.time() - meta.get("validado_em", 0) < self.max_idade:
+                return conteudo
+            return self._revalidar(url, conteudo, meta)
+        return self._baixar(url).content
+
+    def _baixar(self, url: str, headers: dict = None):
+        with span("imagem_download", url=url, condicional=bool(headers)):
+            response = http_client.get(url, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+            self.downloads += 1
+            if self.disco:
+                self.disco.salvar(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return response
+
+    def _revalidar(self, url: str, conteudo: bytes, meta: dict):
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        self.revalidacoes += 1
+        import requests
+        try:
+            response = self._baixar(url, headers)
+        except requests.exceptions.RequestException as e:
+            # Sem rede: uma cópia antiga é melhor que nenhuma imagem
+            logger.warning("Usando cópia em cache de %s (%s)", url, e)
+            return conteudo
+        if response.status_code == 304:
+            self.disco.revalidado(url, meta)
+            return conteudo
+        return response.content
+
+    def estatisticas(self):
+        return {
+            "memoria_acertos": self.memoria.acertos,
+            "memoria_faltas": self.memoria.faltas,
+            "memoria_itens": len(self.memoria),
+            "disco_acertos": self.disco.acertos if self.disco else 0,
+            "disco_faltas": self.disco.faltas if self.disco else 0,
+            "disco_bytes": self.disco.tamanho_total() if self.disco else 0,
+            "downloads": self.downloads,
+            "revalidacoes": self.revalidacoes,
+        }
+
+    def limpar_memoria(self):
+        self.memoria.limpar()
@@ -0,0 +1,169 @@
+# instrumentacao.py
+"""Instrumentação leve: spans de tempo, contadores e logging estruturado.
+
+Desligada por padrão. Liga com a variável de ambiente LOL_INSTRUMENTACAO=1 ou com `ativar()`;
+LOL_TRACE=<arquivo> grava cada span como uma linha NDJSON. Desligada, `span()` devolve sempre o
+mesmo objeto vazio e `incrementar()` retorna na primeira linha, então o custo é desprezível.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("lol_analytics")
+
+_ativo = os.environ.get("LOL_INSTRUMENTACAO", "").lower() in ("1", "true", "sim")
+_local = threading.local()
+_lock = threading.Lock()
+_contadores = {}
+_arquivo_trace = None
+
+
+class _SpanNulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_SPAN_NULO = _SpanNulo()
+
+
+class _Span:
+    __slots__ = ("nome", "atributos", "inicio")
+
+    def __init__(self, nome, atributos):
+        self.nome = nome
+        self.atributos = atributos
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo_exc, exc, tb):
+        duracao_ms = (time.perf_counter() - self.inicio) * 1000
+        if tipo_exc is not None:
+            self.atributos["erro"] = tipo_exc.__name__
+        _registrar(self.nome, duracao_ms, self.atributos)
+        return False
+
+
+def ativo():
+    return _ativo
+
+def ativar(caminho_trace: str = None):
+    """Liga a instrumentação; se `caminho_trace` for dado, os spans também vão para esse arquivo NDJSON."""
+    global _ativo
+    _ativo = True
+    if caminho_trace:
+        exportar_ndjson(caminho_trace)
+
+def desativar():
+    global _ativo, _arquivo_trace
+    _ativo = False
+    with _lock:
+        if _arquivo_trace:
+            _arquivo_trace.close()
+            _arquivo_trace = None
+
+def exportar_ndjson(caminho: str):
+    """Passa a gravar cada span concluído como uma linha JSON em `caminho` (modo append)."""
+    global _arquivo_trace
+    with _lock:
+        if _arquivo_trace:
+            _arquivo_trace.close()
+        _arquivo_trace = open(caminho, 'a', encoding='utf-8', buffering=1)
+
+def span(nome: str, **atributos):
+    """Context manager que mede o bloco: `with span("fetch", url=url): ...`."""
+    if not _ativo:
+        return _SPAN_NULO
+    return _Span(nome, atributos)
+
+def incrementar(nome: str, valor: int = 1):
+    if not _ativo:
+        return
+    with _lock:
+        _contadores[nome] = _contadores.get(nome, 0) + valor
+
+def contadores():
+    with _lock:
+        return dict(_contadores)
+
+def zerar_contadores():
+    with _lock:
+        _contadores.clear()
+
+@contextmanager
+def coletar_timings():
+    """Acumula, por nome, os spans concluídos nesta thread dentro do bloco.
+
+    Produz um dict {nome: ms} (ou None com a instrumentação desligada), pensado para virar a
+    entrada opcional "timings" dos resultados.
+    """
+    if not _ativo:
+        yield None
+        return
+    anterior = getattr(_local, "coleta", None)
+    coleta = {}
+    _local.coleta = coleta
+    try:
+        yield coleta
+    finally:
+        _local.coleta = anterior
+        if anterior is not None:
+            for nome, ms in coleta.items():
+                anterior[nome] = anterior.get(nome, 0.0) + ms
+
+def _registrar(nome, duracao_ms, atributos):
+    coleta = getattr(_local, "coleta", None)
+    if coleta is not None:
+        coleta[nome] = round(coleta.get(nome, 0.0) + duracao_ms, 3)
+    logger.debug("span %s %.1f ms", nome, duracao_ms, extra={"span": nome, "duracao_ms": duracao_ms, **atributos})
+    if _arquivo_trace:
+        linha = {"ts": time.time(), "span": nome, "ms": round(duracao_ms, 3), "thread": threading.current_thread().name}
+        linha.update(atributos)
+        texto = json.dumps(linha, ensure_ascii=False, default=str)
+        with _lock:
+            if _arquivo_trace:
+                _arquivo_trace.write(texto + "\n")
+
+
+class FormatadorJSON(logging.Formatter):
+    """Formata cada registro de log como uma linha JSON, incluindo os campos passados em `extra`."""
+
+    _PADRAO = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def format(self, record):
+        registro = {
+            "ts": record.created,
+            "nivel": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        registro.update({chave: valor for chave, valor in vars(record).items() if chave not in self._PADRAO})
+        if record.exc_info:
+            registro["exc"] = self.formatException(record.exc_info)
+        return json.dumps(registro, ensure_ascii=False, default=str)
+
+def configurar_logging(nivel: str = None, formato_json: bool = None):
+    """Configura o logger raiz para stderr. Padrões vêm de LOL_LOG_NIVEL (INFO) e LOL_LOG_JSON."""
+    nivel = nivel or os.environ.get("LOL_LOG_NIVEL", "INFO")
+    if formato_json is None:
+        formato_json = os.environ.get("LOL_LOG_JSON", "").lower() in ("1", "true", "sim")
+    handler = logging.StreamHandler()
+    if formato_json:
+        handler.setFormatter(FormatadorJSON())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s", "%H:%M:%S"))
+    raiz = logging.getLogger()
+    raiz.handlers[:] = [handler]
+    raiz.setLevel(nivel.upper())
+
+if _ativo and os.environ.get("LOL_TRACE"):
+    exportar_ndjson(os.environ["LOL_TRACE"])
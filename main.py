@@ -1,13 +1,68 @@
 # main.py
-import tkinter as tk
-from gui import LoLScraperApp
+import os
+import sys
+import time
+
+# LOL_PERFIL_INICIO=1 imprime quanto tempo cada etapa da abertura levou e quais importações pesaram mais
+PERFIL_INICIO = os.environ.get("LOL_PERFIL_INICIO", "").lower() in ("1", "true", "sim")
+
+def _medir_importacoes(tempos):
+    """Envolve o __import__ para registrar o tempo (inclusivo) de cada módulo carregado pela primeira vez."""
+    import builtins
+
+    importar_original = builtins.__import__
+    pilha = []
+
+    def importar(name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return importar_original(name, globals, locals, fromlist, level)
+        pilha.append(name)
+        inicio = time.perf_counter()
+        try:
+            return importar_original(name, globals, locals, fromlist, level)
+        finally:
+            pilha.pop()
+            tempos.append((name, len(pilha), time.perf_counter() - inicio))
+
+    builtins.__import__ = importar
+    return lambda: setattr(builtins, "__import__", importar_original)
+
+def _imprimir_perfil(etapas, importacoes):
+    print("Perfil de inicialização:", file=sys.stderr)
+    anterior = etapas[0][1]
+    for nome, instante in etapas[1:]:
+        print(f"  {nome:<28} {(instante - anterior) * 1000:8.1f} ms", file=sys.stderr)
+        anterior = instante
+    print(f"  {'total':<28} {(etapas[-1][1] - etapas[0][1]) * 1000:8.1f} ms", file=sys.stderr)
+    print("Importações mais lentas (inclusivo):", file=sys.stderr)
+    for nome, profundidade, duracao in sorted(importacoes, key=lambda i: i[2], reverse=True)[:15]:
+        print(f"  {'  ' * profundidade}{nome:<{30 - 2 * profundidade}} {duracao * 1000:8.1f} ms", file=sys.stderr)
 
 if __name__ == "__main__":
+    etapas = [("inicio", time.perf_counter())]
+    importacoes = []
+    restaurar_import = _medir_importacoes(importacoes) if PERFIL_INICIO else None
+
+    import tkinter as tk
+    from gui import LoLScraperApp
+    from instrumentacao import configurar_logging
+    etapas.append(("importações", time.perf_counter()))
+
+    configurar_logging()
+
     # Cria a janela principal do Tkinter
     janela = tk.Tk()
-    
+    etapas.append(("criação do Tk", time.perf_counter()))
+
     # Instancia e executa a aplicação
     app = LoLScraperApp(janela)
-    
+    etapas.append(("montagem da interface", time.perf_counter()))
+
+    if PERFIL_INICIO:
+        restaurar_import()
+        janela.update()
+        etapas.append(("primeiro desenho", time.perf_counter()))
+        _imprimir_perfil(etapas, importacoes)
+
     # Inicia o loop da interface gráfica
-    janela.mainloop()
\ No newline at end of file
+    janela.mainloop()
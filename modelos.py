@@ -0,0 +1,230 @@
+# modelos.py
+"""Modelo tipado do resultado de uma busca, com os números já convertidos.
+
+O scraper monta um `Perfil` a partir da página e só então gera o dicionário `dados` usado pela
+interface, pelo cache de perfis e pelo servidor (`Perfil.para_dict`), que mantém o formato antigo:
+números como o texto que veio da página ("55", "1,234"), KDA formatado e `icone_url` só quando a
+página traz a imagem. Quando formatar o número já reproduz o texto da página (o caso comum), só o
+número é guardado; caso contrário o texto original vai junto em `textos`. Quem precisa dos
+valores lê o `Perfil` direto, sem reinterpretar strings; lotes grandes (`batch`, `pipeline`)
+podem guardar os `Perfil` no lugar dos dicionários.
+
+Para cache e troca entre processos há duas serializações compactas, ambas baseadas em tuplas:
+JSON (`para_json`/`de_json`) e binária com `marshal` (`para_bytes`/`de_bytes`). A binária é a
+mais rápida, mas, como todo `marshal`, só deve ler dados gerados pelo próprio programa.
+"""
+import json
+import marshal
+import re
+from dataclasses import dataclass
+
+# Incrementado quando o formato das tuplas mudar; dados de outra versão são recusados
+VERSAO_FORMATO = 2
+
+KDA_RE = re.compile(r"([\d.]+) / ([\d.]+) / ([\d.]+)")
+
+def numero_inteiro(texto):
+    """'12,345' -> 12345; None ou texto inválido -> None."""
+    if texto is None:
+        return None
+    if isinstance(texto, int):
+        return texto
+    try:
+        return int(str(texto).replace(',', '').strip())
+    except ValueError:
+        return None
+
+def numero_real(texto):
+    """'52.3' -> 52.3; None ou texto inválido -> None."""
+    if texto is None:
+        return None
+    try:
+        return float(texto)
+    except (TypeError, ValueError):
+        return None
+
+def formatar_kda(kda):
+    """Texto exibido na interface para (kills, deaths, assists), ou "N/A"."""
+    if not kda:
+        return "N/A"
+    kills, deaths, assists = kda
+    if deaths > 0:
+        kda_val = (kills + assists) / deaths
+        return f"{kills:.1f} / {deaths:.1f} / {assists:.1f}   ({kda_val:.2f} KDA)"
+    return f"{kills:.1f} / {deaths:.1f} / {assists:.1f}   (Perfeito)"
+
+def _texto_inteiro(valor, separador=False):
+    if valor is None:
+        return None
+    return f"{valor:,}" if separador else str(valor)
+
+def _texto_winrate(valor):
+    return None if valor is None else f"{valor:.1f}"
+
+def _texto_ranking(valor):
+    return _texto_inteiro(valor, separador=True)
+
+def _textos_originais(*pares):
+    """Para pares (texto da página, função que formata o número): os textos que a formatação não
+    reproduziria, na mesma ordem (None nos que ela reproduz), ou None se ela reproduz todos."""
+    textos = tuple(None if texto is None or formatar(numero) == texto else texto for texto, numero, formatar in pares)
+    return textos if any(texto is not None for texto in textos) else None
+
+def converter_resumo(vitorias: str, winrate: str, ranking: str):
+    """Textos de vitórias, winrate e ranking da página -> (vitorias, winrate, ranking, textos) do `Perfil`."""
+    valores = (numero_inteiro(vitorias), numero_real(winrate), numero_inteiro(ranking))
+    textos = _textos_originais((vitorias, valores[0], _texto_inteiro), (winrate, valores[1], _texto_winrate),
+                               (ranking, valores[2], _texto_ranking))
+    return (*valores, textos)
+
+def _texto(textos, posicao, valor, formatar):
+    if textos is not None and textos[posicao] is not None:
+        return textos[posicao]
+    return formatar(valor)
+
+
+@dataclass(slots=True)
+class EstatisticaCampeao:
+    nome: str
+    winrate: float
+    partidas: int
+    ranking: int = None
+    icon_url: str = None
+    textos: tuple = None          # (winrate, partidas, ranking) da página, quando diferem da formatação
+
+    def para_dict(self):
+        return {
+            "nome": self.nome, "winrate": _texto(self.textos, 0, self.winrate, _texto_winrate),
+            "partidas": _texto(self.textos, 1, self.partidas, _texto_inteiro),
+            "ranking": _texto(self.textos, 2, self.ranking, _texto_ranking), "icon_url": self.icon_url,
+        }
+
+    @classmethod
+    def de_textos(cls, nome: str, winrate: str, partidas: str, ranking: str, icon_url: str = None):
+        """Converte os textos da página, guardando os que a formatação não reproduziria."""
+        valores = (numero_real(winrate), numero_inteiro(partidas), numero_inteiro(ranking))
+        textos = _textos_originais((winrate, valores[0], _texto_winrate), (partidas, valores[1], _texto_inteiro),
+                                  (ranking, valores[2], _texto_ranking))
+        return cls(nome, *valores, icon_url, textos)
+
+    @classmethod
+    def de_dict(cls, dados: dict):
+        return cls.de_textos(dados["nome"], dados.get("winrate"), dados.get("partidas"), dados.get("ranking"),
+                             dados.get("icon_url"))
+
+
+@dataclass(slots=True)
+class EstatisticaRota:
+    rota: str
+    partidas: int
+    winrate: float
+
+    def para_dict(self):
+        return {"role": self.rota, "played": self.partidas, "winrate": self.winrate}
+
+    @classmethod
+    def de_dict(cls, dados: dict):
+        return cls(dados["role"], dados["played"], dados["winrate"])
+
+
+@dataclass(slots=True)
+class PontoRank:
+    ts_ms: int
+    valor: float = None
+
+
+@dataclass(slots=True)
+class Perfil:
+    campeoes: list
+    rotas: list
+    pontos_rank: list = None      # None quando a página não trouxe o gráfico
+    rank_map: list = None
+    kda: tuple = None             # (kills, deaths, assists) médios
+    elo: str = None
+    vitorias: int = None
+    winrate: float = None
+    ranking: int = None
+    icone_url: str = None
+    textos: tuple = None          # (vitorias, winrate, ranking) da página, quando diferem da formatação
+
+    @property
+    def kda_medio(self):
+        return formatar_kda(self.kda)
+
+    def para_dict(self):
+        """Dicionário `dados` no formato que a interface e o cache de perfis sempre usaram."""
+        dados = {
+            "campeoes": [campeao.para_dict() for campeao in self.campeoes],
+            "graph_data": None if self.pontos_rank is None else [[p.ts_ms, p.valor] for p in self.pontos_rank],
+            "rank_map": self.rank_map,
+            "kda_medio": self.kda_medio,
+            "roles_data": [rota.para_dict() for rota in self.rotas],
+        }
+        if self.elo is not None:
+            dados["elo"] = self.elo
+            dados["vitorias"] = _texto(self.textos, 0, self.vitorias, _texto_inteiro)
+            dados["winrate"] = _texto(self.textos, 1, self.winrate, _texto_winrate)
+        dados["ranking"] = _texto(self.textos, 2, self.ranking, _texto_ranking)
+        # Como sempre foi: sem imagem na página (ausente ou vazia), o dicionário não tem "icone_url"
+        if self.icone_url:
+            dados["icone_url"] = self.icone_url
+        return dados
+
+    @classmethod
+    def de_dict(cls, dados: dict):
+        """Converte um dicionário `dados` (do scraper ou do cache) em `Perfil`. Levanta ValueError para resultados de erro."""
+        if "erro" in dados:
+            raise ValueError(dados["erro"])
+        kda_match = KDA_RE.match(dados.get("kda_medio") or "")
+        graph_data = dados.get("graph_data")
+        vitorias, winrate, ranking, textos = converter_resumo(dados.get("vitorias"), dados.get("winrate"), dados.get("ranking"))
+        return cls(
+            campeoes=[EstatisticaCampeao.de_dict(c) for c in dados.get("campeoes") or ()],
+            rotas=[EstatisticaRota.de_dict(r) for r in dados.get("roles_data") or ()],
+            pontos_rank=None if graph_data is None else [PontoRank(p[0], p[1]) for p in graph_data],
+            rank_map=dados.get("rank_map"),
+            kda=tuple(float(v) for v in kda_match.groups()) if kda_match else None,
+            elo=dados.get("elo"),
+            vitorias=vitorias,
+            winrate=winrate,
+            ranking=ranking,
+            icone_url=dados.get("icone_url"),
+            textos=textos,
+        )
+
+    def para_tupla(self):
+        """Representação só com tipos básicos (tuplas, listas, números, texto), usada nas serializações."""
+        return (
+            VERSAO_FORMATO,
+            [(c.nome, c.winrate, c.partidas, c.ranking, c.icon_url, c.textos) for c in self.campeoes],
+            [(r.rota, r.partidas, r.winrate) for r in self.rotas],
+            None if self.pontos_rank is None else [(p.ts_ms, p.valor) for p in self.pontos_rank],
+            self.rank_map, self.kda, self.elo, self.vitorias, self.winrate, self.ranking, self.icone_url, self.textos,
+        )
+
+    @classmethod
+    def de_tupla(cls, tupla):
+        if tupla[0] != VERSAO_FORMATO:
+            raise ValueError(f"Formato de perfil desconhecido: {tupla[0]}")
+        _, campeoes, rotas, pontos, rank_map, kda, elo, vitorias, winrate, ranking, icone_url, textos = tupla
+        return cls(
+            [EstatisticaCampeao(*c[:5], tuple(c[5]) if c[5] is not None else None) for c in campeoes],
+            [EstatisticaRota(*r) for r in rotas],
+            None if pontos is None else [PontoRank(*p) for p in pontos],
+            rank_map, tuple(kda) if kda is not None else None, elo, vitorias, winrate, ranking, icone_url,
+            tuple(textos) if textos is not None else None,
+        )
+
+    def para_json(self):
+        return json.dumps(self.para_tupla(), ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def de_json(cls, texto: str):
+        return cls.de_tupla(json.loads(texto))
+
+    def para_bytes(self):
+        return marshal.dumps(self.para_tupla())
+
+    @classmethod
+    def de_bytes(cls, conteudo: bytes):
+        return cls.de_tupla(marshal.loads(conteudo))
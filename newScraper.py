@@ -1,147 +1,229 @@
-# # newScraper.py
-# import requests
-# from bs4 import BeautifulSoup
-# import re
-# import json
-# from urllib.parse import quote
-
-# # --- Novas importações para o Selenium ---
-# from selenium import webdriver
-# from selenium.webdriver.common.by import By
-# from selenium.webdriver.support.ui import WebDriverWait
-# from selenium.webdriver.support import expected_conditions as EC
-# from selenium.common.exceptions import TimeoutException
-# from webdriver_manager.chrome import ChromeDriverManager
-# from selenium.webdriver.chrome.service import Service
-# from selenium.webdriver.chrome.options import Options
-
-# def obter_dados_summoner(nome_invocador: str, regiao: str, id_por_nome_campeao: dict):
-#     """Busca e extrai todos os dados do perfil de um invocador usando Selenium para carregar a página completa."""
-    
-#     # --- Configuração do Selenium para rodar em segundo plano (headless) ---
-#     chrome_options = Options()
-#     chrome_options.add_argument("--headless")  # Não abre uma janela do navegador
-#     chrome_options.add_argument("--log-level=3") # Reduz a quantidade de logs no terminal
-#     chrome_options.add_argument("--disable-gpu")
-#     chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-    
-#     # Instala e gerencia o driver do Chrome automaticamente
-#     service = Service(ChromeDriverManager().install())
-#     driver = webdriver.Chrome(service=service, options=chrome_options)
-    
-#     print("-" * 50)
-#     print(f"Buscando dados para: {nome_invocador} na região {regiao.upper()}")
-
-#     parts = nome_invocador.strip().split('#', 1)
-#     game_name = parts[0]
-#     tagline = parts[1] if len(parts) > 1 else None
-#     encoded_game_name = quote(game_name)
-
-#     if tagline:
-#         nome_formatado = f"{encoded_game_name}-{tagline}"
-#     else:
-#         nome_formatado = encoded_game_name
-
-#     url = f"https://www.leagueofgraphs.com/summoner/{regiao.lower()}/{nome_formatado.lower()}"
-#     print(f"Acessando URL com Selenium: {url}")
-
-#     try:
-#         driver.get(url)
-#         # --- A MÁGICA ACONTECE AQUI ---
-#         # Espera até 10 segundos para que a tabela de roles (ou seu container) esteja presente na página
-#         # Usamos o seletor CSS para encontrar o container que você nos mostrou.
-#         wait = WebDriverWait(driver, 10)
-#         wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-tab-id='championsData-soloqueue'] table")))
-        
-#         print("[DIAGNÓSTICO] Tabela de roles carregada com sucesso!")
-        
-#         # Pega o HTML da página DEPOIS que o JavaScript foi executado
-#         html_content = driver.page_source
-        
-#     except TimeoutException:
-#         print("[DIAGNÓSTICO] ERRO: A tabela de roles não carregou a tempo. A página pode ter mudado ou o jogador não tem dados.")
-#         driver.quit()
-#         return {"erro": "Não foi possível carregar os dados das rotas do jogador."}
-#     except Exception as e:
-#         print(f"[DIAGNÓSTICO] Um erro inesperado ocorreu com o Selenium: {e}")
-#         driver.quit()
-#         return {"erro": "Ocorreu um erro ao carregar a página."}
-
-#     # Fecha o navegador em segundo plano
-#     driver.quit()
-
-#     # Agora, usamos o BeautifulSoup para analisar o HTML completo que o Selenium nos deu
-#     soup = BeautifulSoup(html_content, 'html.parser')
-    
-#     roles_data = []
-#     roles_table_container = soup.find('div', {'data-tab-id': 'championsData-soloqueue'})
-#     if roles_table_container:
-#         roles_table = roles_table_container.find('table') 
-#         if roles_table:
-#             for row in roles_table.find_all('tr')[1:]:
-#                 cols = row.find_all('td')
-#                 if len(cols) >= 3:
-#                     try:
-#                         role_name = cols[0].find('div', class_='txt name').text.strip()
-#                         played = int(cols[1]['data-sort-value'])
-#                         winrate = round(float(cols[2]['data-sort-value']) * 100, 1)
-#                         roles_data.append({"role": role_name, "played": played, "winrate": winrate})
-#                     except (AttributeError, ValueError, KeyError, TypeError) as e:
-#                         print(f"Erro ao processar linha da tabela: {e}")
-
-#     # O resto do código permanece o mesmo, pois agora ele analisa o HTML correto
-#     kda_medio = "N/A"
-#     kda_div = soup.find('div', class_='kda')
-#     if kda_div:
-#         try:
-#             kills = float(kda_div.find('span', class_='kills').text)
-#             deaths = float(kda_div.find('span', class_='deaths').text)
-#             assists = float(kda_div.find('span', class_='assists').text)
-#             if deaths > 0:
-#                 kda_val = (kills + assists) / deaths
-#                 kda_medio = f"{kills:.1f} / {deaths:.1f} / {assists:.1f}   ({kda_val:.2f} KDA)"
-#             else:
-#                 kda_medio = f"{kills:.1f} / {deaths:.1f} / {assists:.1f}   (Perfeito)"
-#         except (ValueError, AttributeError): pass
-
-#     meta_desc = soup.find('meta', attrs={'name': 'twitter:description'})
-#     if not meta_desc:
-#         return {"erro": "Não foi possível encontrar os dados do perfil (meta tag)."}
-
-#     dados = {
-#         "campeoes": [], 
-#         "kda_medio": kda_medio,
-#         "roles_data": roles_data
-#     }
-    
-#     descricao = meta_desc['content']
-#     elo_match = re.search(r"([A-Za-z ]+\d*) - Wins: (\d+) \((\d+\.\d+)%\)", descricao)
-#     if elo_match:
-#         dados["elo"] = elo_match.group(1).strip()
-#         dados["vitorias"] = elo_match.group(2)
-#         dados["winrate"] = elo_match.group(3)
-
-#     dados["ranking"] = (re.search(r"\(#([\d,]+)\)", descricao) or [None, None])[1]
-
-#     meta_img = soup.find('meta', attrs={'name': 'twitter:image'})
-#     if meta_img:
-#         dados["icone_url"] = meta_img['content']
-#         if dados["icone_url"].startswith('//'):
-#             dados["icone_url"] = 'https:' + dados["icone_url"]
-
-#     campeoes_matches = re.findall(r"/ ([^:]+): Wins: ([\d\.]+)% - Played: (\d+) \(#([\d,]+)\)", descricao)
-#     for nome, win, played, rank in campeoes_matches:
-#         nome_chave = nome.strip().lower().replace(' ', '').replace('.', '')
-#         champ_id = id_por_nome_campeao.get(nome_chave)
-#         icon_url = f"https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/champion-icons/{champ_id}.png" if champ_id else None
-#         dados["campeoes"].append({"nome": nome.strip(), "winrate": win, "partidas": played, "ranking": rank, "icon_url": icon_url})
-
-#     # Os dados de gráfico de ranking precisam ser extraídos do HTML completo também
-#     script_content = str(soup)
-#     graphdata_match = re.search(r'const graphData\s*=\s*(\[.*?\]);', script_content, re.DOTALL)
-#     rankmap_match = re.search(r'const graphIntegerValues24\s*=\s*(\[.*?\]);', script_content, re.DOTALL)
-#     dados["graph_data"] = json.loads(graphdata_match.group(1)) if graphdata_match else None
-#     dados["rank_map"] = json.loads(rankmap_match.group(1)) if rankmap_match else None
-
-#     print("-" * 50)
-#     return dados
\ No newline at end of file
+# newScraper.py
+"""Busca em camadas: HTML estático primeiro, página renderizada só quando falta a tabela de rotas.
+
+A tabela `championsData-soloqueue` às vezes só aparece depois que o JavaScript da página roda.
+O caminho rápido (`requests`) resolve a maioria dos perfis; quando a tabela não vem no HTML estático,
+a mesma URL é pedida a um renderizador (Chrome headless via Selenium) que fica aberto entre buscas
+num pool, em vez de abrir um navegador novo a cada consulta.
+
+Qualquer objeto com `renderizar(url) -> html` e `fechar()` serve como renderizador, então o pool
+pode ser exercitado com um renderizador falso que devolve páginas locais.
+"""
+import atexit
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+
+import requests
+
+from instrumentacao import coletar_timings, incrementar, span
+from scraper import META_DESCRICAO, baixar_html, extrair_dados_html, montar_url
+
+logger = logging.getLogger(__name__)
+
+SELETOR_TABELA_ROLES = "div[data-tab-id='championsData-soloqueue'] table"
+# Navegadores mantidos abertos no pool padrão
+TAMANHO_POOL_PADRAO = int(os.environ.get("LOL_RENDER_POOL", "1"))
+TIMEOUT_RENDERIZACAO = 10
+
+class Renderizador(ABC):
+    """Interface dos renderizadores: recebe a URL e devolve o HTML depois do JavaScript."""
+
+    @abstractmethod
+    def renderizar(self, url: str) -> str:
+        ...
+
+    def fechar(self):
+        pass
+
+
+class RenderizadorSelenium(Renderizador):
+    """Chrome headless de vida longa. O driver é instalado uma vez por processo e reaproveitado."""
+
+    _caminho_driver = None
+    _lock_driver = threading.Lock()
+
+    def __init__(self, timeout: float = TIMEOUT_RENDERIZACAO):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # Não abre uma janela do navegador
+        chrome_options.add_argument("--log-level=3") # Reduz a quantidade de logs no terminal
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+
+        self.timeout = timeout
+        self.driver = webdriver.Chrome(service=Service(self._instalar_driver()), options=chrome_options)
+
+    @classmethod
+    def _instalar_driver(cls):
+        with cls._lock_driver:
+            if cls._caminho_driver is None:
+                from webdriver_manager.chrome import ChromeDriverManager
+                cls._caminho_driver = ChromeDriverManager().install()
+            return cls._caminho_driver
+
+    def renderizar(self, url: str) -> str:
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.driver.get(url)
+        try:
+            WebDriverWait(self.driver, self.timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, SELETOR_TABELA_ROLES))
+            )
+        except TimeoutException:
+            # Jogador sem dados de rota: o resto da página renderizada ainda é útil
+            logger.debug("Tabela de roles não carregou em %ss: %s", self.timeout, url)
+        return self.driver.page_source
+
+    def fechar(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug("Erro ao fechar o navegador: %s", e)
+
+
+class PoolRenderizadores:
+    """Pool de renderizadores de vida longa, criados sob demanda até `tamanho`.
+
+    `renderizar()` empresta um renderizador livre (esperando se todos estiverem ocupados); se ele
+    falhar, é descartado e quem estiver esperando é acordado para criar um no lugar. Depois de
+    `fechar()`, os renderizadores ainda emprestados são fechados assim que voltam.
+    """
+
+    def __init__(self, fabrica, tamanho: int = TAMANHO_POOL_PADRAO):
+        self.fabrica = fabrica
+        self.tamanho = max(1, tamanho)
+        self._livres = []
+        self._criados = 0
+        self._condicao = threading.Condition()
+        self._fechado = False
+
+    def _emprestar(self):
+        with self._condicao:
+            while True:
+                if self._fechado:
+                    raise RuntimeError("Pool de renderizadores já foi fechado.")
+                if self._livres:
+                    return self._livres.pop()
+                if self._criados < self.tamanho:
+                    self._criados += 1
+                    break
+                self._condicao.wait()
+        try:
+            return self.fabrica()
+        except BaseException:
+            with self._condicao:
+                self._criados -= 1
+                self._condicao.notify()
+            raise
+
+    def _devolver(self, renderizador):
+        with self._condicao:
+            if not self._fechado:
+                self._livres.append(renderizador)
+                self._condicao.notify()
+                return
+            self._criados -= 1
+        renderizador.fechar()
+
+    def _descartar(self, renderizador):
+        try:
+            renderizador.fechar()
+        finally:
+            with self._condicao:
+                self._criados -= 1
+                # A vaga liberada permite que alguém que espera crie um renderizador novo
+                self._condicao.notify()
+
+    def renderizar(self, url: str) -> str:
+        renderizador = self._emprestar()
+        try:
+            html = renderizador.renderizar(url)
+        except BaseException:
+            self._descartar(renderizador)
+            raise
+        self._devolver(renderizador)
+        return html
+
+    def fechar(self):
+        with self._condicao:
+            self._fechado = True
+            livres, self._livres = self._livres, []
+            self._criados -= len(livres)
+            self._condicao.notify_all()
+        for renderizador in livres:
+            renderizador.fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+_pool_padrao = None
+_pool_indisponivel = False
+_lock_pool = threading.Lock()
+
+def pool_padrao():
+    """Pool de Chrome headless compartilhado pelo processo, ou None se o Selenium não estiver instalado."""
+    global _pool_padrao, _pool_indisponivel
+    with _lock_pool:
+        if _pool_padrao is None and not _pool_indisponivel:
+            try:
+                import selenium  # noqa: F401
+                import webdriver_manager  # noqa: F401
+            except ImportError:
+                logger.warning("Selenium/webdriver-manager não instalados; a busca fica só com o HTML estático.")
+                _pool_indisponivel = True
+                return None
+            _pool_padrao = PoolRenderizadores(RenderizadorSelenium)
+            atexit.register(_pool_padrao.fechar)
+        return _pool_padrao
+
+def precisa_renderizar(html: str):
+    """A página é um perfil (tem a descrição do jogador), mas o HTML estático não trouxe a tabela de rotas.
+
+    Páginas sem a descrição ("invocador não encontrado", por exemplo) não vão para o navegador:
+    renderizá-las só custaria o tempo do Chrome e o timeout esperando uma tabela que não existe.
+    """
+    return META_DESCRICAO.decode() in html and 'championsData-soloqueue' not in html
+
+def obter_dados_summoner(nome_invocador: str, regiao: str, id_por_nome_campeao: dict, pool: PoolRenderizadores = None, backend: str = None):
+    """Mesma interface e mesmo formato de retorno de `scraper.obter_dados_summoner`, com a busca em camadas.
+
+    `pool` é o pool de renderizadores usado na segunda camada (padrão: `pool_padrao()`).
+    """
+    logger.info("Buscando dados para: %s na região %s", nome_invocador, regiao.upper())
+    url = montar_url(nome_invocador, regiao)
+
+    with coletar_timings() as timings, span("perfil", regiao=regiao):
+        try:
+            html = baixar_html(url)
+        except requests.exceptions.RequestException as e:
+            logger.warning("Erro de conexão ao buscar %s: %s", url, e)
+            incrementar("perfis_erro_conexao")
+            return {"erro": f"Erro de conexão: {e}"}
+
+        if precisa_renderizar(html):
+            pool = pool or pool_padrao()
+            if pool is not None:
+                incrementar("perfis_renderizados")
+                try:
+                    with span("renderizacao", url=url):
+                        html = pool.renderizar(url)
+                except Exception as e:
+                    logger.warning("Falha ao renderizar %s (%s); usando o HTML estático.", url, e)
+
+        dados = extrair_dados_html(html, id_por_nome_campeao, backend)
+    incrementar("perfis_erro" if "erro" in dados else "perfis_ok")
+    if timings is not None:
+        dados["timings"] = timings
+    return dados
@@ -0,0 +1,305 @@
+# parsers.py
+import logging
+import os
+import re
+from html.parser import HTMLParser
+from importlib.util import find_spec
+
+# bs4 e lxml só são importados quando o backend correspondente é usado
+LXML_DISPONIVEL = find_spec("lxml") is not None
+
+logger = logging.getLogger(__name__)
+
+# Backend usado quando nenhum é pedido explicitamente: "auto", "lxml", "streaming" ou "html.parser"
+BACKEND_PADRAO = os.environ.get("LOL_PARSER", "auto")
+
+GRAPHDATA_RE = re.compile(r'const graphData\s*=\s*(\[.*?\]);', re.DOTALL)
+RANKMAP_RE = re.compile(r'const graphIntegerValues24\s*=\s*(\[.*?\]);', re.DOTALL)
+
+# Todos os backends devolvem o mesmo dicionário de seções "cruas" (ainda como texto):
+#   tabela_roles: "ok" | "sem_container" | "sem_tabela"
+#   roles: lista de (nome_role, played, winrate) como strings, None quando ausentes
+#   kda: (kills, deaths, assists) como strings, ou None se a div não existir
+#   descricao / imagem: conteúdo das metas twitter:description / twitter:image
+#   texto_scripts: texto onde procurar graphData / graphIntegerValues24
+
+
+def _tem_classes(valor_class, *classes):
+    tokens = (valor_class or "").split()
+    return all(c in tokens for c in classes)
+
+
+def extrair_secoes_html_parser(html: str):
+    """Backend original: árvore completa do BeautifulSoup com o html.parser da biblioteca padrão."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    secoes = {"tabela_roles": "sem_container", "roles": [], "kda": None, "texto_scripts": html}
+
+    roles_table_container = soup.find('div', {'data-tab-id': 'championsData-soloqueue'})
+    if roles_table_container:
+        # Procura por QUALQUER tabela dentro do container, tornando o código mais robusto
+        roles_table = roles_table_container.find('table')
+        secoes["tabela_roles"] = "ok" if roles_table else "sem_tabela"
+        if roles_table:
+            for row in roles_table.find_all('tr')[1:]:
+                cols = row.find_all('td')
+                if len(cols) >= 3:
+                    nome_div = cols[0].find('div', class_='txt name')
+                    secoes["roles"].append((
+                        nome_div.text if nome_div else None,
+                        cols[1].get('data-sort-value'),
+                        cols[2].get('data-sort-value'),
+                    ))
+
+    kda_div = soup.find('div', class_='kda')
+    if kda_div:
+        spans = [kda_div.find('span', class_=classe) for classe in ('kills', 'deaths', 'assists')]
+        secoes["kda"] = tuple(span.text if span else None for span in spans)
+
+    meta_desc = soup.find('meta', attrs={'name': 'twitter:description'})
+    meta_img = soup.find('meta', attrs={'name': 'twitter:image'})
+    secoes["descricao"] = meta_desc.get('content') if meta_desc else None
+    secoes["imagem"] = meta_img.get('content') if meta_img else None
+    return secoes
+
+
+def _xpath_classe(tag, classe):
+    return f'{tag}[contains(concat(" ", normalize-space(@class), " "), " {classe} ")]'
+
+
+def extrair_secoes_lxml(html: str):
+    """Backend lxml: mesma extração do html.parser, com o parser em C e consultas XPath."""
+    from lxml import html as lxml_html
+
+    # Os bytes vão com a codificação explícita: sem <meta charset> no começo, o lxml supõe latin-1
+    arvore = lxml_html.fromstring(html.encode('utf-8'), parser=lxml_html.HTMLParser(encoding='utf-8'))
+    secoes = {"tabela_roles": "sem_container", "roles": [], "kda": None, "texto_scripts": html}
+
+    containers = arvore.xpath('//div[@data-tab-id="championsData-soloqueue"]')
+    if containers:
+        tabelas = containers[0].xpath('.//table')
+        secoes["tabela_roles"] = "ok" if tabelas else "sem_tabela"
+        if tabelas:
+            for row in tabelas[0].xpath('.//tr')[1:]:
+                cols = row.xpath('.//td')
+                if len(cols) >= 3:
+                    nome_div = cols[0].xpath('.//div[@class="txt name"]')
+                    secoes["roles"].append((
+                        nome_div[0].text_content() if nome_div else None,
+                        cols[1].get('data-sort-value'),
+                        cols[2].get('data-sort-value'),
+                    ))
+
+    kda_divs = arvore.xpath('//' + _xpath_classe('div', 'kda'))
+    if kda_divs:
+        valores = []
+        for classe in ('kills', 'deaths', 'assists'):
+            spans = kda_divs[0].xpath('.//' + _xpath_classe('span', classe))
+            valores.append(spans[0].text_content() if spans else None)
+        secoes["kda"] = tuple(valores)
+
+    for nome, chave in (('twitter:description', 'descricao'), ('twitter:image', 'imagem')):
+        conteudo = arvore.xpath(f'//meta[@name="{nome}"]/@content')
+        secoes[chave] = str(conteudo[0]) if conteudo else None
+    return secoes
+
+
+class ExtratorIncremental(HTMLParser):
+    """Extrator em streaming: percorre o HTML sem montar árvore e guarda só as seções que o scraper usa.
+
+    Pode receber a página inteira ou em pedaços via `feed()`; `completo` indica quando todas as
+    seções já foram encontradas, o que permite parar a leitura antes do fim da página.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.descricao = None
+        self.imagem = None
+        self.tabela_roles = "sem_container"
+        self.roles = []
+        self.kda = None
+        self.scripts = []
+        self.graphdata_encontrado = False
+        self.rankmap_encontrado = False
+
+        self._container_profundidade = 0   # divs abertas dentro do container de roles
+        self._container_fechado = False
+        self._tabela_profundidade = 0
+        self._linhas = []
+        self._celula_atual = None
+        self._captura_nome = 0             # divs abertas dentro da div "txt name" da célula atual
+        self._kda_estado = "procurando"    # procurando -> dentro -> concluido
+        self._kda_profundidade = 0
+        self._kda_valores = {}
+        self._span_atual = None
+        self._span_profundidade = 0
+        self._em_script = False
+        self._script_atual = []
+
+    @property
+    def completo(self):
+        return (self.descricao is not None and self.imagem is not None and self._container_fechado
+                and self._kda_estado == "concluido" and self.graphdata_encontrado and self.rankmap_encontrado)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'meta':
+            attrs = dict(attrs)
+            if attrs.get('name') == 'twitter:description' and self.descricao is None:
+                self.descricao = attrs.get('content')
+            elif attrs.get('name') == 'twitter:image' and self.imagem is None:
+                self.imagem = attrs.get('content')
+        elif tag == 'script':
+            self._em_script = True
+            self._script_atual = []
+        elif tag == 'div':
+            self._abrir_div(dict(attrs))
+        elif tag == 'span' and self._kda_estado == "dentro":
+            if self._span_atual:
+                self._span_profundidade += 1
+            else:
+                classes = (dict(attrs).get('class') or "").split()
+                for classe in ('kills', 'deaths', 'assists'):
+                    if classe in classes and classe not in self._kda_valores:
+                        self._span_atual = classe
+                        self._span_profundidade = 1
+                        self._kda_valores[classe] = []
+                        break
+        elif self._container_profundidade and not self._container_fechado:
+            self._abrir_tag_tabela(tag, attrs)
+
+    def _abrir_div(self, attrs):
+        if self._container_profundidade:
+            self._container_profundidade += 1
+            if self._captura_nome:
+                self._captura_nome += 1
+            elif self._celula_atual is not None and attrs.get('class') == 'txt name' and self._celula_atual["nome"] is None:
+                self._captura_nome = 1
+                self._celula_atual["nome"] = []
+        elif not self._container_fechado and attrs.get('data-tab-id') == 'championsData-soloqueue':
+            self._container_profundidade = 1
+
+        if self._kda_estado == "dentro":
+            self._kda_profundidade += 1
+        elif self._kda_estado == "procurando" and _tem_classes(attrs.get('class'), 'kda'):
+            self._kda_estado = "dentro"
+            self._kda_profundidade = 1
+
+    def _abrir_tag_tabela(self, tag, attrs):
+        if tag == 'table':
+            if self._tabela_profundidade or self.tabela_roles == "sem_container":
+                self._tabela_profundidade += 1
+                self.tabela_roles = "ok"
+        elif self._tabela_profundidade:
+            if tag == 'tr':
+                self._linhas.append([])
+                self._celula_atual = None
+            elif tag == 'td' and self._linhas:
+                self._celula_atual = {"attrs": dict(attrs), "nome": None}
+                self._linhas[-1].append(self._celula_atual)
+
+    def handle_endtag(self, tag):
+        if tag == 'script' and self._em_script:
+            self._em_script = False
+            texto = "".join(self._script_atual)
+            self.scripts.append(texto)
+            self.graphdata_encontrado = self.graphdata_encontrado or bool(GRAPHDATA_RE.search(texto))
+            self.rankmap_encontrado = self.rankmap_encontrado or bool(RANKMAP_RE.search(texto))
+        elif tag == 'div':
+            self._fechar_div()
+        elif tag == 'span' and self._span_atual:
+            self._span_profundidade -= 1
+            if not self._span_profundidade:
+                self._span_atual = None
+        elif tag == 'table' and self._tabela_profundidade and self._container_profundidade:
+            self._tabela_profundidade -= 1
+
+    def _fechar_div(self):
+        if self._container_profundidade:
+            if self._captura_nome:
+                self._captura_nome -= 1
+            self._container_profundidade -= 1
+            if not self._container_profundidade:
+                self._container_fechado = True
+                self._finalizar_roles()
+        if self._kda_estado == "dentro":
+            self._kda_profundidade -= 1
+            if not self._kda_profundidade:
+                self._kda_estado = "concluido"
+                self.kda = tuple(
+                    "".join(self._kda_valores[c]) if c in self._kda_valores else None
+                    for c in ('kills', 'deaths', 'assists')
+                )
+
+    def _finalizar_roles(self):
+        if self.tabela_roles == "sem_container":
+            self.tabela_roles = "sem_tabela"
+        for linha in self._linhas[1:]:
+            if len(linha) >= 3:
+                nome = linha[0]["nome"]
+                self.roles.append((
+                    "".join(nome) if nome is not None else None,
+                    linha[1]["attrs"].get('data-sort-value'),
+                    linha[2]["attrs"].get('data-sort-value'),
+                ))
+
+    def handle_data(self, data):
+        if self._em_script:
+            self._script_atual.append(data)
+        elif self._captura_nome:
+            self._celula_atual["nome"].append(data)
+        elif self._span_atual:
+            self._kda_valores[self._span_atual].append(data)
+
+    def secoes(self):
+        """Seções extraídas até agora, no mesmo formato dos outros backends."""
+        if self._container_profundidade and not self._container_fechado:
+            # Página terminou com o container aberto: aproveita o que já foi lido
+            self._container_fechado = True
+            self._finalizar_roles()
+        return {
+            "tabela_roles": self.tabela_roles if self._container_fechado else "sem_container",
+            "roles": self.roles,
+            "kda": self.kda,
+            "descricao": self.descricao,
+            "imagem": self.imagem,
+            "texto_scripts": "\n".join(self.scripts),
+        }
+
+
+def extrair_secoes_streaming(html: str):
+    """Backend em streaming: só materializa as metas, a tabela de roles, o KDA e os scripts."""
+    extrator = ExtratorIncremental()
+    extrator.feed(html)
+    extrator.close()
+    return extrator.secoes()
+
+
+BACKENDS = {
+    "lxml": extrair_secoes_lxml,
+    "streaming": extrair_secoes_streaming,
+    "html.parser": extrair_secoes_html_parser,
+}
+
+def resolver_backend(nome: str = None):
+    """Traduz o nome pedido ('auto' ou None usa o padrão) no backend efetivo."""
+    nome = nome or BACKEND_PADRAO
+    if nome == "auto":
+        return "lxml" if LXML_DISPONIVEL else "streaming"
+    if nome == "lxml" and not LXML_DISPONIVEL:
+        logger.warning("lxml não está instalado; usando o backend 'streaming'.")
+        return "streaming"
+    if nome not in BACKENDS:
+        raise ValueError(f"Backend de parser desconhecido: {nome}. Opções: auto, {', '.join(BACKENDS)}")
+    return nome
+
+def extrair_secoes(html: str, backend: str = None):
+    """Extrai as seções da página com o backend pedido, voltando ao html.parser se ele falhar."""
+    nome = resolver_backend(backend)
+    try:
+        return BACKENDS[nome](html)
+    except Exception as e:
+        if nome == "html.parser":
+            raise
+        logger.warning("Backend '%s' falhou (%s); usando html.parser.", nome, e)
+        return extrair_secoes_html_parser(html)
@@ -0,0 +1,158 @@
+# pipeline.py
+"""Busca em lote em duas etapas: download em threads, extração em processos.
+
+O download (`scraper.baixar_html`) é só espera de rede e roda num pool de threads. A extração
+(árvore HTML, regex da descrição, mapeamento de campeões) gasta CPU e, em threads, fica presa ao
+GIL; aqui ela roda num `ProcessPoolExecutor`, então escala com o número de núcleos.
+
+Entre as etapas há uma fila limitada: se os processos ficarem para trás, os downloads param de
+avançar em vez de acumular HTML na memória. Os perfis voltam dos processos serializados com
+`modelos.Perfil.para_bytes`, bem menores que o HTML ou que um dict em pickle.
+"""
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import requests
+
+from batch import MAX_BUSCAS_SIMULTANEAS
+from modelos import Perfil
+from regioes import REGIAO_AUTO, descobrir_regiao
+from scraper import baixar_html, erro_de_conexao, montar_perfil, montar_url
+from parsers import extrair_secoes
+
+logger = logging.getLogger(__name__)
+
+ERRO_PERFIL = "Não foi possível encontrar os dados do perfil. Pode ser privado ou inválido."
+
+# Índice de campeões de cada processo de extração, carregado uma vez pelo inicializador
+_id_por_nome_campeao = None
+
+def _inicializar_processo():
+    global _id_por_nome_campeao
+    from campeoes import obter_indice
+
+    try:
+        _id_por_nome_campeao = obter_indice()
+    except FileNotFoundError:
+        _id_por_nome_campeao = {}
+
+def _extrair(html: str, backend: str = None):
+    """Etapa de extração (roda no processo): HTML -> `Perfil` serializado, ou None se a página não é um perfil."""
+    perfil = montar_perfil(extrair_secoes(html, backend), _id_por_nome_campeao)
+    return perfil.para_bytes() if perfil else None
+
+def obter_dados_em_pipeline(entradas, max_downloads: int = MAX_BUSCAS_SIMULTANEAS, processos: int = None,
+                            max_pendentes: int = None, backend: str = None, ao_concluir=None, historico=None,
+                            guardar_resultados: bool = True, como_perfil: bool = False):
+    """Como `batch.obter_dados_em_lote`, mas com a extração distribuída entre `processos` processos.
+
+    `max_pendentes` limita quantas páginas baixadas podem esperar pela extração (padrão: 2 por
+    processo). `ao_concluir(indice, nome, regiao, dados)` é chamado na thread que chamou esta
+    função, na ordem em que as buscas terminam; o retorno segue a ordem das entradas (só com None
+    se `guardar_resultados=False`). `como_perfil` funciona como em `obter_dados_em_lote`.
+    Se a espera for interrompida (Ctrl-C, ou uma exceção levantada por `ao_concluir`), os downloads
+    e extrações que ainda não começaram são cancelados.
+    """
+    entradas = list(entradas)
+    if not entradas:
+        return []
+    processos = processos or os.cpu_count() or 1
+    max_pendentes = max_pendentes or 2 * processos
+
+    resultados = [None] * len(entradas)
+    # HTMLs baixados esperando um processo livre; put() bloqueia quando a extração está atrasada
+    baixados = queue.Queue(maxsize=max_pendentes)
+    # Resultados finais, consumidos pela thread chamadora
+    concluidos = queue.Queue()
+    # Extrações em andamento nos processos; também limitado, senão a fila interna do pool cresce sem fim
+    vagas_processos = threading.BoundedSemaphore(max_pendentes)
+    cancelado = threading.Event()
+
+    def baixar(indice):
+        nome, regiao = entradas[indice]
+        try:
+            if regiao == REGIAO_AUTO:
+                regiao = descobrir_regiao(nome)
+                if regiao is None:
+                    concluidos.put((indice, regiao, {"erro": "Invocador não encontrado em nenhuma região."}))
+                    return
+            html = baixar_html(montar_url(nome, regiao))
+        except requests.exceptions.RequestException as e:
+            logger.warning("Erro de conexão ao buscar %s: %s", nome, e)
+            concluidos.put((indice, regiao, erro_de_conexao(e)))
+            return
+        except Exception as e:
+            concluidos.put((indice, regiao, {"erro": f"Erro inesperado: {e}"}))
+            return
+        baixados.put((indice, regiao, html))
+
+    def despachar(pool_processos):
+        # Move os HTMLs da fila para os processos, respeitando o limite de extrações em andamento
+        falha = None
+        for _ in range(len(entradas)):
+            item = baixados.get()
+            if item is None:
+                return
+            if cancelado.is_set():
+                # Interrompido: só esvazia a fila, para os downloads em andamento não travarem no put()
+                continue
+            indice, regiao, html = item
+            if falha is None:
+                vagas_processos.acquire()
+                try:
+                    futuro = pool_processos.submit(_extrair, html, backend)
+                except Exception as e:
+                    # Pool quebrado (um processo morreu, por exemplo): o despachante continua esvaziando
+                    # a fila, senão os downloads travam no put() e quem chamou espera para sempre
+                    vagas_processos.release()
+                    logger.error("Pool de extração indisponível (%s); as páginas restantes ficam com erro.", e)
+                    falha = e
+                else:
+                    futuro.add_done_callback(lambda f, indice=indice, regiao=regiao: _ao_extrair(f, indice, regiao))
+                    continue
+            concluidos.put((indice, regiao, {"erro": f"Erro inesperado: {falha}"}))
+
+    def _ao_extrair(futuro, indice, regiao):
+        vagas_processos.release()
+        try:
+            conteudo = futuro.result()
+            resultado = Perfil.de_bytes(conteudo) if conteudo else {"erro": ERRO_PERFIL}
+        except Exception as e:
+            resultado = {"erro": f"Erro inesperado: {e}"}
+        concluidos.put((indice, regiao, resultado))
+
+    pool_processos = ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_processo)
+    pool_downloads = ThreadPoolExecutor(max_workers=max(1, min(max_downloads, len(entradas))), thread_name_prefix="download")
+    despachante = threading.Thread(target=despachar, args=(pool_processos,), name="pipeline-despacho", daemon=True)
+    despachante.start()
+    try:
+        for indice in range(len(entradas)):
+            pool_downloads.submit(baixar, indice)
+
+        for _ in range(len(entradas)):
+            indice, regiao, resultado = concluidos.get()
+            dados = resultado.para_dict() if isinstance(resultado, Perfil) else resultado
+            if guardar_resultados:
+                resultados[indice] = resultado if como_perfil else dados
+            nome = entradas[indice][0]
+            if historico is not None and regiao:
+                try:
+                    historico.registrar(nome, regiao, dados)
+                except Exception as e:
+                    logger.warning("Não foi possível gravar o histórico de %s: %s", nome, e)
+            if ao_concluir:
+                ao_concluir(indice, nome, entradas[indice][1], dados)
+    except BaseException:
+        cancelado.set()
+        pool_downloads.shutdown(wait=False, cancel_futures=True)
+        pool_processos.shutdown(wait=False, cancel_futures=True)
+        raise
+    # Buscas que falharam no download nunca passam pela fila; libera o despachante se ele ainda espera
+    baixados.put(None)
+    despachante.join()
+    pool_downloads.shutdown()
+    pool_processos.shutdown()
+    return resultados
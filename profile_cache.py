@@ -0,0 +1,129 @@
+# profile_cache.py
+import json
+import logging
+import os
+import threading
+import time
+
+from armazenamento import gravar_json_atomico, normalizar_chave
+from scraper import obter_dados_summoner
+from instrumentacao import incrementar
+from utils import DIRETORIO_CACHE
+
+logger = logging.getLogger(__name__)
+
+# Até esta idade (segundos) o perfil em cache é devolvido sem consultar o site
+TTL_PADRAO = 10 * 60
+# Depois do TTL, por mais este tempo o perfil antigo é devolvido na hora e atualizado em segundo plano
+JANELA_STALE_PADRAO = 60 * 60
+MAX_PERFIS = 500
+
+class CachePerfis:
+    """Cache dos resultados de `obter_dados_summoner` com TTL e stale-while-revalidate, salvo em JSON.
+
+    `relogio` (padrão: `time.time`) dá o instante atual em segundos; os testes trocam por um relógio próprio.
+    """
+
+    def __init__(self, caminho: str, ttl: float = TTL_PADRAO, janela_stale: float = JANELA_STALE_PADRAO, buscar=obter_dados_summoner,
+                 relogio=time.time):
+        self.caminho = caminho
+        self.ttl = ttl
+        self.janela_stale = janela_stale
+        self.buscar = buscar
+        self.relogio = relogio
+        self._entradas = None
+        self._atualizando = set()
+        self._lock = threading.Lock()
+
+    def _carregar(self):
+        if self._entradas is None:
+            try:
+                with open(self.caminho, 'r', encoding='utf-8') as f:
+                    self._entradas = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._entradas = {}
+        return self._entradas
+
+    def _persistir(self):
+        try:
+            gravar_json_atomico(self.caminho, self._entradas)
+        except OSError as e:
+            logger.warning("Não foi possível salvar o cache de perfis: %s", e)
+
+    def _salvar(self, chave, dados):
+        with self._lock:
+            entradas = self._carregar()
+            entradas[chave] = {"salvo_em": self.relogio(), "dados": dados}
+            if len(entradas) > MAX_PERFIS:
+                for antiga in sorted(entradas, key=lambda c: entradas[c]["salvo_em"])[:len(entradas) - MAX_PERFIS]:
+                    del entradas[antiga]
+            self._persistir()
+
+    def _com_metadados(self, entrada, atualizando=False):
+        dados = dict(entrada["dados"])
+        dados["cache"] = {
+            "salvo_em": entrada["salvo_em"],
+            "idade": self.relogio() - entrada["salvo_em"],
+            "atualizando": atualizando,
+        }
+        return dados
+
+    def _buscar_e_salvar(self, chave, nome_invocador, regiao, id_por_nome_campeao, cancelamento=None):
+        extras = {"cancelamento": cancelamento} if cancelamento else {}
+        dados = self.buscar(nome_invocador, regiao, id_por_nome_campeao, **extras)
+        if dados and "erro" not in dados:
+            self._salvar(chave, dados)
+        return dados
+
+    def _atualizar_em_segundo_plano(self, chave, nome_invocador, regiao, id_por_nome_campeao, ao_atualizar):
+        with self._lock:
+            if chave in self._atualizando:
+                return False
+            self._atualizando.add(chave)
+
+        def tarefa():
+            try:
+                dados = self._buscar_e_salvar(chave, nome_invocador, regiao, id_por_nome_campeao)
+            finally:
+                with self._lock:
+                    self._atualizando.discard(chave)
+            if ao_atualizar and dados and "erro" not in dados:
+                ao_atualizar(dados)
+
+        threading.Thread(target=tarefa, daemon=True).start()
+        return True
+
+    def obter(self, nome_invocador: str, regiao: str, id_por_nome_campeao: dict, forcar: bool = False, ao_atualizar=None, cancelamento=None):
+        """Retorna os dados do invocador, do cache quando possível.
+
+        Resultados vindos do cache trazem a chave "cache" com `salvo_em`, `idade` (segundos) e `atualizando`.
+        Se o resultado estiver na janela stale, ele é devolvido imediatamente e uma atualização é
+        disparada em segundo plano; `ao_atualizar(dados)` é chamado (na thread de atualização) ao final.
+        `forcar=True` ignora o cache e sempre busca no site. `cancelamento` é repassado à busca no site.
+        """
+        chave = normalizar_chave(nome_invocador, regiao)
+        with self._lock:
+            entrada = None if forcar else self._carregar().get(chave)
+
+        if entrada:
+            idade = self.relogio() - entrada["salvo_em"]
+            if idade < self.ttl:
+                incrementar("perfil_cache_acerto")
+                return self._com_metadados(entrada)
+            if idade < self.ttl + self.janela_stale:
+                incrementar("perfil_cache_stale")
+                disparou = self._atualizar_em_segundo_plano(chave, nome_invocador, regiao, id_por_nome_campeao, ao_atualizar)
+                return self._com_metadados(entrada, atualizando=disparou)
+
+        dados = self._buscar_e_salvar(chave, nome_invocador, regiao, id_por_nome_campeao, cancelamento)
+        if (not dados or "erro" in dados) and entrada:
+            # Sem conexão: um perfil antigo ainda é mais útil que uma mensagem de erro
+            return self._com_metadados(entrada)
+        return dados
+
+    def limpar(self):
+        with self._lock:
+            self._entradas = {}
+            self._persistir()
+
+cache_perfis = CachePerfis(os.path.join(DIRETORIO_CACHE, "perfis.json"))
@@ -0,0 +1,127 @@
+# regioes.py
+"""Descoberta da região de um invocador quando o usuário escolhe "auto".
+
+Todas as regiões são sondadas ao mesmo tempo com `scraper.perfil_existe`, que lê só o começo
+da página. A primeira que responder com um perfil válido vence, as outras sondagens são
+canceladas (a resposta em andamento é fechada) e a região fica lembrada para aquele nome.
+"""
+import json
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from armazenamento import gravar_json_atomico, normalizar_nome
+from image_cache import DIRETORIO_CACHE
+from tarefas import BuscaCancelada, TokenCancelamento
+
+logger = logging.getLogger(__name__)
+
+# Regiões do League of Graphs, na ordem exibida na interface
+REGIOES = ("br", "na", "euw", "eune", "kr", "jp", "lan", "las", "oce", "tr", "ru")
+# Região especial: descobre em qual das REGIOES o invocador existe
+REGIAO_AUTO = "auto"
+
+CAMINHO_MEMORIA = os.path.join(DIRETORIO_CACHE, "regioes.json")
+MAX_NOMES_LEMBRADOS = 1000
+
+class MemoriaRegioes:
+    """Última região em que cada nome foi encontrado, salva em JSON."""
+
+    def __init__(self, caminho: str = CAMINHO_MEMORIA):
+        self.caminho = caminho
+        self._regioes = None
+        self._lock = threading.Lock()
+
+    def _carregar(self):
+        if self._regioes is None:
+            try:
+                with open(self.caminho, 'r', encoding='utf-8') as f:
+                    self._regioes = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._regioes = {}
+        return self._regioes
+
+    def _persistir(self):
+        try:
+            gravar_json_atomico(self.caminho, self._regioes)
+        except OSError as e:
+            logger.warning("Não foi possível salvar as regiões lembradas: %s", e)
+
+    def obter(self, nome_invocador: str):
+        with self._lock:
+            return self._carregar().get(normalizar_nome(nome_invocador))
+
+    def lembrar(self, nome_invocador: str, regiao: str):
+        with self._lock:
+            regioes = self._carregar()
+            chave = normalizar_nome(nome_invocador)
+            # Reinsere no fim para que os nomes mais antigos sejam os descartados
+            regioes.pop(chave, None)
+            regioes[chave] = regiao
+            while len(regioes) > MAX_NOMES_LEMBRADOS:
+                del regioes[next(iter(regioes))]
+            self._persistir()
+
+    def esquecer(self, nome_invocador: str):
+        with self._lock:
+            if self._carregar().pop(normalizar_nome(nome_invocador), None) is not None:
+                self._persistir()
+
+memoria_regioes = MemoriaRegioes()
+
+def sondar_regioes(nome_invocador: str, regioes=REGIOES, cancelamento=None):
+    """Sonda todas as `regioes` em paralelo e retorna a primeira em que o perfil existe, ou None.
+
+    Assim que uma região confirma o perfil, as sondagens restantes são canceladas. Cancelar
+    `cancelamento` interrompe todas e levanta `tarefas.BuscaCancelada`.
+    """
+    # scraper (e requests) só são importados aqui, para a interface poder ler REGIOES sem carregá-los
+    from scraper import montar_url, perfil_existe
+
+    tokens = {regiao: TokenCancelamento() for regiao in regioes}
+
+    def cancelar_todas():
+        for token in tokens.values():
+            token.cancelar()
+
+    def sondar(regiao):
+        try:
+            return perfil_existe(montar_url(nome_invocador, regiao), tokens[regiao])
+        except BuscaCancelada:
+            return False
+        except Exception as e:
+            # Uma região fora do ar não impede que as outras encontrem o invocador
+            logger.debug("Sondagem de %s em %s falhou: %s", nome_invocador, regiao, e)
+            return False
+
+    if cancelamento:
+        cancelamento.ao_cancelar(cancelar_todas)
+    executor = ThreadPoolExecutor(max_workers=len(tokens), thread_name_prefix="sondagem")
+    try:
+        pendentes = {executor.submit(sondar, regiao): regiao for regiao in tokens}
+        while pendentes:
+            concluidas, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidas:
+                regiao = pendentes.pop(futuro)
+                if futuro.result():
+                    logger.info("%s encontrado na região %s.", nome_invocador, regiao.upper())
+                    return regiao
+        if cancelamento:
+            cancelamento.verificar()
+        return None
+    finally:
+        cancelar_todas()
+        if cancelamento:
+            cancelamento.remover(cancelar_todas)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def descobrir_regiao(nome_invocador: str, cancelamento=None, memoria: MemoriaRegioes = memoria_regioes):
+    """Região do invocador: a lembrada, se houver, senão a encontrada por `sondar_regioes` (e então lembrada)."""
+    regiao = memoria.obter(nome_invocador)
+    if regiao:
+        return regiao
+    regiao = sondar_regioes(nome_invocador, cancelamento=cancelamento)
+    if regiao:
+        memoria.lembrar(nome_invocador, regiao)
+    return regiao
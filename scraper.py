@@ -1,16 +1,30 @@
 # scraper.py
 import requests
-from bs4 import BeautifulSoup
+import codecs
+import logging
+import os
 import re
 import json
+from contextlib import contextmanager
 from urllib.parse import quote
 
-def obter_dados_summoner(nome_invocador: str, regiao: str, id_por_nome_campeao: dict):
-    """Busca e extrai todos os dados do perfil de um invocador no League of Graphs."""
-    
-    print("-" * 50)
-    print(f"Buscando dados para: {nome_invocador} na região {regiao.upper()}")
-    
+import http_client
+from campeoes import normalizar_nome_campeao
+from instrumentacao import coletar_timings, incrementar, span
+from modelos import EstatisticaCampeao, EstatisticaRota, Perfil, PontoRank, converter_resumo
+from parsers import GRAPHDATA_RE, RANKMAP_RE, ExtratorIncremental, extrair_secoes, resolver_backend
+
+logger = logging.getLogger(__name__)
+
+# Hosts podem ser trocados (benchmarks, servidores de teste locais) pelas variáveis de ambiente
+URL_BASE = os.environ.get("LOL_BASE_URL", "https://www.leagueofgraphs.com")
+URL_ICONES_CAMPEOES = os.environ.get(
+    "LOL_ICONES_URL",
+    "https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/champion-icons",
+)
+
+def montar_url(nome_invocador: str, regiao: str):
+    """Monta a URL do perfil no League of Graphs a partir de 'Nome#TAG' e da região."""
     parts = nome_invocador.strip().split('#', 1)
     game_name = parts[0]
     tagline = parts[1] if len(parts) > 1 else None
@@ -20,101 +34,243 @@ def obter_dados_summoner(nome_invocador: str, regiao: str, id_por_nome_campeao:
         nome_formatado = f"{encoded_game_name}-{tagline}"
     else:
         nome_formatado = encoded_game_name
-    
-    url = f"https://www.leagueofgraphs.com/summoner/{regiao.lower()}/{nome_formatado.lower()}"
-    print(f"Acessando URL: {url}")
-    
-    headers = {"User-Agent": "Mozilla/5.0", "Accept-Language": "pt-BR,pt;q=0.9"}
 
-    try:
-        resposta = requests.get(url, headers=headers, timeout=10)
-        resposta.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"ERRO DE CONEXÃO: {e}")
-        return {"erro": f"Erro de conexão: {e}"}
+    return f"{URL_BASE}/summoner/{regiao.lower()}/{nome_formatado.lower()}"
 
-    soup = BeautifulSoup(resposta.text, 'html.parser')
-    script_content = resposta.text
-    
-    roles_data = []
+# Tamanho dos blocos lidos por vez quando a busca pode ser cancelada ou é feita em streaming
+TAMANHO_BLOCO = 16 * 1024
+# Presente no <head> de todo perfil válido; é o que as sondagens de região procuram
+META_DESCRICAO = b"twitter:description"
+# LOL_STREAMING=1 ou 0 força o download em streaming (com parada antecipada) ou a página inteira.
+# Sem a variável, o streaming só é usado quando o backend já seria o extrator incremental (lxml
+# ausente): com lxml, extrair a página inteira gasta bem menos CPU que o extrator em Python puro
+_STREAMING_ENV = os.environ.get("LOL_STREAMING")
+STREAMING_PADRAO = None if _STREAMING_ENV is None else _STREAMING_ENV.lower() not in ("0", "false", "nao", "não")
 
-    # Tenta extrair dados da tabela HTML
-    print("\n[DIAGNÓSTICO] Tentando extrair dados via tabela HTML...")
-    roles_table_container = soup.find('div', {'data-tab-id': 'championsData-soloqueue'})
-    if roles_table_container:
-        # --- CORREÇÃO PRINCIPAL AQUI ---
-        # Procura por QUALQUER tabela dentro do container, tornando o código mais robusto
-        roles_table = roles_table_container.find('table') 
-        
-        if roles_table:
-            for row in roles_table.find_all('tr')[1:]:
-                cols = row.find_all('td')
-                if len(cols) >= 3: # Mudado para 'maior ou igual' por segurança
-                    try:
-                        role_name = cols[0].find('div', class_='txt name').text.strip()
-                        played = int(cols[1]['data-sort-value'])
-                        winrate = round(float(cols[2]['data-sort-value']) * 100, 1)
-                        
-                        roles_data.append({
-                            "role": role_name,
-                            "played": played,
-                            "winrate": winrate
-                        })
-                    except (AttributeError, ValueError, KeyError, TypeError) as e:
-                        print(f"[DIAGNÓSTICO] Erro ao processar linha da tabela: {e}")
-            if roles_data:
-                print(f"[DIAGNÓSTICO] Sucesso! Dados da tabela extraídos. Roles: {[role['role'] for role in roles_data]}")
+def erro_de_conexao(e: requests.exceptions.RequestException):
+    """Resultado de erro de um download que falhou. `status_http` é o status da resposta do site, ou
+    None quando nenhuma chegou (timeout, conexão recusada)."""
+    resposta = getattr(e, "response", None)
+    return {"erro": f"Erro de conexão: {e}", "status_http": resposta.status_code if resposta is not None else None}
+
+def obter_dados_summoner(nome_invocador: str, regiao: str, id_por_nome_campeao: dict, backend: str = None, cancelamento=None,
+                         streaming: bool = None):
+    """Busca e extrai todos os dados do perfil de um invocador no League of Graphs.
+
+    Com a instrumentação ligada, o resultado traz a entrada "timings" com a duração (ms) de cada etapa.
+    Com um `cancelamento` (`tarefas.TokenCancelamento`), cancelar o token interrompe o download em
+    andamento e a função levanta `tarefas.BuscaCancelada`.
+    Com `streaming` (padrão: `STREAMING_PADRAO`, ou automático conforme o backend), a página é
+    extraída enquanto chega e o download para assim que todas as seções foram encontradas; veja
+    `baixar_secoes`.
+    """
+    logger.info("Buscando dados para: %s na região %s", nome_invocador, regiao.upper())
+
+    url = montar_url(nome_invocador, regiao)
+    logger.debug("Acessando URL: %s", url)
+    if streaming is None:
+        streaming = STREAMING_PADRAO if STREAMING_PADRAO is not None else resolver_backend(backend) == "streaming"
+
+    with coletar_timings() as timings, span("perfil", regiao=regiao):
+        try:
+            if streaming:
+                secoes = baixar_secoes(url, backend, cancelamento)
             else:
-                print("[DIAGNÓSTICO] Tabela encontrada, mas não foi possível extrair dados das linhas.")
+                html = baixar_html(url, cancelamento)
+        except requests.exceptions.RequestException as e:
+            logger.warning("Erro de conexão ao buscar %s: %s", url, e)
+            incrementar("perfis_erro_conexao")
+            return erro_de_conexao(e)
+
+        if cancelamento:
+            cancelamento.verificar()
+        if streaming:
+            dados = montar_dados(secoes, id_por_nome_campeao)
         else:
-            print("[DIAGNÓSTICO] Container de roles encontrado, mas NENHUMA tabela foi encontrada dentro dele.")
-    else:
-        print("[DIAGNÓSTICO] Container 'championsData-soloqueue' não foi encontrado na página.")
+            dados = extrair_dados_html(html, id_por_nome_campeao, backend)
+    incrementar("perfis_erro" if "erro" in dados else "perfis_ok")
+    if timings is not None:
+        dados["timings"] = timings
+    return dados
+
+@contextmanager
+def _abrir_stream(url: str, cancelamento=None):
+    """Resposta em modo stream, fechada ao sair; com `cancelamento`, cancelar o token também a fecha."""
+    if cancelamento:
+        cancelamento.verificar()
+    resposta = http_client.get(url, stream=True, cancelamento=cancelamento)
+    if cancelamento:
+        cancelamento.ao_cancelar(resposta.close)
+    try:
+        resposta.raise_for_status()
+        yield resposta
+    except Exception:
+        # Fechar a resposta por outra thread quebra a leitura com erros variados; o motivo real é o cancelamento
+        if cancelamento:
+            cancelamento.verificar()
+        raise
+    finally:
+        if cancelamento:
+            cancelamento.remover(resposta.close)
+        resposta.close()
+
+def _blocos(resposta, cancelamento=None):
+    for bloco in resposta.iter_content(TAMANHO_BLOCO):
+        if cancelamento:
+            cancelamento.verificar()
+        yield bloco
+
+def baixar_html(url: str, cancelamento=None):
+    """Baixa o HTML estático de uma página de perfil. Levanta `requests.exceptions.RequestException` em caso de falha.
 
-    kda_medio = "N/A"
-    kda_div = soup.find('div', class_='kda')
-    if kda_div:
+    Com `cancelamento`, o corpo é lido em blocos e a leitura para (com `BuscaCancelada`) assim que o token é cancelado.
+    """
+    with span("fetch", url=url):
+        if cancelamento is None:
+            resposta = http_client.get(url)
+            resposta.raise_for_status()
+            return resposta.text
+
+        with _abrir_stream(url, cancelamento) as resposta:
+            blocos = list(_blocos(resposta, cancelamento))
+        return b"".join(blocos).decode(resposta.encoding or 'utf-8', errors='replace')
+
+def perfil_existe(url: str, cancelamento=None):
+    """Confere se a URL é um perfil válido lendo só o começo da página, até a meta twitter:description.
+
+    Retorna False para 404 ou para páginas sem a meta (invocador inexistente naquela região).
+    Falhas de rede levantam `requests.exceptions.RequestException`, como em `baixar_html`.
+    """
+    with span("sondagem", url=url):
         try:
-            kills = float(kda_div.find('span', class_='kills').text)
-            deaths = float(kda_div.find('span', class_='deaths').text)
-            assists = float(kda_div.find('span', class_='assists').text)
-            
-            if deaths > 0:
-                kda_val = (kills + assists) / deaths
-                kda_medio = f"{kills:.1f} / {deaths:.1f} / {assists:.1f}   ({kda_val:.2f} KDA)"
-            else:
-                kda_medio = f"{kills:.1f} / {deaths:.1f} / {assists:.1f}   (Perfeito)"
-        except (ValueError, AttributeError): pass
-
-    meta_desc = soup.find('meta', attrs={'name': 'twitter:description'})
-    meta_img = soup.find('meta', attrs={'name': 'twitter:image'})
-    
-    graphdata_match = re.search(r'const graphData\s*=\s*(\[.*?\]);', script_content, re.DOTALL)
-    rankmap_match = re.search(r'const graphIntegerValues24\s*=\s*(\[.*?\]);', script_content, re.DOTALL)
-
-    graph_data, rank_map = None, None
-
-    if graphdata_match:
-        try: graph_data = json.loads(graphdata_match.group(1))
-        except json.JSONDecodeError: pass
-    
-    if rankmap_match:
-        try: rank_map = json.loads(rankmap_match.group(1))
-        except json.JSONDecodeError: pass
-    
-    if not meta_desc:
+            with _abrir_stream(url, cancelamento) as resposta:
+                lido = b""
+                for bloco in _blocos(resposta, cancelamento):
+                    lido += bloco
+                    if META_DESCRICAO in lido:
+                        return True
+                    if b"</head>" in lido:
+                        return False
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return False
+            raise
+    return False
+
+def baixar_secoes(url: str, backend: str = None, cancelamento=None):
+    """Baixa a página em blocos, passando cada um ao `parsers.ExtratorIncremental`, e retorna as seções.
+
+    A leitura termina assim que o extrator encontra todas as seções, sem baixar o resto da página.
+    Se a página acabar sem que todas apareçam (perfil sem ranking, layout diferente), o HTML completo
+    é extraído de novo com o `backend` normal, como no modo sem streaming.
+    """
+    extrator = ExtratorIncremental()
+    blocos = []
+    lidos = 0
+    with span("fetch_streaming", url=url):
+        with _abrir_stream(url, cancelamento) as resposta:
+            decodificador = codecs.getincrementaldecoder(resposta.encoding or 'utf-8')(errors='replace')
+            for bloco in _blocos(resposta, cancelamento):
+                lidos += len(bloco)
+                blocos.append(bloco)
+                extrator.feed(decodificador.decode(bloco))
+                if extrator.completo:
+                    break
+    incrementar("streaming_bytes", lidos)
+
+    if extrator.completo:
+        incrementar("streaming_interrompido")
+        logger.debug("Seções completas após %d bytes de %s.", lidos, url)
+        return extrator.secoes()
+
+    incrementar("streaming_pagina_inteira")
+    html = b"".join(blocos).decode(resposta.encoding or 'utf-8', errors='replace')
+    with span("parse", tamanho=len(html)):
+        return extrair_secoes(html, backend)
+
+def extrair_dados_html(html: str, id_por_nome_campeao: dict, backend: str = None):
+    """Monta o dicionário `dados` a partir do HTML de uma página de perfil.
+
+    `backend` escolhe o parser ("auto", "lxml", "streaming" ou "html.parser"); veja `parsers.py`.
+    """
+    with span("parse", tamanho=len(html)):
+        secoes = extrair_secoes(html, backend)
+    return montar_dados(secoes, id_por_nome_campeao)
+
+def montar_dados(secoes: dict, id_por_nome_campeao: dict):
+    """Monta o dicionário `dados` a partir das seções devolvidas por `parsers.extrair_secoes`."""
+    perfil = montar_perfil(secoes, id_por_nome_campeao)
+    if perfil is None:
         return {"erro": "Não foi possível encontrar os dados do perfil. Pode ser privado ou inválido."}
+    return perfil.para_dict()
+
+def montar_perfil(secoes: dict, id_por_nome_campeao: dict):
+    """`modelos.Perfil` com os números já convertidos, ou None se a página não tem os dados do perfil."""
+    rotas = _extrair_roles(secoes)
+    kda = _converter_kda(secoes["kda"])
+
+    with span("graficos_json"):
+        script_content = secoes["texto_scripts"]
+        graphdata_match = GRAPHDATA_RE.search(script_content)
+        rankmap_match = RANKMAP_RE.search(script_content)
+
+        graph_data, rank_map = None, None
+
+        if graphdata_match:
+            try: graph_data = json.loads(graphdata_match.group(1))
+            except json.JSONDecodeError: pass
+
+        if rankmap_match:
+            try: rank_map = _carregar_rank_map(rankmap_match.group(1))
+            except json.JSONDecodeError: pass
+
+    if not secoes["descricao"]:
+        return None
+
+    resumo = {}
+    with span("descricao_regex"):
+        campeoes_matches = analisar_descricao(secoes["descricao"], resumo)
 
-    dados = {
-        "campeoes": [], 
-        "graph_data": graph_data, 
-        "rank_map": rank_map,
-        "kda_medio": kda_medio,
-        "roles_data": roles_data
-    }
+    icone_url = secoes["imagem"]
+    if icone_url and icone_url.startswith('//'):
+        icone_url = 'https:' + icone_url
 
-    descricao = meta_desc['content']
+    with span("mapeamento_campeoes"):
+        campeoes = mapear_campeoes(campeoes_matches, id_por_nome_campeao)
+    vitorias, winrate, ranking, textos = converter_resumo(resumo.get("vitorias"), resumo.get("winrate"), resumo.get("ranking"))
 
+    return Perfil(
+        campeoes=campeoes,
+        rotas=rotas,
+        pontos_rank=None if graph_data is None else [
+            PontoRank(ponto[0], ponto[1]) for ponto in graph_data if isinstance(ponto, list) and len(ponto) >= 2
+        ],
+        rank_map=rank_map,
+        kda=kda,
+        elo=resumo.get("elo"),
+        vitorias=vitorias,
+        winrate=winrate,
+        ranking=ranking,
+        icone_url=icone_url,
+        textos=textos,
+    )
+
+# A escala de ranks é a mesma em todas as páginas: cada texto distinto é lido uma vez e a lista
+# resultante é compartilhada entre os perfis (que só a leem), em vez de uma cópia por perfil
+MAX_RANK_MAPS = 32
+_rank_maps = {}
+
+def _carregar_rank_map(texto: str):
+    rank_map = _rank_maps.get(texto)
+    if rank_map is None:
+        rank_map = json.loads(texto)
+        if len(_rank_maps) >= MAX_RANK_MAPS:
+            _rank_maps.clear()
+        _rank_maps[texto] = rank_map
+    return rank_map
+
+def analisar_descricao(descricao: str, dados: dict):
+    """Preenche elo, vitórias, winrate e ranking a partir da meta description e devolve os campeões encontrados nela."""
     elo_match = re.search(r"([A-Za-z ]+\d*) - Wins: (\d+) \((\d+\.\d+)%\)", descricao)
     if elo_match:
         dados["elo"] = elo_match.group(1).strip()
@@ -123,19 +279,47 @@ def obter_dados_summoner(nome_invocador: str, regiao: str, id_por_nome_campeao:
 
     dados["ranking"] = (re.search(r"\(#([\d,]+)\)", descricao) or [None, None])[1]
 
-    if meta_img:
-        dados["icone_url"] = meta_img['content']
-        if dados["icone_url"].startswith('//'):
-            dados["icone_url"] = 'https:' + dados["icone_url"]
+    return re.findall(r"/ ([^:]+): Wins: ([\d\.]+)% - Played: (\d+) \(#([\d,]+)\)", descricao)
 
-    campeoes_matches = re.findall(r"/ ([^:]+): Wins: ([\d\.]+)% - Played: (\d+) \(#([\d,]+)\)", descricao)
+def mapear_campeoes(campeoes_matches, id_por_nome_campeao: dict):
+    """Converte as tuplas (nome, winrate, partidas, ranking) da descrição em `modelos.EstatisticaCampeao` com ícone."""
+    campeoes = []
     for nome, win, played, rank in campeoes_matches:
-        nome_chave = nome.strip().lower().replace(' ', '').replace('.', '')
+        nome_chave = normalizar_nome_campeao(nome)
         champ_id = id_por_nome_campeao.get(nome_chave)
-        icon_url = f"https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/champion-icons/{champ_id}.png" if champ_id else None
-        dados["campeoes"].append({
-            "nome": nome.strip(), "winrate": win, "partidas": played,
-            "ranking": rank, "icon_url": icon_url
-        })
-    print("-" * 50)
-    return dados
\ No newline at end of file
+        icon_url = f"{URL_ICONES_CAMPEOES}/{champ_id}.png" if champ_id else None
+        campeoes.append(EstatisticaCampeao.de_textos(nome.strip(), win, played, rank, icon_url))
+    return campeoes
+
+def _extrair_roles(secoes):
+    roles_data = []
+
+    if secoes["tabela_roles"] == "sem_container":
+        logger.debug("Container 'championsData-soloqueue' não foi encontrado na página.")
+        return roles_data
+    if secoes["tabela_roles"] == "sem_tabela":
+        logger.debug("Container de roles encontrado, mas NENHUMA tabela foi encontrada dentro dele.")
+        return roles_data
+
+    for role_name, played, winrate in secoes["roles"]:
+        try:
+            roles_data.append(EstatisticaRota(
+                rota=role_name.strip(),
+                partidas=int(played),
+                winrate=round(float(winrate) * 100, 1)
+            ))
+        except (AttributeError, ValueError, KeyError, TypeError) as e:
+            logger.debug("Erro ao processar linha da tabela de roles: %s", e)
+    if roles_data:
+        logger.debug("Roles extraídas da tabela: %s", [role.rota for role in roles_data])
+    else:
+        logger.debug("Tabela encontrada, mas não foi possível extrair dados das linhas.")
+    return roles_data
+
+def _converter_kda(kda):
+    if not kda:
+        return None
+    try:
+        return tuple(float(valor) for valor in kda)
+    except (ValueError, TypeError):
+        return None
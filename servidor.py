@@ -0,0 +1,263 @@
+# servidor.py
+"""Serviço HTTP/JSON local com os dados de `obter_dados_summoner`.
+
+    python servidor.py [--host 127.0.0.1] [--porta 8080] [--concorrencia 8] [--usar-cache]
+
+Rotas:
+    GET /summoner/{regiao}/{nome}   nome como "Nome#TAG" (com %23) ou "Nome-TAG"; devolve o dict `dados`
+    GET /metrics                    métricas no formato texto do Prometheus
+    GET /healthz                    "ok"
+
+Buscas simultâneas pelo mesmo invocador viram uma única busca no site (single-flight), e o número
+de buscas no site ao mesmo tempo é limitado por `--concorrencia`.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlsplit
+
+import instrumentacao
+from profile_cache import normalizar_chave
+
+logger = logging.getLogger(__name__)
+
+MAX_BUSCAS_SIMULTANEAS = 8
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TAMANHO_MAXIMO_CABECALHO = 16 * 1024
+
+class Histograma:
+    """Histograma cumulativo no estilo do Prometheus."""
+
+    def __init__(self, buckets=BUCKETS_LATENCIA):
+        self.buckets = buckets
+        self.contagens = [0] * len(buckets)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float):
+        self.soma += valor
+        self.total += 1
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.contagens[i] += 1
+
+    def exportar(self, nome: str, rotulos: str = ""):
+        separador = "," if rotulos else ""
+        linhas = [f'{nome}_bucket{{{rotulos}{separador}le="{limite}"}} {contagem}' for limite, contagem in zip(self.buckets, self.contagens)]
+        linhas.append(f'{nome}_bucket{{{rotulos}{separador}le="+Inf"}} {self.total}')
+        sufixo = f"{{{rotulos}}}" if rotulos else ""
+        linhas.append(f"{nome}_sum{sufixo} {self.soma:.6f}")
+        linhas.append(f"{nome}_count{sufixo} {self.total}")
+        return linhas
+
+
+def separar_nome(nome_url: str):
+    """Converte o nome da URL para 'Nome#TAG', aceitando tanto '#' (%23) quanto o formato 'Nome-TAG' do site."""
+    nome = unquote(nome_url).strip()
+    if '#' not in nome and '-' in nome:
+        game_name, tagline = nome.rsplit('-', 1)
+        nome = f"{game_name}#{tagline}"
+    return nome
+
+def status_do_erro(dados: dict):
+    """Status HTTP de um resultado de erro: 404 quando o invocador não existe (o site respondeu 404 ou
+    a página não tem perfil), 502 quando o site falhou ou não respondeu."""
+    if "status_http" not in dados:
+        return 404
+    return 404 if dados["status_http"] == 404 else 502
+
+class ServicoSummoner:
+    def __init__(self, buscar=None, concorrencia: int = MAX_BUSCAS_SIMULTANEAS, id_por_nome_campeao=None):
+        if buscar is None:
+            from scraper import obter_dados_summoner as buscar
+        if id_por_nome_campeao is None:
+            from utils import carregar_id_por_nome_campeao
+            id_por_nome_campeao = carregar_id_por_nome_campeao()
+        self.buscar = buscar
+        self.id_por_nome_campeao = id_por_nome_campeao
+        self.concorrencia = concorrencia
+        self._executor = ThreadPoolExecutor(max_workers=concorrencia, thread_name_prefix="upstream")
+        self._semaforo = None
+        self._em_voo = {}
+        self.requisicoes_em_andamento = 0
+        self.upstream_em_andamento = 0
+        self.requisicoes_por_status = {}
+        self.coalescidas = 0
+        self.latencia_requisicoes = Histograma()
+        self.latencia_upstream = Histograma()
+
+    async def obter_summoner(self, nome: str, regiao: str):
+        """Dados do invocador, juntando pedidos simultâneos pela mesma chave numa única busca."""
+        chave = normalizar_chave(nome, regiao)
+        tarefa = self._em_voo.get(chave)
+        if tarefa is not None:
+            self.coalescidas += 1
+        else:
+            tarefa = asyncio.ensure_future(self._buscar_upstream(nome, regiao))
+            self._em_voo[chave] = tarefa
+            tarefa.add_done_callback(lambda _: self._em_voo.pop(chave, None))
+        # shield: um cliente que desconecta não cancela a busca dos outros que esperam por ela
+        return await asyncio.shield(tarefa)
+
+    async def _buscar_upstream(self, nome: str, regiao: str):
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.concorrencia)
+        async with self._semaforo:
+            self.upstream_em_andamento += 1
+            inicio = time.perf_counter()
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, self.buscar, nome, regiao, self.id_por_nome_campeao)
+            finally:
+                self.latencia_upstream.observar(time.perf_counter() - inicio)
+                self.upstream_em_andamento -= 1
+
+    def metricas(self):
+        linhas = [
+            "# TYPE lol_requisicoes_em_andamento gauge",
+            f"lol_requisicoes_em_andamento {self.requisicoes_em_andamento}",
+            "# TYPE lol_upstream_em_andamento gauge",
+            f"lol_upstream_em_andamento {self.upstream_em_andamento}",
+            "# TYPE lol_upstream_limite gauge",
+            f"lol_upstream_limite {self.concorrencia}",
+            "# TYPE lol_singleflight_coalescidas_total counter",
+            f"lol_singleflight_coalescidas_total {self.coalescidas}",
+            "# TYPE lol_requisicoes_total counter",
+        ]
+        linhas += [f'lol_requisicoes_total{{status="{status}"}} {total}' for status, total in sorted(self.requisicoes_por_status.items())]
+        linhas.append("# TYPE lol_requisicao_latencia_segundos histogram")
+        linhas += self.latencia_requisicoes.exportar("lol_requisicao_latencia_segundos")
+        linhas.append("# TYPE lol_upstream_latencia_segundos histogram")
+        linhas += self.latencia_upstream.exportar("lol_upstream_latencia_segundos")
+        contadores = instrumentacao.contadores()
+        if contadores:
+            linhas.append("# TYPE lol_contador counter")
+            linhas += [f'lol_contador{{nome="{nome}"}} {valor}' for nome, valor in sorted(contadores.items())]
+        return "\n".join(linhas) + "\n"
+
+    async def responder(self, metodo: str, caminho: str):
+        """Retorna (status, content_type, corpo) para uma requisição."""
+        if metodo != "GET":
+            return 405, "application/json", {"erro": "Método não permitido."}
+        partes = [p for p in urlsplit(caminho).path.split("/") if p]
+        if partes == ["metrics"]:
+            return 200, "text/plain; version=0.0.4", self.metricas()
+        if partes == ["healthz"]:
+            return 200, "text/plain", "ok\n"
+        if len(partes) == 3 and partes[0] == "summoner":
+            regiao, nome = partes[1].lower(), separar_nome(partes[2])
+            try:
+                dados = await self.obter_summoner(nome, regiao)
+            except Exception as e:
+                logger.exception("Erro ao buscar %s (%s)", nome, regiao)
+                return 500, "application/json", {"erro": f"Erro inesperado: {e}"}
+            if not dados:
+                return 404, "application/json", {"erro": "Invocador não encontrado."}
+            if "erro" in dados:
+                return status_do_erro(dados), "application/json", dados
+            return 200, "application/json", dados
+        return 404, "application/json", {"erro": "Rota não encontrada."}
+
+    async def tratar_conexao(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                try:
+                    metodo, caminho, versao = linha.decode('latin-1').split()
+                except ValueError:
+                    await self._escrever(writer, 400, "text/plain", "requisição inválida\n", manter=False)
+                    break
+                cabecalhos = {}
+                tamanho = 0
+                while True:
+                    try:
+                        linha = await reader.readline()
+                    except ValueError:
+                        # Linha maior que o limite do StreamReader
+                        tamanho = TAMANHO_MAXIMO_CABECALHO + 1
+                        break
+                    tamanho += len(linha)
+                    if linha in (b"\r\n", b"\n", b"") or tamanho > TAMANHO_MAXIMO_CABECALHO:
+                        break
+                    nome, _, valor = linha.decode('latin-1').partition(":")
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                if tamanho > TAMANHO_MAXIMO_CABECALHO:
+                    # O resto dos cabeçalhos não foi lido, então a conexão não pode ser reaproveitada
+                    await self._escrever(writer, 431, "text/plain", "cabeçalhos grandes demais\n", manter=False)
+                    break
+                manter = versao == "HTTP/1.1" and cabecalhos.get("connection", "").lower() != "close"
+
+                self.requisicoes_em_andamento += 1
+                inicio = time.perf_counter()
+                try:
+                    status, tipo, corpo = await self.responder(metodo, caminho)
+                finally:
+                    self.requisicoes_em_andamento -= 1
+                    self.latencia_requisicoes.observar(time.perf_counter() - inicio)
+                self.requisicoes_por_status[status] = self.requisicoes_por_status.get(status, 0) + 1
+                await self._escrever(writer, status, tipo, corpo, manter)
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _escrever(self, writer, status, tipo, corpo, manter):
+        if not isinstance(corpo, str):
+            corpo = json.dumps(corpo, ensure_ascii=False)
+            tipo += "; charset=utf-8"
+        dados = corpo.encode('utf-8')
+        motivo = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                  431: "Request Header Fields Too Large", 500: "Internal Server Error", 502: "Bad Gateway"}.get(status, "")
+        cabecalho = (
+            f"HTTP/1.1 {status} {motivo}\r\n"
+            f"Content-Type: {tipo}\r\n"
+            f"Content-Length: {len(dados)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n"
+        )
+        writer.write(cabecalho.encode('latin-1') + dados)
+        await writer.drain()
+
+    def fechar(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def servir(servico: ServicoSummoner, host: str, porta: int):
+    servidor = await asyncio.start_server(servico.tratar_conexao, host, porta)
+    enderecos = ", ".join(f"http://{s.getsockname()[0]}:{s.getsockname()[1]}" for s in servidor.sockets)
+    logger.info("Servindo em %s", enderecos)
+    async with servidor:
+        await servidor.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON com os dados de perfis do League of Graphs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("-c", "--concorrencia", type=int, default=MAX_BUSCAS_SIMULTANEAS,
+                        help=f"Buscas simultâneas no site (padrão: {MAX_BUSCAS_SIMULTANEAS}).")
+    parser.add_argument("--usar-cache", action="store_true", help="Responde pelo cache de perfis (TTL + stale-while-revalidate).")
+    args = parser.parse_args(argv)
+    instrumentacao.configurar_logging()
+
+    buscar = None
+    if args.usar_cache:
+        from profile_cache import cache_perfis
+        buscar = cache_perfis.obter
+    servico = ServicoSummoner(buscar=buscar, concorrencia=args.concorrencia)
+    try:
+        asyncio.run(servir(servico, args.host, args.porta))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servico.fechar()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# tarefas.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class BuscaCancelada(Exception):
+    """A busca foi cancelada antes de terminar (outra busca a substituiu ou a janela foi fechada)."""
+
+class TokenCancelamento:
+    """Sinal de cancelamento compartilhado entre quem pede e quem executa uma busca.
+
+    Além da flag, guarda ações de aborto (por exemplo, fechar a resposta HTTP em andamento) que
+    são executadas em `cancelar()`, interrompendo uma leitura bloqueada na rede.
+    """
+
+    def __init__(self):
+        self.geracao = None
+        self._evento = threading.Event()
+        self._acoes = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelado(self):
+        return self._evento.is_set()
+
+    def cancelar(self):
+        with self._lock:
+            self._evento.set()
+            acoes, self._acoes = self._acoes, []
+        for acao in acoes:
+            try:
+                acao()
+            except Exception:
+                pass
+
+    def ao_cancelar(self, acao):
+        """Registra `acao` para ser chamada no cancelamento; se já estiver cancelado, chama na hora."""
+        with self._lock:
+            if not self._evento.is_set():
+                self._acoes.append(acao)
+                return
+        acao()
+
+    def remover(self, acao):
+        with self._lock:
+            if acao in self._acoes:
+                self._acoes.remove(acao)
+
+    def verificar(self):
+        """Levanta `BuscaCancelada` se o token já foi cancelado."""
+        if self._evento.is_set():
+            raise BuscaCancelada()
+
+    def esperar(self, segundos: float):
+        """Dorme até `segundos`, acordando (com `BuscaCancelada`) assim que o token for cancelado."""
+        if self._evento.wait(segundos):
+            raise BuscaCancelada()
+
+
+class AgendadorBuscas:
+    """Executa buscas num pool fixo de workers, onde só a busca mais recente importa.
+
+    Cada `submeter()` cancela a busca anterior (inclusive o download em andamento) e gera uma nova
+    geração; o resultado de uma geração antiga nunca chega ao `ao_concluir`.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="busca")
+        self._lock = threading.Lock()
+        self._geracao = 0
+        self._token = None
+
+    @property
+    def geracao(self):
+        return self._geracao
+
+    def eh_atual(self, geracao: int):
+        return geracao == self._geracao
+
+    def submeter(self, funcao, ao_concluir):
+        """Agenda `funcao(token)` e chama `ao_concluir(geracao, futuro)` na thread do worker, se ela ainda for a atual."""
+        with self._lock:
+            if self._token:
+                self._token.cancelar()
+            self._geracao += 1
+            geracao = self._geracao
+            token = self._token = TokenCancelamento()
+            token.geracao = geracao
+
+        def concluir(futuro):
+            if self.eh_atual(geracao) and not token.cancelado:
+                ao_concluir(geracao, futuro)
+
+        futuro = self._executor.submit(funcao, token)
+        futuro.add_done_callback(concluir)
+        return geracao
+
+    def cancelar(self):
+        with self._lock:
+            if self._token:
+                self._token.cancelar()
+            self._geracao += 1
+
+    def encerrar(self):
+        self.cancelar()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,80 @@
+# tema.py
+import logging
+import os
+import threading
+
+from PIL import Image, ImageDraw
+
+from image_cache import DIRETORIO_CACHE
+
+logger = logging.getLogger(__name__)
+
+# --- Constantes de Estilo Modernas ---
+BG_COLOR = "#0a0e13"
+SECONDARY_BG = "#1e2328"
+CARD_BG = "#1a1e22"
+ACCENT_COLOR = "#c89b3c"
+SECONDARY_ACCENT = "#463714"
+TEXT_COLOR = "#f0e6d2"
+SECONDARY_TEXT = "#a09b8c"
+SUCCESS_COLOR = "#103c3c"
+ERROR_COLOR = "#3c1518"
+FONT_FAMILY = "Segoe UI"
+
+# --- Assets pré-renderizados do tema ---
+# Gerados uma vez com PIL e guardados em memória e em disco (cache/tema), com nomes que incluem
+# as cores e a geometria: mudar o tema ou o tamanho da janela gera um arquivo novo.
+DIRETORIO_ASSETS = os.path.join(DIRETORIO_CACHE, "tema")
+
+_assets = {}
+_lock_assets = threading.Lock()
+
+def _asset(nome_arquivo: str, gerar):
+    with _lock_assets:
+        imagem = _assets.get(nome_arquivo)
+    if imagem is not None:
+        return imagem
+    caminho = os.path.join(DIRETORIO_ASSETS, nome_arquivo)
+    try:
+        with Image.open(caminho) as arquivo:
+            imagem = arquivo.copy()
+    except (OSError, ValueError):
+        imagem = gerar()
+        try:
+            os.makedirs(DIRETORIO_ASSETS, exist_ok=True)
+            imagem.save(caminho)
+        except OSError as e:
+            logger.warning("Não foi possível salvar o asset '%s': %s", nome_arquivo, e)
+    with _lock_assets:
+        _assets[nome_arquivo] = imagem
+    return imagem
+
+def _rgb(cor: str):
+    cor = cor.lstrip('#')
+    return tuple(int(cor[i:i + 2], 16) for i in (0, 2, 4))
+
+def gradiente_vertical(largura: int, altura: int, cor_topo: str = BG_COLOR, cor_base: str = SECONDARY_BG):
+    """Imagem RGB com o degradê vertical do fundo, linha a linha igual ao desenho antigo no canvas."""
+    def gerar():
+        # Mesma interpolação de antes, feita sobre os valores de 16 bits que o Tk devolve (c * 257)
+        (r1, g1, b1), (r2, g2, b2) = ((c * 257 for c in _rgb(cor)) for cor in (cor_topo, cor_base))
+        coluna = bytearray()
+        for i in range(altura):
+            coluna += bytes((
+                (r1 * (altura - i) + r2 * i) // (altura * 256),
+                (g1 * (altura - i) + g2 * i) // (altura * 256),
+                (b1 * (altura - i) + b2 * i) // (altura * 256),
+            ))
+        return Image.frombytes("RGB", (1, altura), bytes(coluna)).resize((largura, altura), Image.Resampling.NEAREST)
+
+    nome = f"gradiente_{largura}x{altura}_{cor_topo.lstrip('#')}_{cor_base.lstrip('#')}.png"
+    return _asset(nome, gerar)
+
+def mascara_circular(size: int):
+    """Máscara (modo L) com o círculo usado para arredondar ícones do tamanho `size`."""
+    def gerar():
+        mask = Image.new("L", (size, size), 0)
+        ImageDraw.Draw(mask).ellipse((0, 0, size, size), fill=255)
+        return mask
+
+    return _asset(f"mascara_{size}.png", gerar)
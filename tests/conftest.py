@@ -0,0 +1,32 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+# Caches, histórico e regiões lembradas dos testes ficam num diretório temporário
+if "LOL_CACHE_DIR" not in os.environ:
+    os.environ["LOL_CACHE_DIR"] = tempfile.mkdtemp(prefix="lol-testes-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from benchmarks.servidor_local import ServidorLocal
+
+@pytest.fixture(autouse=True)
+def _estado_http_limpo():
+    """Disjuntores e baldes de um teste não vazam para o seguinte."""
+    import http_client
+
+    http_client._hosts.clear()
+    yield
+    http_client._hosts.clear()
+
+@pytest.fixture
+def servidor(monkeypatch):
+    """Servidor local com o scraper apontando para ele."""
+    import scraper
+
+    with ServidorLocal() as srv:
+        monkeypatch.setattr(scraper, "URL_BASE", srv.url)
+        monkeypatch.setattr(scraper, "URL_ICONES_CAMPEOES", srv.url + "/icones")
+        yield srv
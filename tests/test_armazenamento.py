@@ -0,0 +1,66 @@
+# tests/test_armazenamento.py
+import json
+import os
+
+import pytest
+
+import armazenamento
+from armazenamento import completar_ultima_linha, gravar_bytes_atomico, gravar_json_atomico, normalizar_chave, normalizar_nome
+from historico import _chave
+from regioes import MemoriaRegioes
+
+
+@pytest.mark.parametrize("nome", ["Faker#KR1", "faker#kr1", "  Faker #KR1 ", "FAKER# kr1", "Faker#kr1\n"])
+def test_formas_equivalentes_do_mesmo_nome(nome):
+    assert normalizar_nome(nome) == "faker#kr1"
+    assert normalizar_chave(nome, " KR ") == "faker#kr1@kr"
+    # O histórico usa a mesma normalização, com a região numa coluna separada
+    assert _chave(nome, "KR") == ("faker#kr1", "kr")
+
+def test_nomes_diferentes_continuam_diferentes():
+    assert normalizar_nome("Faker") == "faker#"
+    assert normalizar_nome("Fa ker#KR1") == "fa ker#kr1" != normalizar_nome("Faker#KR1")
+    assert normalizar_nome("Faker#KR1#2") == "faker#kr1#2"
+
+def test_memoria_de_regioes_usa_a_chave_normalizada(tmp_path):
+    memoria = MemoriaRegioes(str(tmp_path / "regioes.json"))
+    memoria.lembrar("Faker#KR1", "kr")
+
+    assert MemoriaRegioes(memoria.caminho).obter(" faker#kr1 ") == "kr"
+
+def test_gravacao_atomica_substitui_o_arquivo_inteiro(tmp_path):
+    caminho = str(tmp_path / "sub" / "estado.json")
+    gravar_json_atomico(caminho, {"versao": 1})
+    gravar_json_atomico(caminho, {"versao": 2, "nome": "Ñuñez"}, sincronizar=True)
+
+    with open(caminho, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {"versao": 2, "nome": "Ñuñez"}
+    assert os.listdir(tmp_path / "sub") == ["estado.json"]
+
+def test_falha_na_gravacao_mantem_a_versao_anterior(tmp_path, monkeypatch):
+    caminho = str(tmp_path / "dados.bin")
+    gravar_bytes_atomico(caminho, b"antigo")
+
+    def falhar(origem, destino):
+        raise OSError("disco cheio")
+    monkeypatch.setattr(armazenamento.os, "replace", falhar)
+    with pytest.raises(OSError):
+        gravar_bytes_atomico(caminho, b"novo")
+    with pytest.raises(TypeError):
+        gravar_json_atomico(caminho, {"nao serializavel": object()})
+    monkeypatch.undo()
+
+    with open(caminho, 'rb') as f:
+        assert f.read() == b"antigo"
+    assert os.listdir(tmp_path) == ["dados.bin"]
+
+def test_completar_ultima_linha(tmp_path):
+    caminho = str(tmp_path / "linhas.ndjson")
+    assert completar_ultima_linha(caminho) is False
+    with open(caminho, 'wb') as f:
+        f.write(b'{"a": 1}\n{"b": ')
+
+    assert completar_ultima_linha(caminho) is True
+    assert completar_ultima_linha(caminho) is True
+    with open(caminho, 'rb') as f:
+        assert f.read() == b'{"a": 1}\n{"b": \n'
@@ -0,0 +1,95 @@
+# tests/test_crawler.py
+import json
+import time
+
+import batch
+import crawler
+from crawler import MAX_TENTATIVAS, Crawler
+
+TOTAL_LADDER = 3 * 100  # paginas_ladder padrão do servidor local x jogadores por página
+
+
+def _nomes_gravados(caminho):
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return [json.loads(linha)["invocador"] for linha in f if linha.strip()]
+
+def _rodar(caminho, **kwargs):
+    return Crawler("br", caminho, max_workers=4, **kwargs).executar()
+
+
+def test_limite_de_perfis_e_continuacao(servidor, tmp_path):
+    saida = str(tmp_path / "ranking.ndjson")
+
+    _rodar(saida, max_perfis=30)
+    assert len(_nomes_gravados(saida)) == 30
+
+    # A página cortada pelo limite é lida de novo: as posições 30-99 não ficam para trás
+    _rodar(saida, max_paginas=1)
+    nomes = _nomes_gravados(saida)
+    assert len(nomes) == len(set(nomes)) == 100
+    assert {n.lower() for n in nomes} == {f"jogador{i}#br1" for i in range(100)}
+
+    _rodar(saida)
+    nomes = _nomes_gravados(saida)
+    assert len(nomes) == len(set(nomes)) == TOTAL_LADDER
+
+def test_interrupcao_cancela_o_resto_e_continua(servidor, tmp_path):
+    servidor.latencia = 0.02
+    saida = str(tmp_path / "ranking.ndjson")
+    concluidos = []
+
+    def interromper(nome, dados):
+        concluidos.append(nome)
+        if len(concluidos) == 5:
+            raise KeyboardInterrupt
+
+    crawler_interrompido = Crawler("br", saida, max_workers=2)
+    inicio = time.monotonic()
+    try:
+        crawler_interrompido.executar(ao_concluir=interromper)
+    except KeyboardInterrupt:
+        crawler_interrompido.checkpoint.salvar()
+    else:
+        raise AssertionError("a interrupção não chegou a quem chamou")
+    # As buscas que ainda estavam na fila foram canceladas, em vez de esperar a página inteira
+    assert time.monotonic() - inicio < 100 * servidor.latencia / 2
+    # Só as buscas que já estavam em andamento podiam terminar, e nada é gravado depois da interrupção
+    gravados = len(_nomes_gravados(saida))
+    assert 5 <= gravados <= 5 + crawler_interrompido.max_workers
+    time.sleep(0.2)
+    assert len(_nomes_gravados(saida)) == gravados
+
+    servidor.latencia = 0.0
+    _rodar(saida)
+    nomes = _nomes_gravados(saida)
+    assert len(nomes) == len(set(nomes)) == TOTAL_LADDER
+
+def test_falhas_sao_tentadas_de_novo(servidor, tmp_path, monkeypatch):
+    saida = str(tmp_path / "ranking.ndjson")
+    buscar = batch.obter_dados_summoner
+    falhando = {"jogador3#br1", "jogador7#br1"}
+
+    def buscar_com_falhas(nome, regiao, ids):
+        if nome.lower() in falhando:
+            return {"erro": "Erro de conexão: 429 Too Many Requests"}
+        return buscar(nome, regiao, ids)
+    monkeypatch.setattr(batch, "obter_dados_summoner", buscar_com_falhas)
+
+    estatisticas = _rodar(saida, max_paginas=1)
+    assert estatisticas["erros"] == 2
+    nomes = {n.lower() for n in _nomes_gravados(saida)}
+    assert len(nomes) == 98 and not nomes & falhando
+
+    falhando.discard("jogador3#br1")
+    _rodar(saida, max_paginas=1)
+    nomes = {n.lower() for n in _nomes_gravados(saida)}
+    assert "jogador3#br1" in nomes and "jogador7#br1" not in nomes
+    assert len(nomes) == 199
+
+    # Depois de MAX_TENTATIVAS, o invocador fica no checkpoint mas não é mais buscado
+    for _ in range(MAX_TENTATIVAS):
+        estatisticas = _rodar(saida, max_paginas=1)
+    assert estatisticas["erros"] == 0
+    checkpoint = crawler.Checkpoint(saida + ".checkpoint.json", "br")
+    assert checkpoint.falhas["jogador7#br1"][1] == MAX_TENTATIVAS
+    assert "jogador7#br1" not in checkpoint.concluidos
@@ -0,0 +1,109 @@
+# tests/test_exportacao.py
+import csv
+import gzip
+import json
+import os
+import zlib
+
+import exportacao
+import scraper
+from exportacao import COLUNAS, Exportador, linhas_perfil
+
+
+class _Relogio:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self):
+        return self.agora
+
+
+def _ler_csv(caminho):
+    with open(caminho, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+def test_linhas_perfil_achata_as_tabelas(servidor):
+    dados = scraper.obter_dados_summoner("Jogador1#BR1", "br", {})
+
+    linhas = linhas_perfil("Jogador1#BR1", "br", dados, buscado_em=1.0)
+
+    assert linhas["perfis"] == [("Jogador1#BR1", "br", 1.0, None, "Gold II", 123, 52.3, 12345, 5.2, 4.1, 7.3,
+                                 dados["icone_url"])]
+    assert linhas["campeoes"][0] == ("Jogador1#BR1", "br", 1, "Kai'Sa", 55.0, 40, 1234)
+    assert [linha[2] for linha in linhas["campeoes"]] == list(range(1, len(dados["campeoes"]) + 1))
+    assert linhas["rotas"][0] == ("Jogador1#BR1", "br", "Top", 25, 47.0)
+    assert len(linhas["pontos_rank"]) == len(dados["graph_data"])
+    assert all(len(linha) == len(COLUNAS[tabela]) for tabela, tabela_linhas in linhas.items() for linha in tabela_linhas)
+
+def test_linhas_de_erro_so_em_perfis():
+    linhas = linhas_perfil("x#br1", "br", {"erro": "404"}, buscado_em=2.0)
+
+    assert linhas["perfis"] == [("x#br1", "br", 2.0, "404") + (None,) * 8]
+    assert linhas["campeoes"] == linhas["rotas"] == linhas["pontos_rank"] == []
+
+def test_csv_com_cabecalho_so_no_arquivo_novo_e_linha_cortada(tmp_path):
+    with Exportador(str(tmp_path), ("csv",), tabelas=("perfis",)) as exportador:
+        exportador.gravar("a#br1", "br", {"erro": "um"}, 1.0)
+    caminho = str(tmp_path / "perfis.csv")
+    with open(caminho, 'a', encoding='utf-8') as f:
+        f.write("b#br1,br,2.0,cor")  # Interrompido no meio da linha
+
+    with Exportador(str(tmp_path), ("csv",), tabelas=("perfis",)) as exportador:
+        exportador.gravar("c#br1", "br", {"erro": "tres"}, 3.0)
+
+    linhas = _ler_csv(caminho)
+    assert linhas[0] == list(COLUNAS["perfis"])
+    assert [linha[0] for linha in linhas[1:]] == ["a#br1", "b#br1", "c#br1"]
+    assert linhas[3][3] == "tres" and len(linhas[3]) == len(COLUNAS["perfis"])
+
+def test_ndjson_acrescenta_depois_de_linha_cortada(tmp_path):
+    with Exportador(str(tmp_path), tabelas=("perfis",)) as exportador:
+        exportador.gravar("a#br1", "br", {"erro": "um"}, 1.0)
+    caminho = str(tmp_path / "perfis.ndjson")
+    with open(caminho, 'a', encoding='utf-8') as f:
+        f.write('{"invocador": "b#b')
+
+    with Exportador(str(tmp_path), tabelas=("perfis",)) as exportador:
+        exportador.gravar("c#br1", "br", {"erro": "tres"}, 3.0)
+
+    with open(caminho, 'r', encoding='utf-8') as f:
+        linhas = f.read().splitlines()
+    assert len(linhas) == 3
+    assert json.loads(linhas[2])["invocador"] == "c#br1"
+
+def test_descarrega_a_cada_intervalo(tmp_path, monkeypatch):
+    relogio = _Relogio()
+    monkeypatch.setattr(exportacao.time, "monotonic", relogio)
+    caminho = str(tmp_path / "perfis.ndjson")
+    exportador = Exportador(str(tmp_path), intervalo_flush=5.0, tabelas=("perfis",))
+    try:
+        exportador.gravar("a#br1", "br", {"erro": "um"}, 1.0)
+        relogio.agora += 4.0
+        exportador.gravar("b#br1", "br", {"erro": "dois"}, 2.0)
+        assert os.path.getsize(caminho) == 0
+
+        relogio.agora += 1.0
+        exportador.gravar("c#br1", "br", {"erro": "tres"}, 3.0)
+        with open(caminho, 'r', encoding='utf-8') as f:
+            assert len(f.read().splitlines()) == 3
+        assert exportador.perfis == exportador.erros == 3
+    finally:
+        exportador.fechar()
+
+def test_gzip_grava_uma_parte_nova_por_execucao(tmp_path):
+    interrompido = Exportador(str(tmp_path), ("ndjson", "csv"), comprimir=True, tabelas=("perfis",))
+    interrompido.gravar("a#br1", "br", {"erro": "um"}, 1.0)
+    interrompido.flush()
+    # Cópia do que estava no disco quando o processo morreu: descarregado, mas sem o final do gzip
+    with open(tmp_path / "perfis.ndjson.part1.gz", 'rb') as f:
+        cortado = f.read()
+
+    with Exportador(str(tmp_path), ("ndjson", "csv"), comprimir=True, tabelas=("perfis",)) as exportador:
+        exportador.gravar("b#br1", "br", {"erro": "dois"}, 2.0)
+    interrompido.fechar()
+
+    with gzip.open(tmp_path / "perfis.ndjson.part2.gz", 'rt', encoding='utf-8') as f:
+        assert [json.loads(linha)["invocador"] for linha in f] == ["b#br1"]
+    with gzip.open(tmp_path / "perfis.csv.part2.gz", 'rt', encoding='utf-8', newline='') as f:
+        assert next(csv.reader(f)) == list(COLUNAS["perfis"])
+    assert json.loads(zlib.decompressobj(31).decompress(cortado))["invocador"] == "a#br1"
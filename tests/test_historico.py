@@ -0,0 +1,93 @@
+# tests/test_historico.py
+import json
+import sqlite3
+
+from batch import obter_dados_em_lote
+from historico import Historico
+
+
+def _dados(elo="Gold II", vitorias="123", pontos=((1000, 1.0), (2000, 2.0)), **extras):
+    dados = {"elo": elo, "vitorias": vitorias, "graph_data": [list(p) for p in pontos], "timings": {"total": 5}}
+    dados.update(extras)
+    return dados
+
+def _deltas(historico):
+    return [json.loads(delta) for delta, in historico._conexao.execute("SELECT delta FROM snapshots ORDER BY id")]
+
+def _total_pontos(historico):
+    return historico._conexao.execute("SELECT COUNT(*) FROM pontos_rank").fetchone()[0]
+
+
+def test_registrar_grava_so_o_que_mudou():
+    historico = Historico(":memory:")
+
+    historico.registrar("Nome#BR1", "br", _dados(kda="5 / 4 / 7"), ts=10)
+    historico.registrar(" nome#br1 ", "BR", _dados(kda="5 / 4 / 7"), ts=20)
+    historico.registrar("Nome#BR1", "br", _dados(elo="Gold I", pontos=((1000, 1.0), (2000, 2.0), (3000, 3.0))), ts=30)
+
+    assert _deltas(historico) == [
+        {"elo": "Gold II", "vitorias": "123", "kda": "5 / 4 / 7"},
+        {},
+        {"elo": "Gold I", "_removidos": ["kda"]},
+    ]
+    # Pontos repetidos não são gravados de novo
+    assert _total_pontos(historico) == 3
+    assert historico.registrar("Nome#BR1", "br", {"erro": "404"}) is None
+    assert len(_deltas(historico)) == 3
+
+def test_consultar_reconstroi_o_estado_no_intervalo():
+    historico = Historico(":memory:")
+    historico.registrar("Nome#BR1", "br", _dados(kda="5 / 4 / 7"), ts=10)
+    historico.registrar("Nome#BR1", "br", _dados(vitorias="130", pontos=((1000, 1.0), (2000, 2.0), (3000, 3.0))), ts=20)
+    historico.registrar("Nome#BR1", "br", _dados(elo="Gold I", vitorias="140", pontos=((4000, 4.0),)), ts=30)
+
+    resultado = historico.consultar("nome#br1", "br", inicio=15, fim=25)
+
+    # O delta da busca de ts=10 (antes do intervalo) entra na reconstrução da de ts=20
+    assert resultado == [(20, {"elo": "Gold II", "vitorias": "130",
+                               "graph_data": [[1000, 1.0], [2000, 2.0], [3000, 3.0]]})]
+    assert [ts for ts, _ in historico.consultar("Nome#BR1", "br", inicio=20)] == [20, 30]
+    assert [ts for ts, _ in historico.consultar("Nome#BR1", "br", fim=10)] == [10]
+    assert historico.consultar("Nome#BR1", "br", inicio=31) == []
+    assert historico.consultar("Outro#BR1", "br") == []
+
+def test_consultar_graficos_de_cada_busca():
+    historico = Historico(":memory:")
+    historico.registrar("Nome#BR1", "br", _dados(pontos=((2000, 2.0),)), ts=10)
+    historico.registrar("Nome#BR1", "br", _dados(pontos=((2000, 2.0),)), ts=20)
+    historico.registrar("Nome#BR1", "br", _dados(pontos=((1000, 1.0), (3000, 3.0))), ts=30)
+
+    somente_ultimo = historico.consultar("Nome#BR1", "br")
+    assert [("graph_data" in dados) for _, dados in somente_ultimo] == [False, False, True]
+    assert somente_ultimo[-1][1]["graph_data"] == [[1000, 1.0], [2000, 2.0], [3000, 3.0]]
+
+    todos = historico.consultar("Nome#BR1", "br", todos_os_graficos=True)
+    assert [dados["graph_data"] for _, dados in todos] == [
+        [[2000, 2.0]],
+        [[2000, 2.0]],
+        [[1000, 1.0], [2000, 2.0], [3000, 3.0]],
+    ]
+    assert historico.consultar("Nome#BR1", "br", fim=20)[-1][1]["graph_data"] == [[2000, 2.0]]
+    assert "graph_data" not in historico.consultar("Nome#BR1", "br", com_graficos=False)[-1][1]
+
+def test_ultimo_junta_estado_e_pontos():
+    historico = Historico(":memory:")
+    historico.registrar("Nome#BR1", "br", _dados(), ts=10)
+
+    ts, dados = historico.ultimo("NOME#BR1", "br")
+
+    assert ts == 10
+    assert dados == {"elo": "Gold II", "vitorias": "123", "graph_data": [[1000, 1.0], [2000, 2.0]]}
+    assert historico.ultimo("Outro#BR1", "br") is None
+
+
+class _HistoricoTravado:
+    def registrar(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+
+def test_falha_no_historico_nao_derruba_o_lote(servidor):
+    entradas = [(f"Jogador{i}#BR1", "br") for i in range(4)]
+
+    resultados = obter_dados_em_lote(entradas, historico=_HistoricoTravado())
+
+    assert len(resultados) == 4 and all("erro" not in dados for dados in resultados)
@@ -0,0 +1,78 @@
+# tests/test_http_client.py
+import threading
+
+import pytest
+import requests
+
+import http_client
+
+
+class RespostaFalsa:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+
+    def close(self):
+        pass
+
+
+class SessaoFalsa:
+    def __init__(self, erro=None):
+        self.erro = erro
+
+    def get(self, url, **kwargs):
+        if self.erro is not None:
+            raise self.erro
+        return RespostaFalsa()
+
+
+@pytest.fixture
+def sessao(monkeypatch):
+    falsa = SessaoFalsa()
+    monkeypatch.setattr(http_client, "obter_sessao", lambda: falsa)
+    return falsa
+
+
+@pytest.mark.parametrize("erro", [requests.exceptions.TooManyRedirects("loop"),
+                                  requests.exceptions.ChunkedEncodingError("corpo cortado"),
+                                  requests.exceptions.ContentDecodingError("gzip inválido")])
+def test_erro_nao_repetivel_no_meio_aberto_nao_trava_o_disjuntor(sessao, erro):
+    estado = http_client._estado_host("exemplo.test")
+    estado.disjuntor = http_client.Disjuntor(limite=1, tempo_aberto=0)
+    estado.disjuntor.falha()
+    assert estado.disjuntor.estado == "meio_aberto"
+
+    sessao.erro = erro
+    with pytest.raises(type(erro)):
+        http_client.get("http://exemplo.test/", tentativas=1)
+
+    # A requisição de teste terminou; a próxima é liberada de novo e fecha o disjuntor
+    sessao.erro = None
+    assert http_client.get("http://exemplo.test/").status_code == 200
+    assert estado.disjuntor.estado == "fechado"
+
+def test_interrupcao_devolve_a_vaga_de_teste(sessao):
+    estado = http_client._estado_host("exemplo.test")
+    estado.disjuntor = http_client.Disjuntor(limite=1, tempo_aberto=0)
+    estado.disjuntor.falha()
+
+    sessao.erro = KeyboardInterrupt()
+    with pytest.raises(KeyboardInterrupt):
+        http_client.get("http://exemplo.test/")
+    assert estado.disjuntor.permitir()
+
+def test_tentativas_invalidas(sessao):
+    with pytest.raises(ValueError):
+        http_client.get("http://exemplo.test/", tentativas=0)
+
+def test_contadores_com_varias_threads(sessao):
+    def buscar():
+        for _ in range(200):
+            http_client.get("http://exemplo.test/")
+
+    threads = [threading.Thread(target=buscar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert http_client.estatisticas_hosts()["exemplo.test"]["requisicoes"] == 1600
@@ -0,0 +1,96 @@
+# tests/test_image_cache.py
+import os
+
+import armazenamento
+import image_cache
+from image_cache import CacheDisco, CacheImagens, CacheMemoriaLRU
+
+
+def test_lru_descarta_o_menos_usado():
+    cache = CacheMemoriaLRU(capacidade=2)
+    cache.salvar("a", 1)
+    cache.salvar("b", 2)
+    assert cache.obter("a") == 1
+    cache.salvar("c", 3)
+
+    assert cache.obter("b") is None
+    assert (cache.obter("a"), cache.obter("c")) == (1, 3)
+    assert (cache.acertos, cache.faltas, len(cache)) == (3, 1, 2)
+
+def test_disco_guarda_conteudo_e_validadores(tmp_path):
+    disco = CacheDisco(str(tmp_path))
+    assert disco.ler("http://x/a.png") is None
+
+    disco.salvar("http://x/a.png", b"abc", etag='"v1"', last_modified="ontem")
+    conteudo, meta = disco.ler("http://x/a.png")
+
+    assert conteudo == b"abc"
+    assert (meta["etag"], meta["last_modified"], meta["url"]) == ('"v1"', "ontem", "http://x/a.png")
+    assert (disco.acertos, disco.faltas) == (1, 1)
+
+def test_disco_remove_os_acessados_ha_mais_tempo(tmp_path, monkeypatch):
+    disco = CacheDisco(str(tmp_path), limite_bytes=250)
+    for i, url in enumerate(("http://x/velho", "http://x/meio", "http://x/novo")):
+        disco.salvar(url, bytes(100) if i < 2 else bytes(50))
+        caminho_bin, _ = disco._caminhos(url)
+        os.utime(caminho_bin, (1000 + i, 1000 + i))
+    # Só a primeira gravação precisou varrer o diretório
+    varreduras = []
+    varrer = disco._varrer
+    monkeypatch.setattr(disco, "_varrer", lambda: varreduras.append(1) or varrer())
+    disco.salvar("http://x/meio", bytes(90))
+    assert varreduras == [] and disco.tamanho_total() == 240
+
+    disco.salvar("http://x/outro", bytes(50))
+
+    assert varreduras == [1]
+    assert disco.ler("http://x/velho") is None
+    assert disco.ler("http://x/novo") is not None and disco.ler("http://x/outro") is not None
+    assert disco.tamanho_total() == 190 == sum(os.path.getsize(p) for p in tmp_path.glob("*.bin"))
+
+def test_gravacao_interrompida_mantem_o_par_anterior(tmp_path, monkeypatch):
+    disco = CacheDisco(str(tmp_path))
+    disco.salvar("http://x/a.png", b"v1" * 100, etag='"v1"')
+
+    def falhar(origem, destino):
+        raise OSError("disco cheio")
+    monkeypatch.setattr(armazenamento.os, "replace", falhar)
+    disco.salvar("http://x/a.png", b"v2" * 100, etag='"v2"')
+    monkeypatch.undo()
+
+    conteudo, meta = disco.ler("http://x/a.png")
+    assert (conteudo, meta["etag"]) == (b"v1" * 100, '"v1"')
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in disco._caminhos("http://x/a.png"))
+
+def test_imagens_revalidam_com_etag(servidor, tmp_path):
+    processadas = []
+
+    def processar(conteudo, tamanho):
+        processadas.append(tamanho)
+        return (len(conteudo), tamanho)
+
+    cache = CacheImagens(processar, CacheMemoriaLRU(), CacheDisco(str(tmp_path)), max_idade=0)
+    url = servidor.url + "/icones/perfil.png"
+
+    assert cache.obter(url, 48) == (len(servidor.icone), 48)
+    assert cache.obter(url, 48) == (len(servidor.icone), 48)
+    assert processadas == [48]
+    assert cache.downloads == 1
+
+    # Cópia em disco vencida (max_idade=0): o servidor responde 304 ao If-None-Match
+    _, meta_antes = cache.disco.ler(url)
+    assert cache.obter_bytes(url) == servidor.icone
+    _, meta_depois = cache.disco.ler(url)
+    assert (cache.downloads, cache.revalidacoes) == (1, 1)
+    assert meta_depois["etag"] == servidor.etag_icone
+    assert meta_depois["validado_em"] >= meta_antes["validado_em"]
+
+def test_cache_dentro_do_prazo_nao_usa_a_rede(servidor, tmp_path):
+    cache = CacheImagens(lambda conteudo, tamanho: conteudo, CacheMemoriaLRU(), CacheDisco(str(tmp_path)))
+    url = servidor.url + "/icones/perfil.png"
+    cache.obter_bytes(url)
+    requisicoes = servidor.requisicoes
+
+    assert cache.obter_bytes(url) == servidor.icone
+    assert servidor.requisicoes == requisicoes
+    assert image_cache.CacheDisco(str(tmp_path)).tamanho_total() == len(servidor.icone)
@@ -0,0 +1,68 @@
+# tests/test_modelos.py
+import io
+import json
+
+import scraper
+from batch import obter_dados_em_lote
+from cli import escrever_json
+from modelos import Perfil
+
+DESCRICAO = ("Gold II - Wins: 123 (52.30%) / Rank: (#1234) / Kai'Sa: Wins: 55% - Played: 040 (#1234) / "
+             "Nunu & Willump: Wins: 48.1% - Played: 12 (#9,876)")
+
+def _secoes(descricao=DESCRICAO, imagem=""):
+    return {"tabela_roles": "sem_container", "roles": [], "kda": ("5.2", "4.1", "7.3"),
+            "texto_scripts": "", "descricao": descricao, "imagem": imagem}
+
+def test_dict_mantem_os_textos_da_pagina():
+    dados = scraper.montar_dados(_secoes(), {})
+
+    assert dados == {
+        "campeoes": [
+            {"nome": "Kai'Sa", "winrate": "55", "partidas": "040", "ranking": "1234", "icon_url": None},
+            {"nome": "Nunu & Willump", "winrate": "48.1", "partidas": "12", "ranking": "9,876", "icon_url": None},
+        ],
+        "graph_data": None,
+        "rank_map": None,
+        "kda_medio": "5.2 / 4.1 / 7.3   (3.05 KDA)",
+        "roles_data": [],
+        "elo": "Gold II",
+        "vitorias": "123",
+        "winrate": "52.30",
+        "ranking": "1234",
+    }
+
+def test_textos_so_guardados_quando_a_formatacao_nao_reproduz():
+    perfil = scraper.montar_perfil(_secoes(), {})
+
+    assert perfil.textos == (None, "52.30", "1234")
+    assert perfil.campeoes[0].textos == ("55", "040", "1234")
+    assert perfil.campeoes[1].textos is None
+    assert (perfil.winrate, perfil.ranking, perfil.campeoes[0].partidas) == (52.3, 1234, 40)
+
+def test_imagem_com_barra_dupla_vira_https():
+    assert scraper.montar_dados(_secoes(imagem="//cdn/x.png"), {})["icone_url"] == "https://cdn/x.png"
+
+def test_serializacoes_preservam_o_dict(servidor):
+    dados = scraper.extrair_dados_html(servidor.pagina("perfil.html").decode("utf-8"), {})
+    for base in (dados, scraper.montar_dados(_secoes(), {})):
+        perfil = Perfil.de_dict(base)
+        assert perfil.para_dict() == base
+        assert Perfil.de_bytes(perfil.para_bytes()).para_dict() == base
+        assert Perfil.de_json(perfil.para_json()).para_dict() == base
+
+def test_lote_como_perfil_e_saida_json(servidor):
+    entradas = [(f"Jogador{i}#BR1", "br") for i in range(3)] + [("Inexistente#BR1", "br")]
+
+    dicionarios = obter_dados_em_lote(entradas)
+    perfis = obter_dados_em_lote(entradas, como_perfil=True)
+
+    assert all(isinstance(perfil, Perfil) for perfil in perfis[:3]) and "erro" in perfis[3]
+    assert [p.para_dict() if isinstance(p, Perfil) else p for p in perfis] == dicionarios
+    saida = io.StringIO()
+    escrever_json(saida, entradas, perfis)
+    esperado = [{"invocador": nome, "regiao": regiao, "dados": dados} for (nome, regiao), dados in zip(entradas, dicionarios)]
+    assert saida.getvalue() == json.dumps(esperado, ensure_ascii=False, indent=2)
+    vazio = io.StringIO()
+    escrever_json(vazio, [], [])
+    assert vazio.getvalue() == json.dumps([], indent=2)
@@ -0,0 +1,84 @@
+# tests/test_parsers.py
+import pytest
+
+import scraper
+from parsers import BACKENDS, LXML_DISPONIVEL, ExtratorIncremental, extrair_secoes
+
+NOME_ACENTUADO = "Kai’Sa Ñuñez"
+
+PAGINA_ACENTUADA = (
+    '<html><head><meta name="twitter:description" content="Ouro: ' + NOME_ACENTUADO + '"></head><body>'
+    '<div data-tab-id="championsData-soloqueue"><table><tr><th>Rota</th></tr>'
+    '<tr><td><div class="txt name">' + NOME_ACENTUADO + '</div></td>'
+    '<td data-sort-value="10"></td><td data-sort-value="0.5"></td></tr></table></div></body></html>'
+)
+
+# Depois das seções: o que o streaming não precisa baixar
+RODAPE = "<div>" + "rodapé " * 40000 + "</div>"
+
+def _backends_disponiveis():
+    return [nome for nome in BACKENDS if nome != "lxml" or LXML_DISPONIVEL]
+
+@pytest.mark.parametrize("backend", _backends_disponiveis())
+def test_nomes_nao_ascii_sem_meta_charset(backend):
+    secoes = BACKENDS[backend](PAGINA_ACENTUADA)
+    assert secoes["descricao"] == "Ouro: " + NOME_ACENTUADO
+    assert secoes["roles"] == [(NOME_ACENTUADO, "10", "0.5")]
+
+@pytest.mark.parametrize("backend", _backends_disponiveis())
+def test_perfil_com_campeao_acentuado(servidor, monkeypatch, backend):
+    # Página real sem <meta charset>, com um nome fora do ASCII na descrição
+    corpo = servidor.pagina("perfil.html").decode("utf-8")
+    corpo = corpo.replace('<meta charset="utf-8">', "").replace("Kai'Sa", NOME_ACENTUADO)
+    servidor.adicionar_rota("/acentos/summoner/", lambda srv, caminho: (200, "text/html; charset=utf-8", corpo.encode("utf-8")))
+    monkeypatch.setattr(scraper, "URL_BASE", servidor.url + "/acentos")
+
+    dados = scraper.obter_dados_summoner("Teste#BR1", "br", {}, backend=backend, streaming=False)
+
+    assert "erro" not in dados
+    assert dados["campeoes"][0]["nome"] == NOME_ACENTUADO
+
+@pytest.mark.parametrize("tamanho_bloco", [1, 7, 100, 1000, 5000])
+def test_streaming_em_blocos_igual_a_pagina_inteira(servidor, tamanho_bloco):
+    html = servidor.pagina("perfil.html").decode("utf-8")
+    extrator = ExtratorIncremental()
+    for inicio in range(0, len(html), tamanho_bloco):
+        extrator.feed(html[inicio:inicio + tamanho_bloco])
+        if extrator.completo:
+            break
+
+    assert extrator.completo
+    # texto_scripts difere entre backends (só os <script> ou a página toda); o que conta é o resultado
+    assert scraper.montar_dados(extrator.secoes(), {}) == scraper.montar_dados(extrair_secoes(html, "html.parser"), {})
+
+def _servir_com_rodape(servidor, monkeypatch, corpo):
+    servidor.adicionar_rota("/rodape/summoner/", lambda srv, caminho: (200, "text/html; charset=utf-8", corpo.encode("utf-8")))
+    monkeypatch.setattr(scraper, "URL_BASE", servidor.url + "/rodape")
+    lidos = []
+    blocos = scraper._blocos
+
+    def contar(resposta, cancelamento=None):
+        for bloco in blocos(resposta, cancelamento):
+            lidos.append(len(bloco))
+            yield bloco
+    monkeypatch.setattr(scraper, "_blocos", contar)
+    return lidos
+
+def test_streaming_para_quando_as_secoes_aparecem(servidor, monkeypatch):
+    corpo = servidor.pagina("perfil.html").decode("utf-8").replace("</body>", RODAPE + "</body>")
+    lidos = _servir_com_rodape(servidor, monkeypatch, corpo)
+
+    dados = scraper.obter_dados_summoner("Teste#BR1", "br", {}, streaming=True)
+
+    assert sum(lidos) < len(corpo.encode("utf-8")) - len(RODAPE) // 2
+    assert dados == scraper.extrair_dados_html(corpo, {})
+
+def test_streaming_sem_todas_as_secoes_le_a_pagina_inteira(servidor, monkeypatch):
+    # Sem o mapa de ranks o extrator nunca fica completo: a página inteira é extraída como no modo normal
+    corpo = servidor.pagina("perfil.html").decode("utf-8").replace("graphIntegerValues24", "outroMapa") + RODAPE
+    lidos = _servir_com_rodape(servidor, monkeypatch, corpo)
+
+    dados = scraper.obter_dados_summoner("Teste#BR1", "br", {}, streaming=True)
+
+    assert sum(lidos) == len(corpo.encode("utf-8"))
+    assert dados == scraper.extrair_dados_html(corpo, {})
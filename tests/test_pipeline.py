@@ -0,0 +1,66 @@
+# tests/test_pipeline.py
+import os
+import threading
+import time
+
+import pipeline
+from batch import obter_dados_em_lote
+
+
+def _extrair_que_derruba(html, backend=None):
+    # Simula um processo de extração que morre (segfault no parser, OOM killer...)
+    os._exit(1)
+
+
+def _executar_com_limite(funcao, segundos=60):
+    resultado = []
+    thread = threading.Thread(target=lambda: resultado.append(funcao()), daemon=True)
+    thread.start()
+    thread.join(segundos)
+    assert not thread.is_alive(), "a busca em pipeline travou"
+    return resultado[0]
+
+
+def test_pipeline_igual_ao_lote(servidor):
+    entradas = [(f"Jogador{i}#BR1", "br") for i in range(6)] + [("Inexistente#BR1", "br")]
+
+    resultados = _executar_com_limite(lambda: pipeline.obter_dados_em_pipeline(entradas, processos=2))
+
+    assert resultados == obter_dados_em_lote(entradas)
+
+def test_processo_que_morre_nao_trava_o_pipeline(servidor, monkeypatch):
+    monkeypatch.setattr(pipeline, "_extrair", _extrair_que_derruba)
+    entradas = [(f"Jogador{i}#BR1", "br") for i in range(8)]
+    concluidos = []
+
+    resultados = _executar_com_limite(lambda: pipeline.obter_dados_em_pipeline(
+        entradas, processos=1, max_pendentes=1, ao_concluir=lambda *args: concluidos.append(args[0])))
+
+    assert len(resultados) == len(entradas)
+    assert all("erro" in dados for dados in resultados)
+    assert sorted(concluidos) == list(range(len(entradas)))
+
+class _Parar(Exception):
+    pass
+
+def test_interrupcao_cancela_downloads_e_extracoes_pendentes(servidor):
+    servidor.latencia = 0.05
+    entradas = [(f"Jogador{i}#BR1", "br") for i in range(40)]
+
+    def parar(*args):
+        raise _Parar
+
+    def executar():
+        inicio = time.monotonic()
+        try:
+            pipeline.obter_dados_em_pipeline(entradas, max_downloads=2, processos=1, ao_concluir=parar)
+        except _Parar:
+            return time.monotonic() - inicio
+        return None
+
+    duracao = _executar_com_limite(executar)
+
+    # Esperar a fila inteira levaria 40 * 0,05 / 2 = 1 s só de downloads
+    assert duracao is not None and duracao < 0.5
+    time.sleep(0.3)
+    assert servidor.requisicoes < len(entradas) / 2
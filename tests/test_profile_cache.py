@@ -0,0 +1,102 @@
+# tests/test_profile_cache.py
+import threading
+
+from profile_cache import CachePerfis
+
+TTL = 600
+JANELA = 3600
+
+
+class _Relogio:
+    def __init__(self):
+        self.agora = 1_000_000.0
+
+    def __call__(self):
+        return self.agora
+
+
+class _Site:
+    """Busca falsa: cada chamada devolve uma versão nova do perfil (ou o erro configurado)."""
+
+    def __init__(self):
+        self.chamadas = 0
+        self.erro = None
+        self.liberar = threading.Event()
+        self.liberar.set()
+
+    def __call__(self, nome, regiao, id_por_nome_campeao, cancelamento=None):
+        self.liberar.wait(5)
+        self.chamadas += 1
+        if self.erro:
+            return {"erro": self.erro}
+        return {"elo": f"versao {self.chamadas}"}
+
+
+def _cache(tmp_path):
+    relogio, site = _Relogio(), _Site()
+    return CachePerfis(str(tmp_path / "perfis.json"), ttl=TTL, janela_stale=JANELA, buscar=site, relogio=relogio), relogio, site
+
+
+def test_dentro_do_ttl_vem_do_cache(tmp_path):
+    cache, relogio, site = _cache(tmp_path)
+    assert cache.obter("Nome#BR1", "br", {}) == {"elo": "versao 1"}
+
+    relogio.agora += TTL - 1
+    dados = cache.obter(" nome#br1 ", "BR", {})
+
+    assert dados["elo"] == "versao 1"
+    assert dados["cache"]["idade"] == TTL - 1 and dados["cache"]["atualizando"] is False
+    assert site.chamadas == 1
+
+def test_stale_devolve_o_antigo_e_atualiza_em_segundo_plano(tmp_path):
+    cache, relogio, site = _cache(tmp_path)
+    cache.obter("Nome#BR1", "br", {})
+    relogio.agora += TTL + 1
+    site.liberar.clear()
+    atualizados = []
+    atualizou = threading.Event()
+
+    dados = cache.obter("Nome#BR1", "br", {}, ao_atualizar=lambda novos: (atualizados.append(novos), atualizou.set()))
+    # Enquanto a atualização não termina, outro pedido não dispara uma segunda
+    repetido = cache.obter("Nome#BR1", "br", {})
+    site.liberar.set()
+
+    assert dados["elo"] == "versao 1" and dados["cache"]["atualizando"] is True
+    assert repetido["elo"] == "versao 1" and repetido["cache"]["atualizando"] is False
+    assert atualizou.wait(5)
+    assert atualizados == [{"elo": "versao 2"}]
+    novo = cache.obter("Nome#BR1", "br", {})
+    assert novo["elo"] == "versao 2" and novo["cache"]["idade"] == 0
+    assert site.chamadas == 2
+
+def test_expirado_busca_de_novo_na_hora(tmp_path):
+    cache, relogio, site = _cache(tmp_path)
+    cache.obter("Nome#BR1", "br", {})
+    relogio.agora += TTL + JANELA + 1
+
+    assert cache.obter("Nome#BR1", "br", {}) == {"elo": "versao 2"}
+    assert site.chamadas == 2
+
+def test_expirado_sem_conexao_devolve_o_antigo(tmp_path):
+    cache, relogio, site = _cache(tmp_path)
+    cache.obter("Nome#BR1", "br", {})
+    relogio.agora += TTL + JANELA + 1
+    site.erro = "Erro de conexão: timeout"
+
+    dados = cache.obter("Nome#BR1", "br", {})
+
+    assert dados["elo"] == "versao 1" and dados["cache"]["idade"] == TTL + JANELA + 1
+    # Erros não entram no cache
+    site.erro = None
+    relogio.agora += 1
+    assert cache.obter("Nome#BR1", "br", {}) == {"elo": "versao 3"}
+
+def test_forcar_ignora_o_cache_e_persiste(tmp_path):
+    cache, relogio, site = _cache(tmp_path)
+    cache.obter("Nome#BR1", "br", {})
+
+    assert cache.obter("Nome#BR1", "br", {}, forcar=True) == {"elo": "versao 2"}
+    # Uma nova instância lê o que foi gravado em disco
+    outro = CachePerfis(cache.caminho, ttl=TTL, janela_stale=JANELA, buscar=site, relogio=relogio)
+    assert outro.obter("Nome#BR1", "br", {})["elo"] == "versao 2"
+    assert site.chamadas == 2
@@ -0,0 +1,119 @@
+# tests/test_renderizacao.py
+import threading
+
+import pytest
+
+import newScraper
+import scraper
+from newScraper import PoolRenderizadores, Renderizador
+
+
+class RenderizadorFalso(Renderizador):
+    """Devolve uma página fixa; `falhar` faz a próxima renderização levantar erro."""
+
+    def __init__(self, html="", liberar=None):
+        self.html = html
+        self.liberar = liberar
+        self.chamadas = 0
+        self.falhar = False
+        self.fechado = False
+
+    def renderizar(self, url):
+        self.chamadas += 1
+        if self.liberar is not None:
+            self.liberar.wait(5)
+        if self.falhar:
+            raise RuntimeError("navegador caiu")
+        return self.html
+
+    def fechar(self):
+        self.fechado = True
+
+
+def _servir(servidor, monkeypatch, prefixo, corpo):
+    servidor.adicionar_rota(f"/{prefixo}/summoner/", lambda srv, caminho: (200, "text/html; charset=utf-8", corpo.encode("utf-8")))
+    monkeypatch.setattr(scraper, "URL_BASE", f"{servidor.url}/{prefixo}")
+
+
+def test_renderizador_exige_renderizar():
+    with pytest.raises(TypeError):
+        Renderizador()
+
+def test_busca_em_camadas_usa_o_renderizador_quando_falta_a_tabela(servidor, monkeypatch):
+    completo = servidor.pagina("perfil.html").decode("utf-8")
+    # HTML estático sem a tabela de rotas; o renderizador devolve a página completa
+    _servir(servidor, monkeypatch, "estatico", completo.replace("championsData-soloqueue", "carregando"))
+    falso = RenderizadorFalso(completo)
+
+    with PoolRenderizadores(lambda: falso, tamanho=1) as pool:
+        dados = newScraper.obter_dados_summoner("Teste#BR1", "br", {}, pool=pool)
+
+    esperado = scraper.extrair_dados_html(completo, {})
+    assert falso.chamadas == 1
+    assert dados["roles_data"] and dados == esperado
+
+def test_pagina_que_nao_e_perfil_nao_e_renderizada(servidor, monkeypatch):
+    _servir(servidor, monkeypatch, "vazio", "<html><head><title>Invocador não encontrado</title></head><body></body></html>")
+    falso = RenderizadorFalso()
+
+    with PoolRenderizadores(lambda: falso, tamanho=1) as pool:
+        dados = newScraper.obter_dados_summoner("Ninguem#BR1", "br", {}, pool=pool)
+
+    assert "erro" in dados
+    assert falso.chamadas == 0
+
+def test_falha_do_renderizador_ocupado_acorda_quem_espera():
+    liberar = threading.Event()
+    criados = []
+
+    def fabrica():
+        renderizador = RenderizadorFalso("<html>ok</html>", liberar if not criados else None)
+        renderizador.falhar = not criados
+        criados.append(renderizador)
+        return renderizador
+
+    pool = PoolRenderizadores(fabrica, tamanho=1)
+    erros, resultados = [], []
+
+    def primeira():
+        try:
+            pool.renderizar("http://x/1")
+        except RuntimeError as e:
+            erros.append(e)
+
+    ocupada = threading.Thread(target=primeira, daemon=True)
+    ocupada.start()
+    while not criados:
+        threading.Event().wait(0.01)
+    # O único renderizador está emprestado: a segunda chamada espera por ele
+    esperando = threading.Thread(target=lambda: resultados.append(pool.renderizar("http://x/2")), daemon=True)
+    esperando.start()
+    liberar.set()
+    ocupada.join(5)
+    esperando.join(5)
+
+    assert not esperando.is_alive()
+    assert len(erros) == 1 and resultados == ["<html>ok</html>"]
+    assert len(criados) == 2 and criados[0].fechado
+    pool.fechar()
+    assert criados[1].fechado
+
+def test_fechar_fecha_renderizadores_devolvidos_depois():
+    liberar = threading.Event()
+    falso = RenderizadorFalso("<html>ok</html>", liberar)
+    pool = PoolRenderizadores(lambda: falso, tamanho=1)
+    resultados = []
+
+    emprestado = threading.Thread(target=lambda: resultados.append(pool.renderizar("http://x")), daemon=True)
+    emprestado.start()
+    while not falso.chamadas:
+        threading.Event().wait(0.01)
+    pool.fechar()
+    assert not falso.fechado
+    liberar.set()
+    emprestado.join(5)
+
+    assert resultados == ["<html>ok</html>"]
+    assert falso.fechado
+    with pytest.raises(RuntimeError):
+        pool.renderizar("http://x")
@@ -0,0 +1,102 @@
+# tests/test_servidor.py
+import asyncio
+import threading
+import time
+
+import scraper
+from servidor import TAMANHO_MAXIMO_CABECALHO, ServicoSummoner
+
+
+class _BuscaContada:
+    def __init__(self, resultado=None, espera=0.1):
+        self.resultado = resultado if resultado is not None else {"elo": "Gold II"}
+        self.espera = espera
+        self.chamadas = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, nome, regiao, id_por_nome_campeao):
+        with self._lock:
+            self.chamadas += 1
+        time.sleep(self.espera)
+        if isinstance(self.resultado, Exception):
+            raise self.resultado
+        return dict(self.resultado)
+
+
+def test_pedidos_simultaneos_viram_uma_busca():
+    busca = _BuscaContada()
+    servico = ServicoSummoner(buscar=busca, id_por_nome_campeao={})
+
+    async def cenario():
+        nomes = ["Nome#BR1", "nome#br1", " NOME#BR1 ", "Nome#BR1", "nome#BR1", "Nome#br1"]
+        resultados = await asyncio.gather(*(servico.obter_summoner(nome, "br") for nome in nomes))
+        # Terminada a busca, o próximo pedido vai ao site de novo
+        await servico.obter_summoner("Nome#BR1", "br")
+        return resultados
+
+    try:
+        resultados = asyncio.run(cenario())
+    finally:
+        servico.fechar()
+    assert all(dados == {"elo": "Gold II"} for dados in resultados)
+    assert busca.chamadas == 2
+    assert servico.coalescidas == 5
+
+def _status(resultado):
+    servico = ServicoSummoner(buscar=_BuscaContada(resultado, espera=0), id_por_nome_campeao={})
+    try:
+        status, _, _ = asyncio.run(servico.responder("GET", "/summoner/br/Nome-BR1"))
+    finally:
+        servico.fechar()
+    return status
+
+def test_status_http_dos_resultados():
+    assert _status({"elo": "Gold II"}) == 200
+    assert _status({"erro": "Erro de conexão: 404 Client Error", "status_http": 404}) == 404
+    assert _status({"erro": "Não foi possível encontrar os dados do perfil."}) == 404
+    assert _status({"erro": "Erro de conexão: 503 Server Error", "status_http": 503}) == 502
+    assert _status({"erro": "Erro de conexão: timeout", "status_http": None}) == 502
+    assert _status(RuntimeError("quebrou")) == 500
+
+def test_rotas_e_metodos():
+    servico = ServicoSummoner(buscar=_BuscaContada(espera=0), id_por_nome_campeao={})
+    try:
+        assert asyncio.run(servico.responder("POST", "/summoner/br/Nome-BR1"))[0] == 405
+        assert asyncio.run(servico.responder("GET", "/outra"))[0] == 404
+        assert asyncio.run(servico.responder("GET", "/healthz"))[:2] == (200, "text/plain")
+    finally:
+        servico.fechar()
+
+def test_invocador_inexistente_no_site_e_404(servidor):
+    servico = ServicoSummoner(buscar=scraper.obter_dados_summoner, id_por_nome_campeao={})
+    try:
+        status, _, dados = asyncio.run(servico.responder("GET", "/summoner/br/Inexistente-BR1"))
+        assert status == 404 and dados["status_http"] == 404
+        assert asyncio.run(servico.responder("GET", "/summoner/br/Jogador1-BR1"))[0] == 200
+    finally:
+        servico.fechar()
+
+def test_cabecalho_grande_demais_responde_431_e_fecha():
+    servico = ServicoSummoner(buscar=_BuscaContada(espera=0), id_por_nome_campeao={})
+
+    async def cenario():
+        servidor = await asyncio.start_server(servico.tratar_conexao, "127.0.0.1", 0)
+        porta = servidor.sockets[0].getsockname()[1]
+        async with servidor:
+            reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+            enorme = "".join(f"X-Extra-{i}: {'a' * 1000}\r\n" for i in range(TAMANHO_MAXIMO_CABECALHO // 1000 + 2))
+            # Uma segunda requisição logo atrás: não pode ser confundida com o resto dos cabeçalhos
+            writer.write((f"GET /healthz HTTP/1.1\r\nHost: x\r\n{enorme}\r\n"
+                          "GET /healthz HTTP/1.1\r\nHost: x\r\n\r\n").encode('latin-1'))
+            await writer.drain()
+            resposta = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return resposta
+
+    try:
+        resposta = asyncio.run(cenario())
+    finally:
+        servico.fechar()
+    assert resposta.startswith(b"HTTP/1.1 431 ")
+    assert b"Connection: close" in resposta
+    assert resposta.count(b"HTTP/1.1 ") == 1
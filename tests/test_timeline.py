@@ -0,0 +1,68 @@
+# tests/test_timeline.py
+import datetime
+import time
+
+import numpy as np
+import pytest
+
+from timeline import lttb, preparar_serie, reduzir_serie
+
+HORA_MS = 3_600_000
+
+
+@pytest.fixture
+def fuso_com_horario_de_verao(monkeypatch):
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+def _ms(*data):
+    return int(datetime.datetime(*data, tzinfo=datetime.timezone.utc).timestamp() * 1000)
+
+def test_horario_local_igual_ao_fromtimestamp_nas_trocas_de_horario(fuso_com_horario_de_verao):
+    # De hora em hora em volta das duas trocas de 2024 (31/03 e 27/10, às 01:00 UTC), mais pontos esparsos
+    pontos = [[_ms(2024, 3, 30, 20) + h * HORA_MS, h] for h in range(12)]
+    pontos += [[_ms(2024, 10, 26, 20) + h * HORA_MS, h] for h in range(12)]
+    pontos += [[_ms(2024, 1, 15, 12), 1], [_ms(2024, 7, 15, 12), 2]]
+
+    datas, _ = preparar_serie(pontos)
+
+    esperado = sorted(np.datetime64(datetime.datetime.fromtimestamp(ts / 1000), 'ms') for ts, _ in pontos)
+    assert datas.tolist() == [d.astype(datetime.datetime) for d in esperado]
+
+def test_descarta_invalidos_e_ordena():
+    pontos = [[3000, 3], [1000, 1], None, [2000, None], ["x", 5], [-1, 2], [2500, "2.5"], [4000]]
+
+    datas, valores = preparar_serie(pontos, hora_local=False)
+
+    assert datas.astype(np.int64).tolist() == [1000, 2500, 3000]
+    assert valores.tolist() == [1.0, 2.5, 3.0]
+    vazias, _ = preparar_serie([])
+    assert vazias.size == 0
+
+def test_lttb_mantem_as_pontas_e_os_picos():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50)
+    y[437] = 10.0
+
+    indices = lttb(x, y, 50)
+
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+    assert 437 in indices
+
+@pytest.mark.parametrize("limite, esperado", [(10, list(range(10))), (25, list(range(10))), (2, [0, 9]), (1, [0]), (0, [])])
+def test_lttb_limites_pequenos_ou_maiores_que_a_serie(limite, esperado):
+    assert lttb(np.arange(10), np.zeros(10), limite).tolist() == esperado
+
+def test_reduzir_serie_mantem_datas_e_valores_alinhados():
+    datas, valores = preparar_serie([[i * HORA_MS, i % 7] for i in range(500)], hora_local=False)
+
+    reduzidas, reduzidos = reduzir_serie(datas, valores, 40)
+
+    assert len(reduzidas) == len(reduzidos) == 40
+    assert reduzidos.tolist() == [(int(d) // HORA_MS) % 7 for d in reduzidas.astype(np.int64)]
+    assert reduzir_serie(datas, valores, 500)[0] is datas
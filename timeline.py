@@ -0,0 +1,110 @@
+# timeline.py
+"""Preparação vetorizada da série de ranking (`graph_data`) para o gráfico de evolução.
+
+`preparar_serie` converte os timestamps, descarta pontos nulos ou inválidos e mantém datas e
+valores alinhados numa única passada com NumPy. `lttb` reduz séries longas a um número de pontos
+compatível com a largura do gráfico, preservando picos e vales (Largest-Triangle-Three-Buckets).
+"""
+import time
+
+import numpy as np
+
+# Limite superior aceito pelo Matplotlib para datas (31/12/9999)
+TS_MAXIMO_MS = 253402300799000
+MS_POR_DIA = 86_400_000
+
+def _para_matriz(graph_data_raw):
+    """Matriz float (n, 2) com [timestamp_ms, valor]; entradas nulas ou inválidas viram NaN."""
+    try:
+        matriz = np.asarray(graph_data_raw, dtype=float)
+        if matriz.ndim == 2 and matriz.shape[1] >= 2:
+            return matriz[:, :2]
+    except (TypeError, ValueError):
+        pass
+
+    # Caminho lento para listas heterogêneas (strings, pontos incompletos)
+    def numero(valor):
+        try:
+            return float(valor)
+        except (TypeError, ValueError):
+            return np.nan
+
+    matriz = np.full((len(graph_data_raw), 2), np.nan)
+    for i, ponto in enumerate(graph_data_raw):
+        if isinstance(ponto, (list, tuple)) and len(ponto) >= 2:
+            matriz[i] = numero(ponto[0]), numero(ponto[1])
+    return matriz
+
+def _deslocamento_local_ms(ts_ms):
+    """Deslocamento do fuso local (em ms) para cada timestamp, calculado uma vez por dia distinto.
+
+    Nos dias com troca de horário (deslocamentos diferentes no início e no fim do dia), ponto a ponto.
+    """
+    dias, inverso = np.unique(ts_ms // MS_POR_DIA, return_inverse=True)
+    inicio = np.array([time.localtime(dia * 86400).tm_gmtoff for dia in dias.tolist()], dtype=np.int64)
+    fim = np.array([time.localtime(dia * 86400 + 86399).tm_gmtoff for dia in dias.tolist()], dtype=np.int64)
+    deslocamentos = inicio[inverso] * 1000
+    for posicao in np.flatnonzero(inicio != fim):
+        pontos = np.flatnonzero(inverso == posicao)
+        deslocamentos[pontos] = [time.localtime(ts // 1000).tm_gmtoff * 1000 for ts in ts_ms[pontos].tolist()]
+    return deslocamentos
+
+def preparar_serie(graph_data_raw, hora_local: bool = True):
+    """(datas, valores) alinhados e ordenados por data, só com os pontos válidos.
+
+    `datas` é um array `datetime64[ms]` no horário local (como `datetime.fromtimestamp`), ou em
+    UTC com `hora_local=False`; `valores` é float64.
+    """
+    if not graph_data_raw:
+        return np.array([], dtype='datetime64[ms]'), np.array([], dtype=float)
+    matriz = _para_matriz(graph_data_raw)
+    ts, valores = matriz[:, 0], matriz[:, 1]
+    validos = np.isfinite(ts) & np.isfinite(valores) & (ts >= 0) & (ts <= TS_MAXIMO_MS)
+    ts = ts[validos].astype(np.int64)
+    valores = valores[validos]
+
+    ordem = np.argsort(ts, kind='stable')
+    ts, valores = ts[ordem], valores[ordem]
+    if hora_local and ts.size:
+        ts = ts + _deslocamento_local_ms(ts)
+    return ts.astype('datetime64[ms]'), valores
+
+def lttb(x, y, limite: int):
+    """Índices dos pontos escolhidos pelo Largest-Triangle-Three-Buckets, no máximo `limite`.
+
+    Sempre mantém o primeiro e o último ponto. Com `limite` >= len(x) retorna todos os índices.
+    """
+    n = len(x)
+    if limite >= n:
+        return np.arange(n)
+    if limite < 3:
+        return np.array([0, n - 1], dtype=np.int64)[:max(limite, 0)]
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Os n-2 pontos internos são divididos em limite-2 baldes; cada balde contribui com um ponto
+    bordas = np.linspace(1, n - 1, limite - 1).astype(np.int64)
+    escolhidos = np.empty(limite, dtype=np.int64)
+    escolhidos[0] = 0
+    escolhidos[-1] = n - 1
+    anterior = 0
+    for i in range(limite - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        # O terceiro vértice do triângulo é a média do balde seguinte (ou o último ponto)
+        proximo_inicio, proximo_fim = fim, bordas[i + 2] if i + 2 < len(bordas) else n
+        media_x = x[proximo_inicio:proximo_fim].mean()
+        media_y = y[proximo_inicio:proximo_fim].mean()
+        areas = np.abs(
+            (x[anterior] - media_x) * (y[inicio:fim] - y[anterior])
+            - (x[anterior] - x[inicio:fim]) * (media_y - y[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        escolhidos[i + 1] = anterior
+    return escolhidos
+
+def reduzir_serie(datas, valores, limite: int):
+    """Aplica `lttb` a uma série de `preparar_serie`, mantendo datas e valores alinhados."""
+    if len(datas) <= limite:
+        return datas, valores
+    indices = lttb(datas.astype(np.int64), valores, limite)
+    return datas[indices], valores[indices]
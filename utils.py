@@ -1,45 +1,66 @@
 # utils.py
 import os
 import json
-import requests
+import logging
 from io import BytesIO
-from PIL import Image, ImageTk, ImageDraw
+from PIL import Image, ImageTk
+
+from image_cache import DIRETORIO_CACHE, CacheDisco, CacheImagens, CacheMemoriaLRU
+from instrumentacao import span
+from tema import mascara_circular
+from campeoes import CAMINHO_ICONS, obter_indice
+
+logger = logging.getLogger(__name__)
 
 def carregar_id_por_nome_campeao():
-    """Carrega o mapeamento de nome de campeão para ID a partir de um JSON."""
-    caminho_arquivo = os.path.join(os.path.dirname(__file__), 'icons.json')
-    if not os.path.exists(caminho_arquivo):
-        print("Aviso: arquivo 'icons.json' não encontrado.")
+    """Retorna o mapeamento de nome de campeão para ID montado a partir do icons.json.
+
+    É o índice compartilhado de `campeoes.py`: carregado uma vez por processo e tolerante a
+    grafias ("Kai'Sa", "Nunu & Willump", "MonkeyKing").
+    """
+    if not os.path.exists(CAMINHO_ICONS):
+        logger.warning("Arquivo 'icons.json' não encontrado.")
         return {}
     try:
-        with open(caminho_arquivo, 'r', encoding='utf-8') as f:
-            id_para_nome = json.load(f)
-        nome_para_id = {
-            nome.lower().replace(' ', '').replace('.', ''): int(id_str)
-            for id_str, nome in id_para_nome.items()
-        }
-        return nome_para_id
+        return obter_indice()
     except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Erro ao carregar 'icons.json': {e}")
+        logger.error("Erro ao carregar 'icons.json': %s", e)
         return {}
 
-def criar_foto_arredondada(url: str, size: int):
-    """Baixa uma imagem de uma URL, redimensiona e a torna circular."""
+def _arredondar_imagem(img_data: bytes, size: int):
+    with span("imagem_processamento", size=size):
+        return _arredondar(img_data, size)
+
+def _arredondar(img_data: bytes, size: int):
+    img = Image.open(BytesIO(img_data)).convert("RGBA").resize((size, size), Image.Resampling.LANCZOS)
+    img.putalpha(mascara_circular(size))
+    return img
+
+cache_imagens = CacheImagens(
+    _arredondar_imagem,
+    CacheMemoriaLRU(capacidade=256),
+    CacheDisco(os.path.join(DIRETORIO_CACHE, "imagens"), limite_bytes=50 * 1024 * 1024),
+)
+
+def processar_foto_arredondada(url: str, size: int):
+    """Retorna a imagem (PIL, RGBA) da URL já redimensionada e circular, usando o cache de imagens.
+
+    Não depende do Tkinter, então pode ser chamada fora da thread principal.
+    """
     if not url:
         return None
+    import requests
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        img_data = response.content
-        
-        img = Image.open(BytesIO(img_data)).convert("RGBA").resize((size, size), Image.Resampling.LANCZOS)
-        
-        mask = Image.new("L", img.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0, size, size), fill=255)
-        
-        img.putalpha(mask)
-        return ImageTk.PhotoImage(img)
+        return cache_imagens.obter(url, size)
     except (requests.exceptions.RequestException, IOError, Image.DecompressionBombError) as e:
-        print(f"Erro ao criar imagem de {url}: {e}")
-        return None
\ No newline at end of file
+        logger.warning("Erro ao criar imagem de %s: %s", url, e)
+        return None
+
+def criar_foto_arredondada(url: str, size: int):
+    """Baixa uma imagem de uma URL, redimensiona e a torna circular."""
+    img = processar_foto_arredondada(url, size)
+    return ImageTk.PhotoImage(img) if img else None
+
+def estatisticas_cache_imagens():
+    """Contadores de acertos/faltas dos caches de imagem, úteis para dimensionar os limites."""
+    return cache_imagens.estatisticas()